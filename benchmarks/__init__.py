@@ -0,0 +1 @@
+"""オフラインベンチマーク - ローカルのTurso/Spreadsheetスタンドインで同期処理を計測"""
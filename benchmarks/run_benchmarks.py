@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+同期処理のオフラインベンチマーク
+
+ローカルのTursoスタンドイン（SQLite）とCSVエクスポートスタンドインを起動し、
+合成したsongs/cards/broochesシートをSyncOrchestratorで同期して
+ステージごとの処理時間・CPU時間・メモリピークをJSONに出力する
+（--backend sqlite の場合はHTTPを経由せず一時ディレクトリのSQLiteファイルに直接同期する）
+
+実行方法:
+    python benchmarks/run_benchmarks.py --rows 1000 10000 100000 --output bench.json
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from unittest.mock import patch
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+sys.path.insert(0, REPO_ROOT)
+
+import pandas as pd
+
+from csv_fetcher import CSVFetcher
+from db_client import DatabaseClient
+from sqlite_client import SQLiteClient
+from validators import DataValidator
+from transformers import DataTransformer
+from orchestrator import SyncOrchestrator
+from constants import STORAGE_BACKENDS, TRANSACTION_MODES
+from benchmarks.stand_ins import FakeSheetsServer, FakeTursoServer
+from benchmarks.synthetic import GENERATORS
+
+BENCHMARK_SPREADSHEET_ID = "benchmark"
+SHEET_GIDS = {"songs": 1, "cards": 2, "brooches": 3}
+DEFAULT_ROWS = [1000, 10000, 100000]
+
+
+class StageProfiler:
+    """インスタンスのメソッドを包み、ステージごとの処理時間・CPU時間・メモリピークを集計"""
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """ブロックの実行をstageの1回の呼び出しとして計測"""
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            stats = self.stages.setdefault(
+                stage, {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_bytes": 0}
+            )
+            stats["calls"] += 1
+            stats["wall_seconds"] += time.perf_counter() - wall_start
+            stats["cpu_seconds"] += time.process_time() - cpu_start
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] - baseline
+                stats["peak_bytes"] = max(stats["peak_bytes"], peak)
+
+    def wrap(self, target: Any, method_name: str, stage: str) -> None:
+        """target.method_name の呼び出しをstageとして計測"""
+        original = getattr(target, method_name)
+
+        @functools.wraps(original)
+        def measured(*args, **kwargs):
+            with self.measure(stage):
+                return original(*args, **kwargs)
+
+        setattr(target, method_name, measured)
+
+    def wrap_generator(self, target: Any, method_name: str, stage: str) -> None:
+        """
+        ジェネレーターを返すtarget.method_name の消費をstageとして計測
+
+        呼び出し自体は即座に返り、リクエスト・受信・解析は要素の取り出し時に行われるため、
+        要素の取り出し（next）ごとに1回の呼び出しとして計測する
+        """
+        original = getattr(target, method_name)
+
+        @functools.wraps(original)
+        def measured(*args, **kwargs):
+            iterator = original(*args, **kwargs)
+            try:
+                while True:
+                    with self.measure(stage):
+                        item = next(iterator, StopIteration)
+                    if item is StopIteration:
+                        return
+                    yield item
+            finally:
+                # 途中で消費を止めた場合もレスポンスを閉じる
+                iterator.close()
+
+        setattr(target, method_name, measured)
+
+    def reset(self) -> None:
+        """集計をクリア"""
+        self.stages = {}
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage: {key: round(value, 6) if isinstance(value, float) else value for key, value in stats.items()}
+            for stage, stats in self.stages.items()
+        }
+
+
+def instrument(orchestrator: SyncOrchestrator, profiler: StageProfiler) -> None:
+    """SyncOrchestratorの各ステージに計測を仕込む"""
+    profiler.wrap(orchestrator.csv_fetcher, "fetch_csv_if_modified", "fetch")
+    # ストリーミング時のfetchにはチャンクごとの受信・解析を含む
+    profiler.wrap_generator(orchestrator.csv_fetcher, "iter_csv_chunks", "fetch")
+    for method_name in ("validate_songs_data", "validate_cards_data", "validate_brooches_data"):
+        profiler.wrap(orchestrator.validator, method_name, "validate")
+    profiler.wrap(orchestrator.transformer, "transform_for_database", "transform")
+    profiler.wrap(orchestrator.schema_manager, "ensure_table_exists", "schema")
+    profiler.wrap(orchestrator, "_build_load_statements", "build_statements")
+    profiler.wrap(orchestrator.db_client, "execute_transaction", "upload")
+    profiler.wrap(orchestrator.db_client, "execute_statements", "upload")
+    profiler.wrap(orchestrator.db_client, "swap_table", "upload")
+
+
+def run_benchmark(
+    rows: int,
+    tables: Optional[List[str]] = None,
+    trace_memory: bool = True,
+    backend: str = "turso",
+    **orchestrator_options: Any
+) -> List[Dict[str, Any]]:
+    """
+    指定行数の合成シートを同期し、テーブルごとの計測結果を返す
+
+    Args:
+        rows: 1シートあたりの行数
+        tables: 対象テーブル（省略時は全テーブル）
+        trace_memory: tracemallocでステージごとのメモリピークを計測するか
+        backend: 同期先（turso: HTTPスタンドイン、sqlite: ローカルのSQLiteファイル）
+        orchestrator_options: SyncOrchestratorに渡す追加オプション（insert_mode等）
+
+    Returns:
+        テーブルごとの計測結果リスト
+    """
+    tables = tables or list(SHEET_GIDS)
+    results = []
+
+    with FakeSheetsServer() as sheets, FakeTursoServer() as turso, tempfile.TemporaryDirectory() as tmp_dir:
+        for table_name in tables:
+            sheets.add_sheet(BENCHMARK_SPREADSHEET_ID, SHEET_GIDS[table_name], GENERATORS[table_name](rows))
+
+        max_in_flight = orchestrator_options.pop("max_in_flight", 1)
+        transaction_mode = orchestrator_options.pop("transaction_mode", "batched")
+        if backend == "sqlite":
+            db_client = SQLiteClient(os.path.join(tmp_dir, "benchmark.db"))
+            db_client.connect()
+        else:
+            env = {"TURSO_DATABASE_URL": turso.base_url, "TURSO_AUTH_TOKEN": "benchmark"}
+            with patch.dict(os.environ, env):
+                db_client = DatabaseClient(max_in_flight=max_in_flight, transaction_mode=transaction_mode)
+        csv_fetcher = CSVFetcher(max_retries=1, url_template=sheets.url_template)
+
+        orchestrator = SyncOrchestrator(
+            csv_fetcher=csv_fetcher,
+            db_client=db_client,
+            validator=DataValidator(),
+            transformer=DataTransformer(),
+            **orchestrator_options
+        )
+
+        profiler = StageProfiler(trace_memory)
+        instrument(orchestrator, profiler)
+
+        try:
+            for table_name in tables:
+                profiler.reset()
+                requests_before = turso.request_count
+                bytes_before = turso.bytes_received
+
+                if trace_memory:
+                    tracemalloc.start()
+                wall_start = time.perf_counter()
+                result = orchestrator.sync_single_table(table_name, SHEET_GIDS[table_name], BENCHMARK_SPREADSHEET_ID)
+                total_seconds = time.perf_counter() - wall_start
+                if trace_memory:
+                    tracemalloc.stop()
+
+                stored_rows = 0
+                if result.success:
+                    count_query = f"SELECT COUNT(*) FROM {table_name}"
+                    if backend == "sqlite":
+                        stored_rows = db_client.query_rows(count_query)[0][0]
+                    else:
+                        stored_rows = turso.query(count_query)[0][0]
+                results.append({
+                    "table": table_name,
+                    "rows": rows,
+                    "success": result.success,
+                    "error": result.error_message,
+                    "inserted": result.inserted_count,
+                    "skipped": result.skipped_count,
+                    "stored_rows": stored_rows,
+                    "total_seconds": round(total_seconds, 6),
+                    "turso_requests": turso.request_count - requests_before,
+                    "turso_bytes": turso.bytes_received - bytes_before,
+                    "stages": profiler.snapshot(),
+                    "stage_metrics": result.stage_metrics,
+                })
+        finally:
+            csv_fetcher.close()
+            db_client.close()
+
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline sync benchmark")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="1シートあたりの行数")
+    parser.add_argument("--tables", nargs="+", choices=list(SHEET_GIDS), help="対象テーブル")
+    parser.add_argument("--backend", default="turso", choices=STORAGE_BACKENDS, help="同期先")
+    parser.add_argument("--insert-mode", default="literal", choices=SyncOrchestrator.INSERT_MODES)
+    parser.add_argument("--sync-strategy", default="full", choices=SyncOrchestrator.SYNC_STRATEGIES)
+    parser.add_argument(
+        "--transaction-mode", default="batched", choices=TRANSACTION_MODES, help="Tursoでの全件入れ替えの送信方式"
+    )
+    parser.add_argument("--streaming", action="store_true", help="ストリーミングパイプラインで同期")
+    parser.add_argument("--optimize-memory", action="store_true", help="変換後にdtype縮小・category化を行う")
+    parser.add_argument("--max-in-flight", type=int, default=1, help="同時に送信するバッチ数")
+    parser.add_argument("--no-memory", action="store_true", help="tracemallocによるメモリ計測を無効化")
+    parser.add_argument("--output", default="benchmark_results.json", help="結果JSONの出力先")
+    args = parser.parse_args(argv)
+
+    options = {
+        "insert_mode": args.insert_mode,
+        "sync_strategy": args.sync_strategy,
+        "streaming": args.streaming,
+        "optimize_memory": args.optimize_memory,
+    }
+
+    runs = []
+    for rows in args.rows:
+        runs.extend(run_benchmark(
+            rows,
+            tables=args.tables,
+            trace_memory=not args.no_memory,
+            max_in_flight=args.max_in_flight,
+            backend=args.backend,
+            transaction_mode=args.transaction_mode,
+            **options
+        ))
+
+    report = {
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "options": dict(
+            options,
+            backend=args.backend,
+            transaction_mode=args.transaction_mode,
+            max_in_flight=args.max_in_flight,
+            trace_memory=not args.no_memory
+        ),
+        "runs": runs,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    for run in runs:
+        stages = ", ".join(f"{name}={stats['wall_seconds']:.3f}s" for name, stats in run["stages"].items())
+        status = "ok" if run["success"] else f"FAILED ({run['error']})"
+        print(f"{run['table']:>8} rows={run['rows']:>7} total={run['total_seconds']:.3f}s {status} [{stages}]")
+    print(f"Results written to {args.output}")
+
+    return 0 if all(run["success"] for run in runs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
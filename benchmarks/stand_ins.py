@@ -0,0 +1,314 @@
+"""ローカルスタンドインモジュール - Turso HTTP API（SQLite実装）とCSVエクスポートの代替サーバー"""
+
+import base64
+import hashlib
+import json
+import sqlite3
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    """Keep-Alive対応・アクセスログなしのハンドラー"""
+
+    protocol_version = "HTTP/1.1"
+    # ヘッダーと本文を別々に書き込むため、Nagleアルゴリズムによる遅延を避ける
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _BackgroundServer:
+    """127.0.0.1の空きポートでバックグラウンド起動するHTTPサーバー"""
+
+    handler_class = _QuietHandler
+
+    def __init__(self):
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "_BackgroundServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler_class)
+        self._server.daemon_threads = True
+        self._server.stand_in = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class _TursoHandler(_QuietHandler):
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        stand_in: FakeTursoServer = self.server.stand_in
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            self._send(400, str(e).encode("utf-8"), "text/plain")
+            return
+
+        if urlparse(self.path).path == "/v2/pipeline":
+            try:
+                results = stand_in.execute_pipeline(payload, len(body))
+            except KeyError as e:
+                self._send(400, f"Unknown baton: {e}".encode("utf-8"), "text/plain")
+                return
+        else:
+            results = stand_in.execute(payload.get("statements", []), len(body))
+        self._send(200, json.dumps(results).encode("utf-8"), "application/json")
+
+
+class FakeTursoServer(_BackgroundServer):
+    """
+    Turso HTTP API（{"statements": [...]} 形式）をSQLiteで実装したスタンドイン
+
+    ステートメントは受信順に自動コミットで実行し、最初にエラーとなった
+    ステートメントで {"error": {"message": ...}} を返して残りを実行しない
+
+    Hrana over HTTP（POST /v2/pipeline）のexecute・batch（条件付きステップ）・closeにも対応し、
+    batonごとに専用の接続を割り当ててリクエストをまたぐトランザクションを保持する
+    """
+
+    handler_class = _TursoHandler
+
+    def __init__(self, database_path: str = ":memory:"):
+        super().__init__()
+        if database_path == ":memory:":
+            # ストリームごとの接続から同じインメモリDBを参照できるよう共有キャッシュで開く
+            database_path = f"file:fake_turso_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self.database_path = database_path
+        self.connection = self._open_connection()
+        self._lock = threading.Lock()
+        self._streams: Dict[str, sqlite3.Connection] = {}
+        self.request_count = 0
+        self.statement_count = 0
+        self.bytes_received = 0
+
+    def execute(self, statements: List[Union[str, Dict[str, Any]]], payload_bytes: int = 0) -> List[Dict[str, Any]]:
+        """ステートメント列を実行してTurso形式の結果リストを返す"""
+        results = []
+        with self._lock:
+            self.request_count += 1
+            self.bytes_received += payload_bytes
+            for statement in statements:
+                sql, params = self._unpack(statement)
+                try:
+                    cursor = self.connection.execute(sql, params)
+                    rows = cursor.fetchall()
+                except sqlite3.Error as e:
+                    results.append({"error": {"message": str(e)}})
+                    break
+                self.statement_count += 1
+                columns = [d[0] for d in cursor.description] if cursor.description else []
+                results.append({
+                    "results": {
+                        "columns": columns,
+                        "rows": [list(row) for row in rows],
+                        "rows_written": max(cursor.rowcount, 0) if not columns else 0
+                    }
+                })
+        return results
+
+    def execute_pipeline(self, payload: Dict[str, Any], payload_bytes: int = 0) -> Dict[str, Any]:
+        """
+        Hranaパイプラインを実行して {"baton": ..., "base_url": None, "results": [...]} を返す
+
+        Raises:
+            KeyError: 不明なbatonの場合
+        """
+        with self._lock:
+            self.request_count += 1
+            self.bytes_received += payload_bytes
+
+            baton = payload.get("baton")
+            connection = self._streams.pop(baton) if baton is not None else self._open_connection()
+
+            results = []
+            closed = False
+            for request in payload.get("requests", []):
+                if request["type"] == "close":
+                    # 未コミットのトランザクションは接続を閉じるとロールバックされる
+                    connection.close()
+                    closed = True
+                    results.append({"type": "ok", "response": {"type": "close"}})
+                elif request["type"] == "execute":
+                    try:
+                        result = self._execute_stmt(connection, request["stmt"])
+                    except sqlite3.Error as e:
+                        results.append({"type": "error", "error": {"message": str(e)}})
+                        continue
+                    results.append({"type": "ok", "response": {"type": "execute", "result": result}})
+                elif request["type"] == "batch":
+                    result = self._execute_batch(connection, request["batch"]["steps"])
+                    results.append({"type": "ok", "response": {"type": "batch", "result": result}})
+                else:
+                    results.append({"type": "error", "error": {"message": f"Unsupported request: {request['type']}"}})
+
+            next_baton = None
+            if not closed:
+                next_baton = uuid.uuid4().hex
+                self._streams[next_baton] = connection
+
+        return {"baton": next_baton, "base_url": None, "results": results}
+
+    def query(self, sql: str) -> List[Tuple]:
+        """検証用にSQLiteへ直接問い合わせ"""
+        with self._lock:
+            return self.connection.execute(sql).fetchall()
+
+    def stop(self) -> None:
+        super().stop()
+        for connection in self._streams.values():
+            connection.close()
+        self._streams.clear()
+        self.connection.close()
+
+    def _open_connection(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.database_path, check_same_thread=False, isolation_level=None, uri=True)
+
+    def _execute_batch(self, connection: sqlite3.Connection, steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """条件付きステップを順に実行（条件を満たさないステップは結果・エラーともにNone）"""
+        step_results: List[Optional[Dict[str, Any]]] = []
+        step_errors: List[Optional[Dict[str, Any]]] = []
+        for step in steps:
+            result, error = None, None
+            if self._evaluate(step.get("condition"), step_results, step_errors):
+                try:
+                    result = self._execute_stmt(connection, step["stmt"])
+                except sqlite3.Error as e:
+                    error = {"message": str(e)}
+            step_results.append(result)
+            step_errors.append(error)
+        return {"step_results": step_results, "step_errors": step_errors}
+
+    def _evaluate(self, condition: Optional[Dict[str, Any]], step_results: List[Any], step_errors: List[Any]) -> bool:
+        if condition is None:
+            return True
+        kind = condition["type"]
+        if kind == "ok":
+            return step_results[condition["step"]] is not None
+        if kind == "error":
+            return step_errors[condition["step"]] is not None
+        if kind == "not":
+            return not self._evaluate(condition["cond"], step_results, step_errors)
+        if kind == "and":
+            return all(self._evaluate(c, step_results, step_errors) for c in condition["conds"])
+        if kind == "or":
+            return any(self._evaluate(c, step_results, step_errors) for c in condition["conds"])
+        raise ValueError(f"Unsupported condition: {kind}")
+
+    def _execute_stmt(self, connection: sqlite3.Connection, stmt: Dict[str, Any]) -> Dict[str, Any]:
+        """Hranaのステートメントを実行して結果（cols/rows/affected_row_count）を返す"""
+        args = [self._decode_value(value) for value in stmt.get("args", [])]
+        cursor = connection.execute(stmt["sql"], args)
+        rows = cursor.fetchall()
+        self.statement_count += 1
+        columns = [d[0] for d in cursor.description] if cursor.description else []
+        return {
+            "cols": [{"name": name} for name in columns],
+            "rows": [[self._encode_value(value) for value in row] for row in rows] if stmt.get("want_rows", True) else [],
+            "affected_row_count": max(cursor.rowcount, 0) if not columns else 0,
+            "last_insert_rowid": None
+        }
+
+    def _decode_value(self, value: Dict[str, Any]) -> Any:
+        kind = value["type"]
+        if kind == "null":
+            return None
+        if kind == "integer":
+            return int(value["value"])
+        if kind == "blob":
+            return base64.b64decode(value["base64"])
+        return value["value"]
+
+    def _encode_value(self, value: Any) -> Dict[str, Any]:
+        if value is None:
+            return {"type": "null"}
+        if isinstance(value, int):
+            return {"type": "integer", "value": str(value)}
+        if isinstance(value, float):
+            return {"type": "float", "value": value}
+        if isinstance(value, bytes):
+            return {"type": "blob", "base64": base64.b64encode(value).decode("ascii")}
+        return {"type": "text", "value": value}
+
+    def _unpack(self, statement: Union[str, Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        if isinstance(statement, dict):
+            return statement["q"], statement.get("params", [])
+        return statement, []
+
+
+class _SheetsHandler(_QuietHandler):
+    def do_GET(self) -> None:
+        stand_in: FakeSheetsServer = self.server.stand_in
+        parsed = urlparse(self.path)
+        parts = parsed.path.strip("/").split("/")
+        gid = parse_qs(parsed.query).get("gid", [""])[0]
+
+        content = None
+        if len(parts) == 4 and parts[:2] == ["spreadsheets", "d"] and parts[3] == "export":
+            content = stand_in.sheets.get((parts[2], gid))
+        if content is None:
+            self._send(404, b"Not Found", "text/plain")
+            return
+
+        stand_in.request_count += 1
+        etag = f'"{hashlib.sha1(content).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send(200, content, "text/csv; charset=utf-8", {"ETag": etag})
+
+
+class FakeSheetsServer(_BackgroundServer):
+    """Google SpreadsheetsのCSVエクスポートURLを模したスタンドイン（ETag対応）"""
+
+    handler_class = _SheetsHandler
+
+    def __init__(self):
+        super().__init__()
+        self.sheets: Dict[Tuple[str, str], bytes] = {}
+        self.request_count = 0
+
+    def add_sheet(self, spreadsheet_id: str, gid: int, csv_text: str) -> None:
+        """シートのCSV本文を登録"""
+        self.sheets[(spreadsheet_id, str(gid))] = csv_text.encode("utf-8")
+
+    @property
+    def url_template(self) -> str:
+        """CSVFetcherに渡すエクスポートURLテンプレート"""
+        return f"{self.base_url}/spreadsheets/d/{{spreadsheet_id}}/export?format=csv&gid={{gid}}"
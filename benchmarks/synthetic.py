@@ -0,0 +1,85 @@
+"""合成データモジュール - songs/cards/broochesシートを模したCSVの生成"""
+
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+# 検証で除外される不正行の割合
+INVALID_ROW_RATIO = 0.01
+
+RARITIES = ['UR', 'SSR', 'SR', 'R', 'N']
+NOTES_COLUMNS = ['Shout×1白', 'Beat×1白', 'Melody×1色', 'Shout×2色', 'Beat×2色', 'Melody×2白']
+
+
+def _text(rng: np.random.Generator, prefix: str, rows: int) -> np.ndarray:
+    """カンマ・クォート・日本語を含む文字列カラム"""
+    suffix = rng.integers(0, 1000, size=rows).astype(str)
+    return np.char.add(f'{prefix} "テスト", ', suffix)
+
+
+def _invalid_mask(rng: np.random.Generator, rows: int) -> np.ndarray:
+    return rng.random(rows) < INVALID_ROW_RATIO
+
+
+def generate_songs(rows: int, seed: int = 0) -> str:
+    """楽曲シート（1行目がカテゴリー、2行目がカラム名の2行ヘッダー）"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'ID': np.arange(1, rows + 1),
+        '曲名': _text(rng, '曲', rows),
+        '分類': rng.choice(['グループ', 'ソロ', 'ユニット'], size=rows),
+        'アーティスト名': rng.choice(['IDOLiSH7', 'TRIGGER', 'Re:vale', 'ŹOOĻ'], size=rows).astype(object),
+        'ノーツ数': rng.integers(200, 1200, size=rows),
+        '秒数': rng.integers(90, 180, size=rows),
+    })
+    for column in NOTES_COLUMNS:
+        values = rng.integers(0, 300, size=rows).astype(float)
+        values[rng.random(rows) < 0.2] = np.nan
+        df[column] = values
+
+    df.loc[_invalid_mask(rng, rows), 'アーティスト名'] = None
+
+    categories = ['基本情報'] + [''] * 5 + ['ノーツ'] + [''] * (len(NOTES_COLUMNS) - 1)
+    return ','.join(categories) + '\n' + df.to_csv(index=False)
+
+
+def generate_cards(rows: int, seed: int = 1) -> str:
+    """カードシート"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'ID': np.arange(1, rows + 1),
+        'cardID': np.char.add('card_', np.arange(1, rows + 1).astype(str)),
+        'カード名': _text(rng, 'カード', rows),
+        'rarity': rng.choice(RARITIES, size=rows).astype(object),
+        'shout': rng.integers(1000, 10000, size=rows),
+        'beat': rng.integers(1000, 10000, size=rows),
+        'melody': rng.integers(1000, 10000, size=rows),
+        '発動率': rng.random(rows).round(3),
+        'スキル説明': _text(rng, 'スキル', rows),
+    })
+    df.loc[_invalid_mask(rng, rows), 'rarity'] = 'XR'
+    return df.to_csv(index=False)
+
+
+def generate_brooches(rows: int, seed: int = 2) -> str:
+    """固有ブローチシート"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'ID': np.arange(1, rows + 1),
+        'cardID': np.char.add('card_', np.arange(1, rows + 1).astype(str)),
+        'オート': rng.integers(0, 100, size=rows),
+        '楽曲': rng.integers(0, 100, size=rows),
+        'スコア': rng.integers(0, 5000, size=rows),
+        '上限': rng.integers(0, 50000, size=rows),
+        '効果': _text(rng, '効果', rows),
+    })
+    df.loc[_invalid_mask(rng, rows), 'スコア'] = -1
+    return df.to_csv(index=False)
+
+
+GENERATORS: Dict[str, Callable[[int], str]] = {
+    "songs": generate_songs,
+    "cards": generate_cards,
+    "brooches": generate_brooches,
+}
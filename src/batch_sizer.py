@@ -0,0 +1,131 @@
+"""AdaptiveBatchSizerモジュール - Tursoアップロードのバッチサイズ自動調整"""
+
+from typing import List
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AdaptiveBatchSizer:
+    """
+    1リクエストあたりのバイト数とレイテンシの目標値に合わせてバッチサイズを調整するコントローラー
+
+    - 応答が目標レイテンシの半分未満なら拡大
+    - 目標レイテンシを超えたら縮小
+    - 413/5xx応答時は縮小し、413応答（未処理であることが確実）の場合のみ同じバッチを再送
+    - 観測した1文あたりのバイト数から、目標バイト数を超えないよう上限を設定
+    """
+
+    def __init__(
+        self,
+        initial_size: int = 50,
+        min_size: int = 1,
+        max_size: int = 1000,
+        target_bytes: int = 1_000_000,
+        target_latency: float = 2.0,
+        growth_factor: float = 1.5,
+        shrink_factor: float = 0.5
+    ):
+        """
+        Args:
+            initial_size: 初回のバッチサイズ（ステートメント数）
+            min_size: 最小バッチサイズ
+            max_size: 最大バッチサイズ
+            target_bytes: 1リクエストあたりの目標ペイロードサイズ（バイト）
+            target_latency: 1リクエストあたりの目標レイテンシ（秒）
+            growth_factor: 拡大時の倍率
+            shrink_factor: 縮小時の倍率
+        """
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_bytes = target_bytes
+        self.target_latency = target_latency
+        self.growth_factor = growth_factor
+        self.shrink_factor = shrink_factor
+
+        self.current_size = self._clamp(initial_size)
+        self.bytes_per_statement = 0.0
+        # 実際に送信に成功したバッチサイズの履歴
+        self.history: List[int] = []
+
+    def next_batch_size(self) -> int:
+        """次のリクエストで送信するステートメント数"""
+        size = self.current_size
+        if self.bytes_per_statement > 0:
+            size = min(size, int(self.target_bytes // self.bytes_per_statement))
+        return self._clamp(size)
+
+    def record_success(self, batch_size: int, payload_bytes: int, latency: float) -> None:
+        """
+        成功したリクエストの結果を反映
+
+        Args:
+            batch_size: 送信したステートメント数
+            payload_bytes: リクエストボディのバイト数
+            latency: 応答までの秒数
+        """
+        self.history.append(batch_size)
+        self._observe_bytes(batch_size, payload_bytes)
+
+        if latency > self.target_latency:
+            self.current_size = self._clamp(int(batch_size * self.shrink_factor))
+        elif latency < self.target_latency / 2 and batch_size >= self.current_size:
+            # 上限まで使い切ったバッチが速く返ってきた場合のみ拡大
+            self.current_size = self._clamp(max(batch_size + 1, int(batch_size * self.growth_factor)))
+
+        logger.debug(
+            "Batch size adjusted",
+            extra={
+                "context": {
+                    "batch_size": batch_size,
+                    "payload_bytes": payload_bytes,
+                    "latency": round(latency, 3),
+                    "next_size": self.next_batch_size()
+                }
+            }
+        )
+
+    def record_failure(self, batch_size: int, payload_bytes: int, status_code: int) -> None:
+        """
+        413/5xx等で失敗したリクエストの結果を反映（縮小）
+
+        Args:
+            batch_size: 送信したステートメント数
+            payload_bytes: リクエストボディのバイト数
+            status_code: HTTPステータスコード
+        """
+        self._observe_bytes(batch_size, payload_bytes)
+        self.current_size = self._clamp(int(batch_size * self.shrink_factor))
+
+        logger.warning(
+            f"Batch rejected with HTTP {status_code}, shrinking batch size",
+            extra={"context": {"batch_size": batch_size, "next_size": self.current_size}}
+        )
+
+    def should_shrink(self, status_code: int) -> bool:
+        """以降のバッチを縮小すべきHTTPステータスか判定"""
+        return status_code == 413 or status_code >= 500
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        """
+        縮小して同じバッチを再送してよいHTTPステータスか判定
+
+        413はリクエストが処理されずに拒否されたことを示すため再送できる。
+        502/504等の5xxはプロキシ経由ではTurso側のコミット後に返ることがあり、非冪等なINSERTを
+        再送すると主キー違反や行の重複、コミット通知の二重計上になるため再送しない
+        """
+        return status_code == 413
+
+    def _observe_bytes(self, batch_size: int, payload_bytes: int) -> None:
+        """1文あたりのバイト数を指数移動平均で更新"""
+        if batch_size <= 0:
+            return
+        observed = payload_bytes / batch_size
+        if self.bytes_per_statement <= 0:
+            self.bytes_per_statement = observed
+        else:
+            self.bytes_per_statement = 0.7 * self.bytes_per_statement + 0.3 * observed
+
+    def _clamp(self, size: int) -> int:
+        return max(self.min_size, min(self.max_size, size))
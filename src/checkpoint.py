@@ -0,0 +1,117 @@
+"""Checkpointモジュール - 全件同期のアップロード進捗の保存と再開"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+
+from memory_optimizer import widen_dtypes
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SyncCheckpoint:
+    """
+    テーブルごとのアップロード進捗
+
+    content_hashが一致し、コミット済みの各範囲のINSERT文のハッシュが一致する場合のみ
+    committed_statements番目のINSERT文から再開できる
+    """
+    # 変換後のDataFrameの内容ハッシュ（シートの内容が変わった場合は再開しない）
+    content_hash: str
+    # コミットが確認されたINSERT文の数（先頭からの連続した範囲）
+    committed_statements: int = 0
+    # コミット済みの行数（再開前にテーブルの行数と照合する）
+    committed_rows: int = 0
+    # コミット済みバッチごとの [開始位置, 終了位置, INSERT文のハッシュ]
+    range_hashes: List[List[Any]] = field(default_factory=list)
+
+    def record(self, statements: List[Union[str, Dict[str, Any]]], start: int, end: int, rows_written: int) -> None:
+        """statements[start:end]のバッチのコミットを記録（連続しない範囲は無視）"""
+        if start != self.committed_statements:
+            return
+        self.range_hashes.append([start, end, hash_statement_range(statements, start, end)])
+        self.committed_statements = end
+        self.committed_rows += rows_written
+
+    def resume_offset(self, content_hash: str, statements: List[Union[str, Dict[str, Any]]]) -> int:
+        """
+        今回のINSERT文で再開できる位置（再開できない場合は0）
+
+        内容ハッシュと、コミット済みの全範囲のINSERT文のハッシュが一致する必要がある
+        """
+        if content_hash != self.content_hash or self.committed_statements > len(statements):
+            return 0
+        for start, end, range_hash in self.range_hashes:
+            if hash_statement_range(statements, start, end) != range_hash:
+                return 0
+        return self.committed_statements
+
+
+def compute_content_hash(df: pd.DataFrame) -> str:
+    """カラム名・dtype・全行の値から内容ハッシュを計算"""
+    df = widen_dtypes(df)
+    digest = hashlib.sha256()
+    digest.update("|".join(f"{col}:{dtype}" for col, dtype in df.dtypes.items()).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def hash_statement_range(statements: List[Union[str, Dict[str, Any]]], start: int, end: int) -> str:
+    """statements[start:end]のハッシュ"""
+    encoded = json.dumps(statements[start:end], ensure_ascii=False, allow_nan=False)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+class CheckpointStore:
+    """テーブルごとのチェックポイントをJSONファイルとして保存"""
+
+    def __init__(self, directory: str, target_key: Optional[str] = None):
+        """
+        Args:
+            directory: チェックポイントファイルの保存先ディレクトリ
+            target_key: 同期先を識別するキー（storage_backend.target_key）。指定時はファイルを
+                同期先ごとに分け、別の同期先の進捗から再開しないようにする
+        """
+        self.directory = directory
+        self.target_key = target_key
+
+    def load(self, table_name: str) -> Optional[SyncCheckpoint]:
+        """保存済みのチェックポイントを読み込み（存在しない・壊れている場合はNone）"""
+        path = self._path(table_name)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return SyncCheckpoint(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return None
+
+    def save(self, table_name: str, checkpoint: SyncCheckpoint) -> None:
+        """チェックポイントを保存（一時ファイルに書いてから置き換える）"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(table_name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(checkpoint), f)
+        os.replace(tmp_path, path)
+
+    def clear(self, table_name: str) -> None:
+        """チェックポイントを削除（同期完了時）"""
+        try:
+            os.remove(self._path(table_name))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, table_name: str) -> str:
+        """(同期先, テーブル) ごとのチェックポイントファイルパス"""
+        filename = f"{table_name}.json"
+        if self.target_key:
+            filename = f"{self.target_key}_{filename}"
+        return os.path.join(self.directory, filename)
@@ -10,3 +10,43 @@ BROOCHES_GID = 1087762308
 
 # CSVエクスポートURLテンプレート
 CSV_EXPORT_URL_TEMPLATE = "https://docs.google.com/spreadsheets/d/{spreadsheet_id}/export?format=csv&gid={gid}"
+
+# SQLiteの上限値（複数行INSERTのサイズ計算に使用）
+# https://www.sqlite.org/limits.html
+SQLITE_MAX_VARIABLE_NUMBER = 32766  # ホストパラメータ数の上限（SQLite 3.32.0以降のデフォルト）
+SQLITE_MAX_SQL_LENGTH = 1000000  # SQL文の最大長（バイト）
+
+# 1リクエストあたりのINSERT文数
+DEFAULT_BATCH_SIZE = 50
+
+# INSERT文の構築モード
+# literal: 値を埋め込んだSQL文字列
+# parameterized: プレースホルダーSQL + 型付き引数配列（{"q": ..., "params": [...]}）
+# multirow: 複数行をまとめた INSERT ... VALUES (...),(...),... + 引数配列
+INSERT_MODES = ['literal', 'parameterized', 'multirow']
+
+# 同期戦略
+# full: 全件DELETE → 全件INSERT
+# delta: ID主キーの行ハッシュを比較し、追加・変更・削除行のみ反映
+# swap: ステージングテーブルに全件ロード後、RENAMEで本番テーブルと入れ替え
+SYNC_STRATEGIES = ['full', 'delta', 'swap']
+
+# 同期先データベース（STORAGE_BACKEND）
+# turso: Turso HTTP API（TURSO_DATABASE_URL、TURSO_AUTH_TOKEN）
+# sqlite: ローカルのSQLiteファイル（SQLITE_DATABASE_PATH、WALモード）
+STORAGE_BACKENDS = ['turso', 'sqlite']
+DEFAULT_SQLITE_DATABASE_PATH = "i7_datasync.db"
+
+# Tursoで全件DELETE → 全件INSERTを送信する方式（SYNC_TRANSACTION_MODE）
+# batched: DELETEと各INSERTバッチを別々のリクエストで送信（途中で失敗すると一部のみ反映される）
+# pipeline: Hrana over HTTP（/v2/pipeline）のストリーム上でBEGIN〜COMMITを実行し、全件をアトミックに反映
+TRANSACTION_MODES = ['batched', 'pipeline']
+HRANA_PIPELINE_PATH = "/v2/pipeline"
+
+# 複数行INSERTの設定
+MULTIROW_MAX_ROWS_PER_STATEMENT = 500  # 1文あたりの最大行数
+MULTIROW_STATEMENTS_PER_BATCH = 5  # 1リクエストあたりの複数行INSERT文数
+
+# ストリーミング同期の設定
+DEFAULT_CHUNK_ROWS = 5000  # CSVを分割して読み込む際の1チャンクあたりの行数
+PIPELINE_QUEUE_SIZE = 4  # ステージ間キューに保持する最大チャンク数（バックプレッシャー）
@@ -1,12 +1,21 @@
 """CSVFetcherモジュール - Google Spreadsheet CSV取得"""
 
+import csv
+import hashlib
+import io
+import json
+import os
 import pandas as pd
 import requests
+import urllib3
 from io import StringIO
-from typing import Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, TypeVar, Union
 import time
 
-from constants import CSV_EXPORT_URL_TEMPLATE
+import instrumentation
+import metrics
+from constants import CSV_EXPORT_URL_TEMPLATE, DEFAULT_CHUNK_ROWS
+from http_session import create_session
 from logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,22 +26,87 @@ class CSVFetchError(Exception):
     pass
 
 
+class CSVDownloadError(CSVFetchError):
+    """本文の受信途中での切断・タイムアウト（最初からやり直せば成功しうる）"""
+    pass
+
+
 class DataFrameParseError(Exception):
     """DataFrame解析エラー"""
     pass
 
 
+# 本文の受信中（pd.read_csvがresponse.rawを読む間）に発生しうる通信エラー
+DOWNLOAD_ERRORS = (
+    requests.RequestException,
+    urllib3.exceptions.ProtocolError,
+    urllib3.exceptions.ReadTimeoutError,
+)
+
+
+T = TypeVar("T")
+
+
+class _DigestReader(io.RawIOBase):
+    """元のストリームを読みながら、読み込んだバイト列のSHA-256を計算する"""
+
+    def __init__(self, stream: Any):
+        self._stream = stream
+        self.digest = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        self.digest.update(data)
+        return len(data)
+
+
 class CSVFetcher:
     """Google SpreadsheetsのCSVエクスポートからデータを取得するクライアント"""
 
-    def __init__(self, max_retries: int = 3, retry_delay: float = 1.0):
+    def __init__(
+        self,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        pool_size: int = 10,
+        session: Optional[requests.Session] = None,
+        state_dir: Optional[str] = None,
+        url_template: str = CSV_EXPORT_URL_TEMPLATE,
+        state_key: Optional[str] = None
+    ):
         """
         Args:
             max_retries: 最大リトライ回数
             retry_delay: リトライ間隔（秒）
+            pool_size: HTTPコネクションプールのサイズ
+            session: 共有するrequests.Session（省略時はプール付きセッションを生成）
+            state_dir: 条件付き取得の状態ファイル保存先（Noneの場合は常に全件取得）
+            url_template: CSVエクスポートURLのテンプレート（{spreadsheet_id}と{gid}を含む）
+            state_key: 同期先を識別するキー（storage_backend.target_key）。指定時は状態ファイルを
+                同期先ごとに分け、別の同期先への同期で「変更なし」と判定されないようにする
         """
         self.max_retries = max_retries
+        self.url_template = url_template
         self.retry_delay = retry_delay
+        self.state_dir = state_dir
+        self.state_key = state_key
+        # 同期成功前の取得状態（commit_fetch_stateで保存）
+        self._pending_states: Dict[tuple, Dict[str, Any]] = {}
+        # 全シートの取得で同じセッションを使い回し、TCP/TLSハンドシェイクを省略する
+        self.session = session or create_session(
+            pool_size=pool_size,
+            max_retries=max_retries,
+            backoff_factor=retry_delay,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",)
+        )
+
+    def close(self) -> None:
+        """HTTPセッションを閉じる"""
+        self.session.close()
 
     def fetch_csv_as_dataframe(
         self,
@@ -40,17 +114,23 @@ class CSVFetcher:
         gid: int,
         timeout: int = 30,
         header: int = 0,
-        use_multirow_header: bool = False
+        use_multirow_header: bool = False,
+        chunk_rows: Optional[int] = None
     ) -> pd.DataFrame:
         """
         指定されたSpreadsheetシートをCSVエクスポートURLから取得してDataFrameに変換
 
+        iter_csv_chunksで受信したチャンクを結合する薄いラッパー。
+        本文全体の文字列とそのコピーを保持しないため、ピークメモリはDataFrame本体程度に収まる。
+        本文の受信途中で切断・タイムアウトした場合はリクエストからやり直す（最大max_retries回）
+
         Args:
             spreadsheet_id: SpreadsheetのID
             gid: シートのgid
             timeout: HTTPリクエストタイムアウト（秒）
             header: ヘッダー行の位置（0-indexed）。デフォルトは0（1行目）
             use_multirow_header: 2行ヘッダーを解析するかどうか
+            chunk_rows: 1チャンクあたりの行数（Noneの場合は一括解析し、全行を見て型を推測）
 
         Returns:
             pandas DataFrame
@@ -59,6 +139,342 @@ class CSVFetcher:
             CSVFetchError: CSV取得失敗時（HTTP エラー、タイムアウト等）
             DataFrameParseError: CSV解析失敗時
         """
+        chunks = self._retry_download(spreadsheet_id, gid, lambda: list(self.iter_csv_chunks(
+            spreadsheet_id, gid, chunk_rows, timeout, header, use_multirow_header
+        )))
+        if len(chunks) == 1:
+            return chunks[0]
+        return pd.concat(chunks)
+
+    def _retry_download(self, spreadsheet_id: str, gid: int, fetch: Callable[[], T]) -> T:
+        """
+        本文の受信途中で切断・タイムアウトした場合、fetchをリクエストからやり直す（最大max_retries回）
+
+        Raises:
+            CSVDownloadError: 全ての試行で受信に失敗した場合
+        """
+        for attempt in range(self.max_retries):
+            try:
+                return fetch()
+            except CSVDownloadError as e:
+                logger.warning(
+                    f"CSV download interrupted (attempt {attempt + 1}/{self.max_retries})",
+                    extra={"context": {"spreadsheet_id": spreadsheet_id, "gid": gid, "error": str(e)}}
+                )
+                if attempt < self.max_retries - 1:
+                    metrics.CSV_FETCH_RETRIES.inc()
+                    time.sleep(self.retry_delay)
+                    continue
+                raise
+
+    def iter_csv_chunks(
+        self,
+        spreadsheet_id: str,
+        gid: int,
+        chunk_rows: Optional[int] = DEFAULT_CHUNK_ROWS,
+        timeout: int = 30,
+        header: int = 0,
+        use_multirow_header: bool = False
+    ) -> Iterator[pd.DataFrame]:
+        """
+        CSVをストリーミングで受信し、chunk_rows行ごとのDataFrameを順に返す
+
+        レスポンス本文を保持せずに受信したバイト列をそのまま解析するため、
+        後続のチャンクを受信している間に前のチャンクを処理できる。
+        型はチャンクごとに推測される。
+        チャンクを返し始めた後は再送できないため、受信途中の切断・タイムアウトは
+        CSVDownloadErrorとして呼び出し元に伝える（fetch_csv_as_dataframeはやり直す）。
+        計測時はリクエストをfetchステージ、本文の受信と解析をparseステージとして記録する
+
+        Args:
+            spreadsheet_id: SpreadsheetのID
+            gid: シートのgid
+            chunk_rows: 1チャンクあたりの行数（Noneの場合は全行を1チャンクとして返す）
+            timeout: HTTPリクエストタイムアウト（秒）
+            header: ヘッダー行の位置（0-indexed）
+            use_multirow_header: 2行ヘッダーを解析するかどうか
+
+        Yields:
+            pandas DataFrame（全チャンクで同じカラム）
+
+        Raises:
+            CSVFetchError: CSV取得失敗時（HTTP エラー、タイムアウト等）
+            CSVDownloadError: 本文の受信途中での切断・タイムアウト
+            DataFrameParseError: CSV解析失敗時
+        """
+        with instrumentation.stage("fetch"):
+            response = self._request_csv(spreadsheet_id, gid, timeout, stream=True)
+        try:
+            # Content-Encoding（gzip等）を展開した本文を読み込む
+            response.raw.decode_content = True
+            record_count = 0
+            chunk_count = 0
+            chunks = self._read_csv_stream(response.raw, header, chunk_rows, use_multirow_header)
+            while True:
+                # 計測に呼び出し元の処理時間を含めないよう、チャンクの読み込みのみをステージとする
+                with instrumentation.stage("parse"):
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                record_count += len(chunk)
+                chunk_count += 1
+                yield chunk
+
+            # 展開前（受信したまま）のバイト数
+            downloaded_bytes = response.raw.tell()
+            metrics.CSV_DOWNLOADED_BYTES.inc(downloaded_bytes)
+
+            logger.info(
+                f"Successfully streamed CSV",
+                extra={
+                    "context": {
+                        "spreadsheet_id": spreadsheet_id,
+                        "gid": gid,
+                        "record_count": record_count,
+                        "chunk_count": chunk_count,
+                        "downloaded_bytes": downloaded_bytes
+                    }
+                }
+            )
+        finally:
+            response.close()
+
+    def _read_csv_stream(
+        self,
+        stream: Any,
+        header: int,
+        chunk_rows: Optional[int],
+        use_multirow_header: bool = False
+    ) -> Iterator[pd.DataFrame]:
+        """
+        バイト（またはテキスト）ストリームをCSVとして解析してDataFrameを順に返す
+
+        Raises:
+            CSVDownloadError: ストリームの読み込み中の通信エラー
+            DataFrameParseError: CSV解析失敗時
+        """
+        columns = None
+        read_options: Dict[str, Any] = {"header": header}
+        wrapper = None
+
+        if use_multirow_header:
+            if not isinstance(stream, io.TextIOBase):
+                # ヘッダー行の読み込み後、同じテキストストリームの続きをデータとして解析する
+                stream = wrapper = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        elif not isinstance(stream, io.TextIOBase):
+            read_options["encoding"] = 'utf-8'
+
+        try:
+            if use_multirow_header:
+                columns = self._read_multirow_columns(stream, header)
+                read_options = {"header": None, "names": list(range(len(columns)))}
+
+            if chunk_rows is None:
+                try:
+                    df = pd.read_csv(stream, **read_options)
+                except Exception as e:
+                    raise self._read_error(e)
+                if columns is not None:
+                    df.columns = columns[:len(df.columns)]
+                yield df
+                return
+
+            try:
+                reader = pd.read_csv(stream, chunksize=chunk_rows, **read_options)
+            except Exception as e:
+                raise self._read_error(e)
+
+            with reader:
+                while True:
+                    try:
+                        chunk = next(reader)
+                    except StopIteration:
+                        return
+                    except Exception as e:
+                        raise self._read_error(e)
+                    if columns is not None:
+                        chunk.columns = columns[:len(chunk.columns)]
+                    yield chunk
+        except DOWNLOAD_ERRORS as e:
+            # 2行ヘッダーの読み込み中の通信エラー
+            raise self._read_error(e)
+        finally:
+            # ラッパーの破棄で元のストリーム（レスポンス本文）が閉じられないよう切り離す
+            if wrapper is not None and not wrapper.closed:
+                wrapper.detach()
+
+    def _read_error(self, error: Exception) -> Exception:
+        """読み込み中の例外を、通信エラーはCSVDownloadError、それ以外はDataFrameParseErrorに変換"""
+        if isinstance(error, DOWNLOAD_ERRORS):
+            return CSVDownloadError(f"Download interrupted: {error}")
+        return DataFrameParseError(f"Failed to parse CSV to DataFrame: {error}")
+
+    def fetch_csv_if_modified(
+        self,
+        spreadsheet_id: str,
+        gid: int,
+        timeout: int = 30,
+        header: int = 0,
+        use_multirow_header: bool = False
+    ) -> Optional[pd.DataFrame]:
+        """
+        前回同期時から変更がある場合のみCSVを取得してDataFrameに変換
+
+        state_dir指定時は前回のETag/Last-Modifiedで条件付きリクエストを送り、
+        304応答または本文のSHA-256ダイジェストが一致した場合はNoneを返す。
+        本文はfetch_csv_as_dataframeと同じくストリーミングで解析し、ダイジェストは受信したバイト列から
+        解析と同時に計算するため、本文全体をメモリに保持しない（一致した場合は解析結果を破棄する）。
+        新しい状態はcommit_fetch_stateが呼ばれるまで保存しない。
+
+        Args:
+            spreadsheet_id: SpreadsheetのID
+            gid: シートのgid
+            timeout: HTTPリクエストタイムアウト（秒）
+            header: ヘッダー行の位置（0-indexed）
+            use_multirow_header: 2行ヘッダーを解析するかどうか
+
+        Returns:
+            pandas DataFrame（変更なしの場合はNone）
+
+        Raises:
+            CSVFetchError: CSV取得失敗時（HTTP エラー、タイムアウト等）
+            DataFrameParseError: CSV解析失敗時
+        """
+        if not self.state_dir:
+            return self.fetch_csv_as_dataframe(spreadsheet_id, gid, timeout, header, use_multirow_header)
+
+        state = self._load_fetch_state(spreadsheet_id, gid)
+        conditional_headers = {}
+        if state.get("etag"):
+            conditional_headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            conditional_headers["If-Modified-Since"] = state["last_modified"]
+
+        return self._retry_download(spreadsheet_id, gid, lambda: self._fetch_if_modified_once(
+            spreadsheet_id, gid, timeout, header, use_multirow_header, conditional_headers,
+            state.get("content_digest")
+        ))
+
+    def _fetch_if_modified_once(
+        self,
+        spreadsheet_id: str,
+        gid: int,
+        timeout: int,
+        header: int,
+        use_multirow_header: bool,
+        conditional_headers: Dict[str, str],
+        previous_digest: Optional[str]
+    ) -> Optional[pd.DataFrame]:
+        """条件付きリクエストを1回送信し、変更があればストリーミングで解析したDataFrameを返す"""
+        with instrumentation.stage("fetch"):
+            response = self._request_csv(spreadsheet_id, gid, timeout, headers=conditional_headers, stream=True)
+
+        try:
+            if response.status_code == 304:
+                logger.info(
+                    "CSV not modified (HTTP 304)",
+                    extra={"context": {"spreadsheet_id": spreadsheet_id, "gid": gid}}
+                )
+                return None
+
+            # Content-Encoding（gzip等）を展開した本文のダイジェストを解析と同時に計算する
+            response.raw.decode_content = True
+            reader = _DigestReader(response.raw)
+            with instrumentation.stage("parse"):
+                df = next(self._read_csv_stream(io.BufferedReader(reader), header, None, use_multirow_header))
+            content_digest = reader.digest.hexdigest()
+            metrics.CSV_DOWNLOADED_BYTES.inc(response.raw.tell())
+        finally:
+            response.close()
+
+        if content_digest == previous_digest:
+            logger.info(
+                "CSV content unchanged",
+                extra={
+                    "context": {
+                        "spreadsheet_id": spreadsheet_id,
+                        "gid": gid,
+                        "content_digest": content_digest
+                    }
+                }
+            )
+            return None
+
+        logger.info(
+            f"Successfully fetched CSV",
+            extra={
+                "context": {
+                    "spreadsheet_id": spreadsheet_id,
+                    "gid": gid,
+                    "record_count": len(df)
+                }
+            }
+        )
+        self._pending_states[(spreadsheet_id, gid)] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_digest": content_digest
+        }
+        return df
+
+    def commit_fetch_state(self, spreadsheet_id: str, gid: int) -> None:
+        """
+        fetch_csv_if_modifiedで取得した内容の状態を保存
+
+        同期が成功した後に呼び出すことで、失敗した同期が次回スキップされるのを防ぐ
+
+        Args:
+            spreadsheet_id: SpreadsheetのID
+            gid: シートのgid
+        """
+        state = self._pending_states.pop((spreadsheet_id, gid), None)
+        if not self.state_dir or state is None:
+            return
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        path = self._state_path(spreadsheet_id, gid)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+        logger.debug(f"Saved fetch state: {path}")
+
+    def _load_fetch_state(self, spreadsheet_id: str, gid: int) -> Dict[str, Any]:
+        """保存済みの取得状態を読み込み（存在しない・壊れている場合は空）"""
+        path = self._state_path(spreadsheet_id, gid)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable fetch state {path}: {e}")
+            return {}
+
+    def _state_path(self, spreadsheet_id: str, gid: int) -> str:
+        """(同期先, spreadsheet_id, gid) ごとの状態ファイルパス"""
+        filename = f"{spreadsheet_id}_{gid}.json"
+        if self.state_key:
+            filename = f"{self.state_key}_{filename}"
+        return os.path.join(self.state_dir, filename)
+
+    def _request_csv(
+        self,
+        spreadsheet_id: str,
+        gid: int,
+        timeout: int,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False
+    ) -> requests.Response:
+        """
+        CSVエクスポートURLにGETリクエストを送信（タイムアウト時はリトライ）
+
+        stream=Trueの場合は本文を読み込まずにレスポンスを返す（呼び出し側でcloseすること）
+
+        Raises:
+            CSVFetchError: CSV取得失敗時（HTTP エラー、タイムアウト等）
+        """
         url = self._build_csv_url(spreadsheet_id, gid)
 
         for attempt in range(self.max_retries):
@@ -75,34 +491,11 @@ class CSVFetcher:
                     }
                 )
 
-                response = requests.get(url, timeout=timeout)
+                started = time.perf_counter()
+                response = self.session.get(url, timeout=timeout, headers=headers, stream=stream)
                 response.raise_for_status()
-
-                # UTF-8エンコーディングを明示的に設定
-                response.encoding = 'utf-8'
-
-                # DataFrameに変換
-                try:
-                    if use_multirow_header:
-                        # 2行ヘッダーを解析
-                        df = self._parse_multirow_header(response.text, header)
-                    else:
-                        df = pd.read_csv(StringIO(response.text), header=header)
-
-                    logger.info(
-                        f"Successfully fetched CSV",
-                        extra={
-                            "context": {
-                                "spreadsheet_id": spreadsheet_id,
-                                "gid": gid,
-                                "record_count": len(df)
-                            }
-                        }
-                    )
-                    return df
-
-                except Exception as e:
-                    raise DataFrameParseError(f"Failed to parse CSV to DataFrame: {e}")
+                metrics.CSV_FETCH_DURATION.observe(time.perf_counter() - started)
+                return response
 
             except requests.HTTPError as e:
                 logger.error(
@@ -131,6 +524,7 @@ class CSVFetcher:
                 )
 
                 if attempt < self.max_retries - 1:
+                    metrics.CSV_FETCH_RETRIES.inc()
                     time.sleep(self.retry_delay)
                     continue
                 else:
@@ -149,22 +543,58 @@ class CSVFetcher:
                 )
                 raise CSVFetchError(f"Request error: {e}")
 
-    def _parse_multirow_header(self, csv_text: str, data_start_row: int) -> pd.DataFrame:
+    def _parse_multirow_header(self, source: Union[str, TextIO], data_start_row: int) -> pd.DataFrame:
         """
         2行ヘッダーを解析してカテゴリー名とカラム名を結合
 
         Args:
-            csv_text: CSVテキスト
+            source: CSVテキストまたはテキストストリーム
             data_start_row: データ開始行（0-indexed）。例: 1なら行2からデータ
 
         Returns:
             pandas DataFrame（結合されたカラム名を持つ）
         """
-        lines = csv_text.split('\n')
+        if isinstance(source, str):
+            source = StringIO(source)
+        return next(self._read_csv_stream(source, data_start_row, None, use_multirow_header=True))
+
+    def _read_multirow_columns(self, text_stream: TextIO, data_start_row: int) -> List[str]:
+        """
+        先頭data_start_row + 1レコードだけをCSVトークナイザーで読み、結合カラム名を作成
+
+        クォート内のカンマ・改行を正しく扱い、ストリームはデータ行の先頭で止まる
+
+        Args:
+            text_stream: CSVテキストストリーム
+            data_start_row: データ開始行（0-indexed）
+
+        Returns:
+            結合されたカラム名のリスト
 
-        # Row 0: Categories, Row 1: Column names
-        category_row = lines[0].split(',')
-        column_row = lines[data_start_row].split(',')
+        Raises:
+            DataFrameParseError: ヘッダー行が不足している場合
+        """
+        reader = csv.reader(text_stream)
+        header_rows: List[List[str]] = []
+        while len(header_rows) < data_start_row + 1:
+            try:
+                record = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                raise DataFrameParseError(f"Failed to parse CSV header: {e}")
+            # pandasと同様に空行はヘッダー行として数えない
+            if record:
+                header_rows.append(record)
+
+        if len(header_rows) < data_start_row + 1:
+            raise DataFrameParseError(
+                f"CSV has {len(header_rows)} header rows, expected {data_start_row + 1}"
+            )
+
+        # Row 0: Categories, Row data_start_row: Column names
+        category_row = header_rows[0]
+        column_row = header_rows[data_start_row]
 
         # カテゴリーとカラム名を結合してユニークなカラム名を作成
         combined_columns = []
@@ -189,23 +619,13 @@ class CSVFetcher:
 
             combined_columns.append(combined)
 
-        # データ部分を読み込み（header=data_start_row+1でデータ開始）
-        df = pd.read_csv(
-            StringIO(csv_text),
-            header=data_start_row,
-            skiprows=None
-        )
-
-        # カラム名を結合したものに置き換え
-        df.columns = combined_columns[:len(df.columns)]
-
         logger.debug(f"Parsed multirow header: {len(combined_columns)} columns created")
 
-        return df
+        return combined_columns
 
     def _build_csv_url(self, spreadsheet_id: str, gid: int) -> str:
         """CSVエクスポートURLを構築"""
-        return CSV_EXPORT_URL_TEMPLATE.format(
+        return self.url_template.format(
             spreadsheet_id=spreadsheet_id,
             gid=gid
         )
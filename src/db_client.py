@@ -1,10 +1,20 @@
 """DatabaseClientモジュール - Tursoデータベース接続"""
 
 import os
-from typing import List, Dict, Any, Optional
+import json
+import base64
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Union
 import requests
 
+import instrumentation
+import metrics
+from batch_sizer import AdaptiveBatchSizer
+from constants import HRANA_PIPELINE_PATH, TRANSACTION_MODES
+from http_session import create_session
 from logger import get_logger
+from storage_backend import BatchCallback, CancelCheck
 
 logger = get_logger(__name__)
 
@@ -22,8 +32,35 @@ class DatabaseTransactionError(Exception):
 class DatabaseClient:
     """Tursoデータベースクライアント（HTTP API経由）"""
 
-    def __init__(self):
-        """環境変数（TURSO_DATABASE_URL、TURSO_AUTH_TOKEN）から接続情報を取得"""
+    # バッチサイズ自動調整時、413応答のバッチを縮小して再送する最大回数
+    MAX_BATCH_RETRIES = 3
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        session: Optional[requests.Session] = None,
+        max_in_flight: int = 1,
+        transaction_mode: str = "batched"
+    ):
+        """
+        環境変数（TURSO_DATABASE_URL、TURSO_AUTH_TOKEN）から接続情報を取得
+
+        Args:
+            pool_size: HTTPコネクションプールのサイズ
+            max_retries: 接続エラー時の最大リトライ回数
+            session: 共有するrequests.Session（省略時はプール付きセッションを生成）
+            max_in_flight: 互いに独立したINSERTバッチを同時に送信するリクエスト数の上限（1の場合は逐次送信）
+            transaction_mode: execute_transactionの送信方式（batched: バッチごとに別リクエスト、
+                pipeline: Hranaパイプラインの単一トランザクション）
+        """
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be >= 1: {max_in_flight}")
+        if transaction_mode not in TRANSACTION_MODES:
+            raise ValueError(f"Invalid transaction_mode: {transaction_mode}")
+        self.max_in_flight = max_in_flight
+        self.transaction_mode = transaction_mode
+
         database_url = os.getenv("TURSO_DATABASE_URL")
         self.auth_token = os.getenv("TURSO_AUTH_TOKEN")
 
@@ -36,10 +73,24 @@ class DatabaseClient:
         if database_url.startswith("libsql://"):
             host = database_url.replace("libsql://", "")
             self.http_url = f"https://{host}"
-        elif database_url.startswith("https://"):
+        elif database_url.startswith(("https://", "http://")):
+            # http:// はローカルのスタンドイン（ベンチマーク等）向け
             self.http_url = database_url
         else:
             raise ValueError(f"Invalid database URL format: {database_url}")
+        self.target = f"turso:{self.http_url}"
+
+        # 全バッチ・全テーブルで同じKeep-Aliveセッションを使い回す
+        # POSTは冪等でないため、アダプターでのリトライは接続確立前のエラーに限定する
+        self.session = session or create_session(pool_size=pool_size, max_retries=max_retries)
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.auth_token}",
+            "Content-Type": "application/json"
+        })
+
+    def close(self) -> None:
+        """HTTPセッションを閉じる"""
+        self.session.close()
 
     def connect(self) -> None:
         """
@@ -52,15 +103,7 @@ class DatabaseClient:
             logger.info("Connecting to Turso database via HTTP API")
 
             # Turso HTTP APIはステートレスなので接続テストを実行
-            response = requests.post(
-                self.http_url,
-                headers={
-                    "Authorization": f"Bearer {self.auth_token}",
-                    "Content-Type": "application/json"
-                },
-                json={"statements": ["SELECT 1"]},
-                timeout=10
-            )
+            response = self._post(self._encode_statements(["SELECT 1"]), timeout=10)
             response.raise_for_status()
 
             logger.info("Successfully connected to Turso database")
@@ -72,21 +115,31 @@ class DatabaseClient:
     def execute_transaction(
         self,
         delete_query: str,
-        insert_statements: List[str],
-        batch_size: int = 50
-    ) -> Dict[str, int]:
+        insert_statements: List[Union[str, Dict[str, Any]]],
+        batch_size: int = 50,
+        batch_sizer: Optional[AdaptiveBatchSizer] = None,
+        on_batch_committed: Optional[BatchCallback] = None,
+        check_cancelled: Optional[CancelCheck] = None
+    ) -> Dict[str, Any]:
         """
         トランザクション内で削除とバッチ挿入を実行
 
-        大量のINSERT文をバッチに分割して実行することでタイムアウトを防ぐ
+        大量のINSERT文をバッチに分割して実行することでタイムアウトを防ぐ。
+        transaction_mode="pipeline"の場合はDELETEと全バッチを単一のトランザクションでコミットする
+        （_execute_pipeline_transaction）
 
         Args:
             delete_query: DELETE文（例: "DELETE FROM songs"）
-            insert_statements: INSERT文のリスト
+            insert_statements: INSERT文のリスト（SQL文字列、または{"q": SQL, "params": [...]}形式）
             batch_size: 1バッチあたりのINSERT文数（デフォルト: 50）
+            batch_sizer: 指定時はbatch_sizeの代わりに応答に応じてバッチサイズを自動調整
+            on_batch_committed: INSERTバッチが反映されるたびに(開始位置, 終了位置, 書き込み行数)で呼ばれる
+                （pipelineモードでは途中のバッチはコミットされないため呼ばれない）
+            check_cancelled: 各リクエストの送信前に呼ばれ、例外を送出した場合は送信を中断する
+                （pipelineモードではROLLBACKしてストリームを閉じる）
 
         Returns:
-            {"deleted": N, "inserted": M}
+            {"deleted": N, "inserted": M, "batch_sizes": [送信したバッチサイズ, ...]}
 
         Raises:
             DatabaseTransactionError: トランザクション失敗時
@@ -98,24 +151,24 @@ class DatabaseClient:
                     "context": {
                         "delete_query": delete_query,
                         "insert_count": len(insert_statements),
-                        "batch_size": batch_size
+                        "batch_size": batch_size,
+                        "transaction_mode": self.transaction_mode
                     }
                 }
             )
 
+            if self.transaction_mode == "pipeline":
+                return self._execute_pipeline_transaction(
+                    delete_query, insert_statements, batch_size, batch_sizer, check_cancelled
+                )
+
             deleted_count = 0
-            inserted_count = 0
+
+            if check_cancelled:
+                check_cancelled()
 
             # 1. DELETE実行
-            response = requests.post(
-                self.http_url,
-                headers={
-                    "Authorization": f"Bearer {self.auth_token}",
-                    "Content-Type": "application/json"
-                },
-                json={"statements": [delete_query]},
-                timeout=30
-            )
+            response = self._post(self._encode_statements([delete_query]), timeout=30)
             response.raise_for_status()
 
             delete_result = response.json()
@@ -130,37 +183,11 @@ class DatabaseClient:
             logger.info(f"Deleted {deleted_count} rows")
 
             # 2. INSERT文をバッチに分割して実行
-            total_batches = (len(insert_statements) + batch_size - 1) // batch_size
-
-            for batch_idx in range(total_batches):
-                start_idx = batch_idx * batch_size
-                end_idx = min(start_idx + batch_size, len(insert_statements))
-                batch = insert_statements[start_idx:end_idx]
-
-                logger.info(
-                    f"Executing batch {batch_idx + 1}/{total_batches}",
-                    extra={"context": {"records": f"{start_idx + 1}-{end_idx}"}}
-                )
-
-                response = requests.post(
-                    self.http_url,
-                    headers={
-                        "Authorization": f"Bearer {self.auth_token}",
-                        "Content-Type": "application/json"
-                    },
-                    json={"statements": batch},
-                    timeout=60
-                )
-                response.raise_for_status()
-
-                batch_result = response.json()
-                if isinstance(batch_result, list):
-                    for idx, insert_result in enumerate(batch_result):
-                        if insert_result and "results" in insert_result and "rows_written" in insert_result["results"]:
-                            inserted_count += insert_result["results"]["rows_written"]
-                        elif insert_result and "error" in insert_result:
-                            logger.error(f"INSERT failed in batch {batch_idx + 1}, statement {idx + 1}: {insert_result['error']}")
-                            raise DatabaseTransactionError(f"INSERT failed: {insert_result['error']}")
+            inserted_count, batch_sizes = self._execute_batches(
+                insert_statements, batch_size, label="INSERT", batch_sizer=batch_sizer,
+                max_in_flight=self.max_in_flight, on_batch_committed=on_batch_committed,
+                check_cancelled=check_cancelled
+            )
 
             logger.info(
                 "Transaction completed successfully",
@@ -174,7 +201,8 @@ class DatabaseClient:
 
             return {
                 "deleted": deleted_count,
-                "inserted": inserted_count
+                "inserted": inserted_count,
+                "batch_sizes": batch_sizes
             }
 
         except requests.HTTPError as e:
@@ -191,27 +219,523 @@ class DatabaseClient:
             )
             raise DatabaseTransactionError(f"Transaction failed: {e}")
 
+    def _execute_pipeline_transaction(
+        self,
+        delete_query: str,
+        insert_statements: List[Union[str, Dict[str, Any]]],
+        batch_size: int,
+        batch_sizer: Optional[AdaptiveBatchSizer] = None,
+        check_cancelled: Optional[CancelCheck] = None
+    ) -> Dict[str, Any]:
+        """
+        Hrana over HTTP（/v2/pipeline）のストリーム上でDELETEと全INSERTを単一トランザクションとして実行
+
+        最初のリクエストで BEGIN → DELETE → 最初のINSERTバッチ を送信し、以降は応答のbatonで同じ
+        ストリームに後続のバッチを送信する。最後のバッチにCOMMITとストリームのcloseを含めるため、
+        コミットのための追加リクエストは発生しない。
+        各リクエストはHranaのbatchとして送信し、各ステップは直前のステップが成功した場合のみ実行される
+        （失敗したステートメント以降のINSERTとCOMMITは実行されない）。
+        失敗時やcheck_cancelledによる中断時はROLLBACKしてストリームを閉じるため、
+        テーブルは同期前の状態のまま残る
+
+        batonで順番につなぐため並行送信（max_in_flight）は行わず、batch_sizer指定時も
+        413/5xx応答のバッチの縮小再送は行わない（トランザクション全体を失敗とする）
+
+        Returns:
+            {"deleted": N, "inserted": M, "batch_sizes": [送信したINSERTバッチサイズ, ...]}
+
+        Raises:
+            DatabaseTransactionError: いずれかのステートメントがエラーを返した場合
+            requests.HTTPError: HTTPエラー時
+        """
+        url = f"{self.http_url}{HRANA_PIPELINE_PATH}"
+        baton: Optional[str] = None
+        deleted_count = 0
+        inserted_count = 0
+        batch_sizes: List[int] = []
+        start_idx = 0
+        batch_idx = 0
+        committed = False
+
+        try:
+            while not committed:
+                if check_cancelled:
+                    check_cancelled()
+                size = batch_sizer.next_batch_size() if batch_sizer else batch_size
+                end_idx = min(start_idx + size, len(insert_statements))
+                batch = insert_statements[start_idx:end_idx]
+                is_first = batch_idx == 0
+                is_last = end_idx >= len(insert_statements)
+
+                steps = (["BEGIN", delete_query] if is_first else []) + batch + (["COMMIT"] if is_last else [])
+                pipeline_requests = [self._to_hrana_batch(steps)]
+                if is_last:
+                    pipeline_requests.append({"type": "close"})
+
+                logger.info(
+                    f"Executing pipeline batch {batch_idx + 1}",
+                    extra={"context": {"records": f"{start_idx + 1}-{end_idx}", "commit": is_last}}
+                )
+
+                payload = json.dumps(
+                    {"baton": baton, "requests": pipeline_requests},
+                    ensure_ascii=False,
+                    allow_nan=False
+                ).encode("utf-8")
+                started = time.monotonic()
+                response = self._post(payload, timeout=60, url=url)
+                latency = time.monotonic() - started
+                metrics.UPLOAD_BATCH_DURATION.observe(latency)
+                response.raise_for_status()
+
+                pipeline_result = response.json()
+                baton = pipeline_result.get("baton")
+                # サーバーがbase_urlを返した場合、同じストリームの後続リクエストはそちらに送信する
+                if pipeline_result.get("base_url"):
+                    url = f"{pipeline_result['base_url'].rstrip('/')}{HRANA_PIPELINE_PATH}"
+
+                step_results = self._pipeline_step_results(pipeline_result, batch_idx)
+                affected = [step_result.get("affected_row_count", 0) for step_result in step_results]
+                offset = 2 if is_first else 0
+                if is_first:
+                    deleted_count = affected[1]
+                inserted_count += sum(affected[offset:offset + len(batch)])
+
+                if batch_sizer:
+                    batch_sizer.record_success(len(batch), len(payload), latency)
+
+                if batch:
+                    batch_sizes.append(len(batch))
+                start_idx = end_idx
+                batch_idx += 1
+                committed = is_last
+
+        except Exception:
+            # ストリームが開いたままの場合は明示的にロールバックして閉じる
+            if baton is not None and not committed:
+                self._rollback_pipeline(url, baton)
+            raise
+
+        logger.info(
+            "Transaction completed successfully",
+            extra={
+                "context": {
+                    "deleted": deleted_count,
+                    "inserted": inserted_count,
+                    "requests": batch_idx
+                }
+            }
+        )
+
+        return {
+            "deleted": deleted_count,
+            "inserted": inserted_count,
+            "batch_sizes": batch_sizes
+        }
+
+    def _pipeline_step_results(self, pipeline_result: Dict[str, Any], batch_idx: int) -> List[Dict[str, Any]]:
+        """
+        パイプライン応答の先頭（batch）の各ステップの結果を返す
+
+        Raises:
+            DatabaseTransactionError: batchまたはいずれかのステップがエラーを返した場合
+        """
+        results = pipeline_result.get("results") or [{}]
+        batch_response = results[0]
+        if batch_response.get("type") != "ok":
+            error = batch_response.get("error", {}).get("message", batch_response)
+            logger.error(f"Pipeline batch {batch_idx + 1} failed: {error}")
+            raise DatabaseTransactionError(f"Pipeline batch failed: {error}")
+
+        batch_result = batch_response["response"]["result"]
+        for idx, (step_result, step_error) in enumerate(
+            zip(batch_result["step_results"], batch_result["step_errors"])
+        ):
+            if step_error:
+                logger.error(f"Statement failed in pipeline batch {batch_idx + 1}, step {idx + 1}: {step_error['message']}")
+                raise DatabaseTransactionError(f"Transaction failed: {step_error['message']}")
+            if step_result is None:
+                # 直前のステップが失敗した場合のみ発生する
+                raise DatabaseTransactionError(f"Step {idx + 1} in pipeline batch {batch_idx + 1} was not executed")
+
+        return batch_result["step_results"]
+
+    def _rollback_pipeline(self, url: str, baton: str) -> None:
+        """開いたままのストリームのトランザクションをロールバックして閉じる（失敗してもサーバー側で期限切れになる）"""
+        payload = json.dumps({
+            "baton": baton,
+            "requests": [{"type": "execute", "stmt": {"sql": "ROLLBACK"}}, {"type": "close"}]
+        }).encode("utf-8")
+        try:
+            self._post(payload, timeout=30, url=url).raise_for_status()
+            logger.info("Pipeline transaction rolled back")
+        except requests.RequestException as e:
+            logger.warning(f"Failed to roll back pipeline transaction: {e}")
+
+    def _to_hrana_batch(self, statements: List[Union[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        """ステートメント列を、各ステップが直前のステップの成功を条件とするHranaのbatchリクエストに変換"""
+        steps = []
+        for idx, statement in enumerate(statements):
+            step: Dict[str, Any] = {"stmt": self._to_hrana_stmt(statement)}
+            if idx > 0:
+                step["condition"] = {"type": "ok", "step": idx - 1}
+            steps.append(step)
+        return {"type": "batch", "batch": {"steps": steps}}
+
+    def _to_hrana_stmt(self, statement: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """SQL文字列または{"q": SQL, "params": [...]}をHranaのステートメントに変換"""
+        if isinstance(statement, dict):
+            sql, params = statement["q"], statement.get("params") or []
+        else:
+            sql, params = statement, []
+
+        stmt: Dict[str, Any] = {"sql": sql, "want_rows": False}
+        if params:
+            stmt["args"] = [self._to_hrana_value(value) for value in params]
+        return stmt
+
+    def _to_hrana_value(self, value: Any) -> Dict[str, Any]:
+        """引数をHranaの型付き値に変換（整数は精度を保つため文字列で送信）"""
+        if value is None:
+            return {"type": "null"}
+        if isinstance(value, (bool, int)):
+            return {"type": "integer", "value": str(int(value))}
+        if isinstance(value, float):
+            return {"type": "float", "value": value}
+        if isinstance(value, bytes):
+            return {"type": "blob", "base64": base64.b64encode(value).decode("ascii")}
+        return {"type": "text", "value": str(value)}
+
+    def execute_statements(
+        self,
+        statements: List[Union[str, Dict[str, Any]]],
+        batch_size: int = 50,
+        batch_sizer: Optional[AdaptiveBatchSizer] = None,
+        independent: bool = False,
+        on_batch_committed: Optional[BatchCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        任意のステートメント列をバッチに分割して順番に実行
+
+        Args:
+            statements: SQL文字列、または{"q": SQL, "params": [...]}形式のリスト
+            batch_size: 1バッチあたりのステートメント数（デフォルト: 50）
+            batch_sizer: 指定時はbatch_sizeの代わりに応答に応じてバッチサイズを自動調整
+            independent: 各バッチの実行順序に依存関係がない場合True（max_in_flight件まで並行送信）
+            on_batch_committed: バッチが反映されるたびに(開始位置, 終了位置, 書き込み行数)で呼ばれる
+
+        Returns:
+            {"rows_written": N, "batch_sizes": [送信したバッチサイズ, ...]}
+
+        Raises:
+            DatabaseTransactionError: 実行失敗時
+        """
+        try:
+            rows_written, batch_sizes = self._execute_batches(
+                statements, batch_size, label="Statement", batch_sizer=batch_sizer,
+                max_in_flight=self.max_in_flight if independent else 1,
+                on_batch_committed=on_batch_committed
+            )
+            return {"rows_written": rows_written, "batch_sizes": batch_sizes}
+
+        except requests.HTTPError as e:
+            error_msg = f"HTTP {e.response.status_code}: {e.response.text if e.response else str(e)}"
+            logger.error(
+                "Statement execution failed",
+                extra={"context": {"error": error_msg}}
+            )
+            raise DatabaseTransactionError(f"Statement execution failed: {error_msg}")
+        except Exception as e:
+            logger.error(
+                "Statement execution failed",
+                extra={"context": {"error": str(e)}}
+            )
+            raise DatabaseTransactionError(f"Statement execution failed: {e}")
+
+    def _execute_batches(
+        self,
+        statements: List[Union[str, Dict[str, Any]]],
+        batch_size: int,
+        label: str,
+        batch_sizer: Optional[AdaptiveBatchSizer] = None,
+        max_in_flight: int = 1,
+        on_batch_committed: Optional[BatchCallback] = None,
+        check_cancelled: Optional[CancelCheck] = None
+    ) -> Tuple[int, List[int]]:
+        """
+        ステートメントをバッチに分割してPOSTし、rows_writtenの合計を返す
+
+        batch_sizer指定時はバッチサイズを応答ごとに調整し、413応答のバッチは
+        縮小して再送する（最大MAX_BATCH_RETRIES回）。5xx応答はバッチが反映済みの可能性があるため
+        再送せず失敗とする（以降のバッチサイズは縮小する）。
+        batch_sizer未指定かつmax_in_flight > 1の場合は複数バッチを並行して送信する
+        （バッチサイズの自動調整は応答ごとの逐次判断のため、並行送信とは併用しない）。
+        on_batch_committedは成功したバッチごとに先頭から順に呼ばれ、
+        check_cancelledは各バッチの送信前に呼ばれる
+
+        Returns:
+            (rows_writtenの合計, 送信したバッチサイズのリスト)
+
+        Raises:
+            DatabaseTransactionError: いずれかのステートメントがエラーを返した場合
+            requests.HTTPError: HTTPエラー時
+        """
+        if batch_sizer is None and max_in_flight > 1:
+            return self._execute_batches_concurrently(
+                statements, batch_size, label, max_in_flight, on_batch_committed, check_cancelled
+            )
+
+        rows_written = 0
+        batch_sizes: List[int] = []
+        start_idx = 0
+        batch_idx = 0
+        retries = 0
+
+        while start_idx < len(statements):
+            if check_cancelled:
+                check_cancelled()
+            size = batch_sizer.next_batch_size() if batch_sizer else batch_size
+            end_idx = min(start_idx + size, len(statements))
+            batch = statements[start_idx:end_idx]
+
+            if batch_sizer:
+                progress = f"{batch_idx + 1}"
+            else:
+                progress = f"{batch_idx + 1}/{(len(statements) + batch_size - 1) // batch_size}"
+            logger.info(
+                f"Executing batch {progress}",
+                extra={"context": {"records": f"{start_idx + 1}-{end_idx}"}}
+            )
+
+            payload = self._encode_statements(batch)
+            started = time.monotonic()
+            response = self._post(payload, timeout=60)
+            latency = time.monotonic() - started
+            metrics.UPLOAD_BATCH_DURATION.observe(latency)
+
+            if (
+                batch_sizer
+                and batch_sizer.is_retryable_status(response.status_code)
+                and retries < self.MAX_BATCH_RETRIES
+            ):
+                batch_sizer.record_failure(len(batch), len(payload), response.status_code)
+                metrics.UPLOAD_BATCH_RETRIES.inc()
+                retries += 1
+                continue
+
+            if batch_sizer and batch_sizer.should_shrink(response.status_code):
+                batch_sizer.record_failure(len(batch), len(payload), response.status_code)
+            response.raise_for_status()
+            retries = 0
+
+            batch_rows = self._count_rows_written(response.json(), batch_idx, label)
+            rows_written += batch_rows
+            if on_batch_committed:
+                on_batch_committed(start_idx, end_idx, batch_rows)
+
+            if batch_sizer:
+                batch_sizer.record_success(len(batch), len(payload), latency)
+
+            batch_sizes.append(len(batch))
+            start_idx = end_idx
+            batch_idx += 1
+
+        return rows_written, batch_sizes
+
+    def _execute_batches_concurrently(
+        self,
+        statements: List[Union[str, Dict[str, Any]]],
+        batch_size: int,
+        label: str,
+        max_in_flight: int,
+        on_batch_committed: Optional[BatchCallback] = None,
+        check_cancelled: Optional[CancelCheck] = None
+    ) -> Tuple[int, List[int]]:
+        """
+        最大max_in_flight件のバッチを並行してPOSTし、rows_writtenの合計を返す
+
+        送信はバッチ順に行い、結果もバッチ順に確認するため、失敗時は逐次送信と同じく
+        最初に失敗したバッチ・ステートメントの番号でエラーを報告する。
+        失敗を検知した後は新しいバッチを送信しない（送信済みのバッチは完了を待つ）。
+        on_batch_committedも結果を確認した順（バッチ順）に呼ばれる
+
+        Returns:
+            (rows_writtenの合計, 送信したバッチサイズのリスト)
+
+        Raises:
+            DatabaseTransactionError: いずれかのステートメントがエラーを返した場合
+            requests.HTTPError: HTTPエラー時
+        """
+        batches = [statements[i:i + batch_size] for i in range(0, len(statements), batch_size)]
+        total_batches = len(batches)
+        rows_written = 0
+        pending: Dict[int, Future] = {}
+        next_batch = 0
+
+        logger.info(
+            "Executing batches concurrently",
+            extra={"context": {"batches": total_batches, "max_in_flight": max_in_flight}}
+        )
+
+        with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="turso-upload") as executor:
+            try:
+                for batch_idx in range(total_batches):
+                    # 未確認のバッチがmax_in_flight件になるまで後続のバッチを送信
+                    while next_batch < total_batches and next_batch - batch_idx < max_in_flight:
+                        if check_cancelled:
+                            check_cancelled()
+                        start_idx = next_batch * batch_size
+                        logger.info(
+                            f"Executing batch {next_batch + 1}/{total_batches}",
+                            extra={"context": {"records": f"{start_idx + 1}-{start_idx + len(batches[next_batch])}"}}
+                        )
+                        # 送信量は呼び出し元スレッドの計測ステージに加算するため、エンコードはここで行う
+                        payload = self._encode_statements(batches[next_batch])
+                        instrumentation.add_counters(bytes_sent=len(payload), http_requests=1)
+                        pending[next_batch] = executor.submit(self._post_batch, payload)
+                        next_batch += 1
+
+                    batch_result = pending.pop(batch_idx).result()
+                    batch_rows = self._count_rows_written(batch_result, batch_idx, label)
+                    rows_written += batch_rows
+                    if on_batch_committed:
+                        start_idx = batch_idx * batch_size
+                        on_batch_committed(start_idx, start_idx + len(batches[batch_idx]), batch_rows)
+            finally:
+                for future in pending.values():
+                    future.cancel()
+
+        return rows_written, [len(batch) for batch in batches]
+
+    def _post_batch(self, payload: bytes) -> Any:
+        """
+        エンコード済みの1バッチをPOSTしてレスポンスJSONを返す（ワーカースレッドで実行）
+
+        Raises:
+            requests.HTTPError: HTTPエラー時
+        """
+        metrics.UPLOAD_REQUESTS.inc()
+        metrics.UPLOAD_BYTES.inc(len(payload))
+        with metrics.UPLOAD_BATCH_DURATION.time():
+            response = self.session.post(self.http_url, data=payload, timeout=60)
+        response.raise_for_status()
+        return response.json()
+
+    def _post(self, payload: bytes, timeout: int, url: Optional[str] = None) -> requests.Response:
+        """エンコード済みのリクエストボディをPOST（送信バイト数とリクエスト数を計測ステージに加算）"""
+        instrumentation.add_counters(bytes_sent=len(payload), http_requests=1)
+        metrics.UPLOAD_REQUESTS.inc()
+        metrics.UPLOAD_BYTES.inc(len(payload))
+        return self.session.post(url or self.http_url, data=payload, timeout=timeout)
+
+    def _count_rows_written(self, batch_result: Any, batch_idx: int, label: str) -> int:
+        """
+        バッチのレスポンスからrows_writtenを集計
+
+        Raises:
+            DatabaseTransactionError: いずれかのステートメントがエラーを返した場合
+        """
+        rows_written = 0
+        if isinstance(batch_result, list):
+            for idx, statement_result in enumerate(batch_result):
+                if statement_result and "results" in statement_result and "rows_written" in statement_result["results"]:
+                    rows_written += statement_result["results"]["rows_written"]
+                elif statement_result and "error" in statement_result:
+                    logger.error(f"{label} failed in batch {batch_idx + 1}, statement {idx + 1}: {statement_result['error']}")
+                    raise DatabaseTransactionError(f"{label} failed: {statement_result['error']}")
+        return rows_written
+
+    def _encode_statements(self, statements: List[Union[str, Dict[str, Any]]]) -> bytes:
+        """
+        {"statements": [...]} リクエストボディをUTF-8 JSONにエンコード
+
+        日本語を\\uXXXXにエスケープしないことでペイロードを縮小する
+        """
+        return json.dumps(
+            {"statements": statements},
+            ensure_ascii=False,
+            allow_nan=False
+        ).encode("utf-8")
+
+    def swap_table(self, table_name: str, staging_table: str) -> int:
+        """
+        ステージングテーブルを本番テーブルと入れ替え
+
+        RENAMEとDROPをBEGIN/COMMITで囲み、単一リクエスト内でアトミックに実行する
+
+        Args:
+            table_name: 本番テーブル名
+            staging_table: ロード済みのステージングテーブル名
+
+        Returns:
+            入れ替え前の本番テーブルの行数（存在しなかった場合は0）
+
+        Raises:
+            DatabaseTransactionError: 入れ替え失敗時
+        """
+        old_table = f"{table_name}__old"
+
+        exists = self.query_rows(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+            [table_name]
+        )
+        replaced_rows = self.query_rows(f"SELECT COUNT(*) FROM {table_name}")[0][0] if exists else 0
+
+        statements = ["BEGIN", f"DROP TABLE IF EXISTS {old_table}"]
+        if exists:
+            statements.append(f"ALTER TABLE {table_name} RENAME TO {old_table}")
+        statements.extend([
+            f"ALTER TABLE {staging_table} RENAME TO {table_name}",
+            f"DROP TABLE IF EXISTS {old_table}",
+            "COMMIT"
+        ])
+
+        logger.info(
+            "Swapping staging table",
+            extra={"context": {"table": table_name, "staging_table": staging_table, "replaced_rows": replaced_rows}}
+        )
+        self.execute_statements(statements, batch_size=len(statements))
+
+        return replaced_rows
+
+    def query_rows(self, query: str, params: Optional[List[Any]] = None) -> List[List[Any]]:
+        """
+        SELECT等のクエリを実行して結果行を返す
+
+        Args:
+            query: SQL文
+            params: 位置パラメータ
+
+        Returns:
+            結果行のリスト（各行はカラム値のリスト）
+
+        Raises:
+            DatabaseTransactionError: クエリ失敗時
+        """
+        response = self.execute_query(query, params)
+
+        result = response[0] if isinstance(response, list) and response else {}
+        if result and "error" in result:
+            logger.error(f"Query failed: {result['error']}")
+            raise DatabaseTransactionError(f"Query failed: {result['error']}")
+
+        return result.get("results", {}).get("rows", []) if result else []
+
     def execute_query(self, query: str, params: Optional[List[Any]] = None) -> Any:
         """
         単一クエリを実行
 
         Args:
             query: SQL文
-            params: パラメータ（現在未使用）
+            params: 位置パラメータ（指定時は{"q": SQL, "params": [...]}形式で送信）
 
         Returns:
             クエリ結果のJSONレスポンス
         """
+        statement = {"q": query, "params": params} if params is not None else query
+
         try:
-            response = requests.post(
-                self.http_url,
-                headers={
-                    "Authorization": f"Bearer {self.auth_token}",
-                    "Content-Type": "application/json"
-                },
-                json={"statements": [query]},
-                timeout=30
-            )
+            response = self._post(self._encode_statements([statement]), timeout=30)
             response.raise_for_status()
             return response.json()
         except Exception as e:
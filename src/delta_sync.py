@@ -0,0 +1,249 @@
+"""DeltaSynchronizerモジュール - 行単位の差分同期"""
+
+import hashlib
+from typing import Any, Dict, List, Union
+
+import pandas as pd
+
+from storage_backend import StorageBackend
+from statement_builder import StatementBuilder
+from memory_optimizer import widen_dtypes
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+# 行ハッシュを保存するサイドテーブル
+ROW_HASH_TABLE = "_sync_row_hashes"
+
+# DELETE ... WHERE ID IN (...) 1文あたりのID数
+DELETE_CHUNK_SIZE = 500
+
+
+class DeltaSyncError(Exception):
+    """差分同期エラー"""
+    pass
+
+
+class DeltaSynchronizer:
+    """
+    ID主キーをもとに追加・変更・削除された行のみを同期するサービス
+
+    変換後のDataFrameから行ごとのハッシュを計算し、サイドテーブルに保存された
+    前回のハッシュと比較して必要なINSERT/UPDATE/DELETE文のみを発行する
+    """
+
+    def __init__(
+        self,
+        db_client: StorageBackend,
+        statement_builder: StatementBuilder = None,
+        batch_size: int = 50
+    ):
+        self.db_client = db_client
+        self.statement_builder = statement_builder or StatementBuilder()
+        self.batch_size = batch_size
+
+    def sync(self, table_name: str, df: pd.DataFrame, table_recreated: bool = False) -> Dict[str, int]:
+        """
+        差分を計算して対象テーブルに反映
+
+        Args:
+            table_name: テーブル名
+            df: 変換後のDataFrame（ID列が必須）
+            table_recreated: テーブルが新規作成・再作成された場合True（保存済みハッシュを破棄）
+                Falseで保存済みハッシュがない場合（full戦略からの切り替え直後等）は、既存の行を
+                ハッシュ不明として扱い、シートにない行は削除・残る行は更新する
+
+        Returns:
+            {"deleted": N, "updated": M, "inserted": K}
+
+        Raises:
+            DeltaSyncError: ID列が存在しない・重複している場合
+            DatabaseTransactionError: DB操作失敗時
+        """
+        if 'ID' not in df.columns:
+            raise DeltaSyncError(f"Delta sync requires an ID column: {table_name}")
+        if df['ID'].isna().any() or df['ID'].duplicated().any():
+            raise DeltaSyncError(f"Delta sync requires unique non-null IDs: {table_name}")
+
+        self._ensure_hash_table()
+
+        statements: List[Union[str, Dict[str, Any]]] = []
+        if table_recreated:
+            stored_hashes: Dict[Any, str] = {}
+            statements.append({"q": f"DELETE FROM {ROW_HASH_TABLE} WHERE table_name = ?", "params": [table_name]})
+        else:
+            stored_hashes = self._load_hashes(table_name) or self._load_live_ids(table_name)
+
+        ids = [row[0] for row in self.statement_builder.to_param_rows(df[['ID']])]
+        current_hashes = dict(zip(ids, self.compute_row_hashes(df)))
+
+        added = [row_id for row_id in ids if row_id not in stored_hashes]
+        changed = [
+            row_id for row_id in ids
+            if row_id in stored_hashes and stored_hashes[row_id] != current_hashes[row_id]
+        ]
+        removed = [row_id for row_id in stored_hashes if row_id not in current_hashes]
+
+        logger.info(
+            f"Delta computed for {table_name}",
+            extra={
+                "context": {
+                    "added": len(added),
+                    "changed": len(changed),
+                    "removed": len(removed),
+                    "unchanged": len(ids) - len(added) - len(changed)
+                }
+            }
+        )
+
+        positions = {row_id: pos for pos, row_id in enumerate(ids)}
+
+        # データ変更 → ハッシュ更新の順に実行（途中失敗時は次回同じ差分が再適用される）
+        statements.extend(self._build_delete_statements(table_name, removed))
+        statements.extend(self._build_update_statements(table_name, df, [positions[i] for i in changed]))
+        statements.extend(self._build_insert_statements(table_name, df, [positions[i] for i in added]))
+        statements.extend(self._build_hash_deletes(table_name, removed))
+        statements.extend(self._build_hash_upserts(table_name, added + changed, current_hashes))
+
+        if statements:
+            self.db_client.execute_statements(statements, batch_size=self.batch_size)
+
+        return {
+            "deleted": len(removed),
+            "updated": len(changed),
+            "inserted": len(added)
+        }
+
+    def compute_row_hashes(self, df: pd.DataFrame) -> List[str]:
+        """
+        行ごとのハッシュ文字列を計算
+
+        カラム名とdtypeのシグネチャを先頭に付与し、スキーマ変更時は全行が変更扱いになる。
+        MemoryOptimizerで縮小したdtypeは元の幅に戻してから計算するため、値の範囲による
+        dtypeの違いでは変更扱いにならない
+
+        Args:
+            df: 変換後のDataFrame
+
+        Returns:
+            行順のハッシュ文字列リスト
+        """
+        df = widen_dtypes(df)
+        signature_source = "|".join(f"{col}:{dtype}" for col, dtype in df.dtypes.items())
+        signature = hashlib.sha1(signature_source.encode("utf-8")).hexdigest()[:8]
+
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        return [f"{signature}{value:016x}" for value in row_hashes.tolist()]
+
+    def _ensure_hash_table(self) -> None:
+        """行ハッシュ保存用のサイドテーブルを作成（存在しない場合のみ）"""
+        self.db_client.execute_query(
+            f"CREATE TABLE IF NOT EXISTS {ROW_HASH_TABLE} ("
+            "table_name TEXT NOT NULL, "
+            "row_id INTEGER NOT NULL, "
+            "row_hash TEXT NOT NULL, "
+            "PRIMARY KEY (table_name, row_id))"
+        )
+
+    def _load_hashes(self, table_name: str) -> Dict[Any, str]:
+        """保存済みの行ハッシュを取得"""
+        rows = self.db_client.query_rows(
+            f"SELECT row_id, row_hash FROM {ROW_HASH_TABLE} WHERE table_name = ?",
+            [table_name]
+        )
+        return {row[0]: row[1] for row in rows}
+
+    def _load_live_ids(self, table_name: str) -> Dict[Any, str]:
+        """既存テーブルのIDを空のハッシュ（常に変更扱い）で取得"""
+        rows = self.db_client.query_rows(f"SELECT `ID` FROM {table_name}")
+        return {row[0]: "" for row in rows}
+
+    def _build_delete_statements(self, table_name: str, row_ids: List[Any]) -> List[Dict[str, Any]]:
+        """削除行のDELETE ... WHERE ID IN (...) 文をチャンク単位で構築"""
+        statements = []
+        for start in range(0, len(row_ids), DELETE_CHUNK_SIZE):
+            chunk = row_ids[start:start + DELETE_CHUNK_SIZE]
+            placeholders = ', '.join(['?'] * len(chunk))
+            statements.append({
+                "q": f"DELETE FROM {table_name} WHERE `ID` IN ({placeholders})",
+                "params": list(chunk)
+            })
+        return statements
+
+    def _build_hash_deletes(self, table_name: str, row_ids: List[Any]) -> List[Dict[str, Any]]:
+        """削除行の保存済みハッシュを削除する文をチャンク単位で構築"""
+        statements = []
+        for start in range(0, len(row_ids), DELETE_CHUNK_SIZE):
+            chunk = row_ids[start:start + DELETE_CHUNK_SIZE]
+            placeholders = ', '.join(['?'] * len(chunk))
+            statements.append({
+                "q": f"DELETE FROM {ROW_HASH_TABLE} WHERE table_name = ? AND row_id IN ({placeholders})",
+                "params": [table_name] + list(chunk)
+            })
+        return statements
+
+    def _build_update_statements(
+        self,
+        table_name: str,
+        df: pd.DataFrame,
+        positions: List[int]
+    ) -> List[Dict[str, Any]]:
+        """変更行のUPDATE文を構築（SQLはテーブルごとに1回だけ構築）"""
+        if not positions:
+            return []
+
+        columns = [col for col in df.columns if col != 'ID']
+        if not columns:
+            return []
+
+        assignments = ', '.join(f'`{col}` = ?' for col in columns)
+        query = f"UPDATE {table_name} SET {assignments} WHERE `ID` = ?"
+
+        rows = self.statement_builder.to_param_rows(df.iloc[positions][columns + ['ID']])
+        return [{"q": query, "params": row} for row in rows]
+
+    def _build_insert_statements(
+        self,
+        table_name: str,
+        df: pd.DataFrame,
+        positions: List[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        追加行のINSERT文を構築
+
+        前回の同期がハッシュ保存前に失敗していても再適用できるようINSERT OR REPLACEを使用
+        """
+        if not positions:
+            return []
+
+        columns = list(df.columns)
+        placeholders = ', '.join(['?'] * len(columns))
+        query = (
+            f"INSERT OR REPLACE INTO {table_name} "
+            f"({self.statement_builder.quote_columns(columns)}) VALUES ({placeholders})"
+        )
+
+        rows = self.statement_builder.to_param_rows(df.iloc[positions])
+        return [{"q": query, "params": row} for row in rows]
+
+    def _build_hash_upserts(
+        self,
+        table_name: str,
+        row_ids: List[Any],
+        hashes: Dict[Any, str]
+    ) -> List[Dict[str, Any]]:
+        """行ハッシュを複数行INSERT OR REPLACEで保存"""
+        if not row_ids:
+            return []
+
+        rows_per_statement = self.statement_builder.compute_rows_per_statement(3)
+        statements = []
+        for start in range(0, len(row_ids), rows_per_statement):
+            chunk = row_ids[start:start + rows_per_statement]
+            values = ', '.join(['(?, ?, ?)'] * len(chunk))
+            params = [value for row_id in chunk for value in (table_name, row_id, hashes[row_id])]
+            statements.append({
+                "q": f"INSERT OR REPLACE INTO {ROW_HASH_TABLE} (table_name, row_id, row_hash) VALUES {values}",
+                "params": params
+            })
+        return statements
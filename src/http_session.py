@@ -0,0 +1,58 @@
+"""HTTPセッションモジュール - コネクションプール付きrequests.Sessionの生成"""
+
+from typing import Collection, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session(
+    pool_size: int = 10,
+    max_retries: int = 3,
+    backoff_factor: float = 0.5,
+    status_forcelist: Collection[int] = (),
+    allowed_methods: Optional[Collection[str]] = None,
+    headers: Optional[dict] = None
+) -> requests.Session:
+    """
+    Keep-Alive・コネクションプール・リトライアダプター付きのセッションを生成
+
+    読み取りタイムアウトのリトライは呼び出し側の責務とし、アダプターでは
+    接続エラーと（指定時は）ステータスコードによるリトライのみ行う
+
+    Args:
+        pool_size: ホストあたりのプール接続数
+        max_retries: 接続エラー・ステータスコードによる最大リトライ回数
+        backoff_factor: リトライ間隔の指数バックオフ係数
+        status_forcelist: リトライ対象のHTTPステータスコード
+        allowed_methods: ステータスコードでリトライするHTTPメソッド（Noneは冪等メソッドのみ）
+        headers: セッション共通のHTTPヘッダー
+
+    Returns:
+        設定済みのrequests.Session
+    """
+    retry_kwargs = {}
+    if allowed_methods is not None:
+        retry_kwargs["allowed_methods"] = frozenset(allowed_methods)
+
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=0,
+        status=max_retries if status_forcelist else 0,
+        status_forcelist=status_forcelist,
+        backoff_factor=backoff_factor,
+        # 最終レスポンスをそのまま返し、raise_for_statusで通常のHTTPErrorとして扱う
+        raise_on_status=False,
+        **retry_kwargs
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+
+    return session
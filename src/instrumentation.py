@@ -0,0 +1,119 @@
+"""Instrumentationモジュール - 同期ステージごとの処理時間・CPU時間・メモリ計測"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# スレッドごとの有効なレコーダーと実行中ステージのスタック
+_local = threading.local()
+
+
+def _peak_rss_bytes() -> int:
+    """プロセスの最大常駐メモリ（バイト）"""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linuxはキロバイト、macOSはバイト単位
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageRecorder:
+    """
+    ステージ名ごとに処理時間・CPU時間・最大RSSの増分とカウンターを集計するレコーダー
+
+    - wall_seconds: 経過時間
+    - cpu_seconds: 実行スレッドのCPU時間
+    - peak_rss_delta_bytes: ステージ中に増えたプロセスの最大常駐メモリ
+    - calls: ステージの実行回数
+    - その他: add_countersで加算した値（bytes_sent, http_requests等）
+
+    同じステージを複数回（チャンクごと等）実行した場合は合計する。
+    ストリーミング時は複数スレッドのステージが重なるため、合計が全体の経過時間を超えることがある
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, float]] = {}
+
+    def add(self, name: str, **values: float) -> None:
+        """ステージの集計値に加算"""
+        with self._lock:
+            stats = self._stages.setdefault(name, {})
+            for key, value in values.items():
+                stats[key] = stats.get(key, 0) + value
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """JSONシリアライズ可能な集計結果"""
+        with self._lock:
+            return {
+                name: {key: round(value, 6) if isinstance(value, float) else value for key, value in stats.items()}
+                for name, stats in self._stages.items()
+            }
+
+
+def _stage_stack() -> List[Tuple[StageRecorder, str]]:
+    if not hasattr(_local, "stages"):
+        _local.stages = []
+    return _local.stages
+
+
+def current_recorder() -> Optional[StageRecorder]:
+    """現在のスレッドで有効なレコーダー（なければNone）"""
+    return getattr(_local, "recorder", None)
+
+
+@contextmanager
+def activate(recorder: Optional[StageRecorder]) -> Iterator[Optional[StageRecorder]]:
+    """現在のスレッドでrecorderを有効化（ワーカースレッドへの引き継ぎにも使用）"""
+    previous = current_recorder()
+    _local.recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _local.recorder = previous
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    現在のスレッドのレコーダーにステージとして計測（レコーダーが無効なら何もしない）
+
+    Args:
+        name: ステージ名（fetch/parse/validate/transform/optimize/schema/upload）
+    """
+    recorder = current_recorder()
+    if recorder is None:
+        yield
+        return
+
+    stack = _stage_stack()
+    stack.append((recorder, name))
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    rss_start = _peak_rss_bytes()
+    try:
+        yield
+    finally:
+        stack.pop()
+        recorder.add(
+            name,
+            calls=1,
+            wall_seconds=time.perf_counter() - wall_start,
+            cpu_seconds=time.thread_time() - cpu_start,
+            peak_rss_delta_bytes=max(0, _peak_rss_bytes() - rss_start)
+        )
+
+
+def add_counters(**values: float) -> None:
+    """現在のスレッドで実行中のステージにカウンターを加算（ステージ外では何もしない）"""
+    stack = _stage_stack()
+    if stack:
+        recorder, name = stack[-1]
+        recorder.add(name, **values)
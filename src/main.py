@@ -1,86 +1,322 @@
-"""メインエントリーポイント"""
+"""メインエントリーポイント
 
+起動を速くするため、pandas等の重い依存を読み込むモジュール（CSVFetcher、SyncOrchestrator等）は
+同期を実行する時点で初めてimportする。--help / --dry-run / --health-check ではpandasを読み込まない
+"""
+
+import argparse
 import os
+import signal
 import sys
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from constants import SONGS_GID, CARDS_GID, BROOCHES_GID, SPREADSHEET_ID
-from csv_fetcher import CSVFetcher
-from db_client import DatabaseClient
-from validators import DataValidator
-from transformers import DataTransformer
-from orchestrator import SyncOrchestrator
-from schema_manager import SchemaManager
+from constants import (
+    SONGS_GID,
+    CARDS_GID,
+    BROOCHES_GID,
+    SPREADSHEET_ID,
+    DEFAULT_CHUNK_ROWS,
+    INSERT_MODES,
+    SYNC_STRATEGIES,
+    STORAGE_BACKENDS,
+    TRANSACTION_MODES,
+)
+import metrics
 from logger import get_logger
 
+if TYPE_CHECKING:
+    from csv_fetcher import CSVFetcher
+    from orchestrator import SyncOrchestrator, SyncResult
+    from scheduler import SyncScheduler
+    from storage_backend import StorageBackend
+
 logger = get_logger(__name__)
 
+# デーモンモードでSYNC_STATE_DIRが未設定の場合の取得状態の保存先
+DEFAULT_DAEMON_STATE_DIR = ".sync_state"
 
-def main():
-    """メイン処理"""
+# シート設定
+SHEET_CONFIGS = {
+    "songs": SONGS_GID,
+    "cards": CARDS_GID,
+    "brooches": BROOCHES_GID
+}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="Google Spreadsheet → Turso 同期")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--daemon",
+        action="store_true",
+        help="常駐して一定間隔で同期する（SYNC_INTERVAL_SECONDS等で設定）"
+    )
+    mode.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="環境変数の設定を検証して同期内容を表示し、通信は行わない"
+    )
+    mode.add_argument(
+        "--health-check",
+        action="store_true",
+        help="同期先データベースへの接続のみ確認する（成功時は終了コード0）"
+    )
+    return parser.parse_args(argv)
+
+
+def load_settings(daemon: bool = False) -> Dict[str, Any]:
+    """
+    環境変数から同期設定を読み込んで検証
+
+    Raises:
+        ValueError: 必須の環境変数がない、または値が不正な場合
+    """
+    storage_backend = os.getenv("STORAGE_BACKEND", "turso")
+    if storage_backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Invalid STORAGE_BACKEND: {storage_backend}")
+    if storage_backend == "turso" and (not os.getenv("TURSO_DATABASE_URL") or not os.getenv("TURSO_AUTH_TOKEN")):
+        raise ValueError("Missing required environment variables: TURSO_DATABASE_URL, TURSO_AUTH_TOKEN")
+
+    state_dir = os.getenv("SYNC_STATE_DIR")
+    # デーモンモードでは変更のないシートを検知して間隔を延ばすため、取得状態を常に保存する
+    if daemon and not state_dir:
+        state_dir = DEFAULT_DAEMON_STATE_DIR
+
+    settings = {
+        "storage_backend": storage_backend,
+        "insert_mode": os.getenv("SYNC_INSERT_MODE", "literal"),
+        "sync_strategy": os.getenv("SYNC_STRATEGY", "full"),
+        "transaction_mode": os.getenv("SYNC_TRANSACTION_MODE", "batched"),
+        "max_workers": int(os.getenv("SYNC_MAX_WORKERS", "1")),
+        "max_in_flight": int(os.getenv("SYNC_MAX_IN_FLIGHT", "1")),
+        "adaptive_batching": os.getenv("SYNC_ADAPTIVE_BATCHING", "false").lower() == "true",
+        "streaming": os.getenv("SYNC_STREAMING", "false").lower() == "true",
+        "chunk_rows": int(os.getenv("SYNC_CHUNK_ROWS", str(DEFAULT_CHUNK_ROWS))),
+        "optimize_memory": os.getenv("SYNC_OPTIMIZE_MEMORY", "false").lower() == "true",
+        "state_dir": state_dir,
+    }
+
+    if settings["insert_mode"] not in INSERT_MODES:
+        raise ValueError(f"Invalid SYNC_INSERT_MODE: {settings['insert_mode']}")
+    if settings["sync_strategy"] not in SYNC_STRATEGIES:
+        raise ValueError(f"Invalid SYNC_STRATEGY: {settings['sync_strategy']}")
+    if settings["transaction_mode"] not in TRANSACTION_MODES:
+        raise ValueError(f"Invalid SYNC_TRANSACTION_MODE: {settings['transaction_mode']}")
+    if settings["streaming"] and settings["sync_strategy"] != "full":
+        raise ValueError(f"SYNC_STREAMING requires SYNC_STRATEGY=full: {settings['sync_strategy']}")
+
+    return settings
+
+
+def build_orchestrator(
+    csv_fetcher: "CSVFetcher",
+    db_client: "StorageBackend",
+    settings: Dict[str, Any]
+) -> "SyncOrchestrator":
+    """同期設定からSyncOrchestratorを構築"""
+    from validators import DataValidator
+    from transformers import DataTransformer
+    from orchestrator import SyncOrchestrator
+
+    return SyncOrchestrator(
+        csv_fetcher=csv_fetcher,
+        db_client=db_client,
+        validator=DataValidator(),
+        transformer=DataTransformer(),
+        insert_mode=settings["insert_mode"],
+        max_workers=settings["max_workers"],
+        sync_strategy=settings["sync_strategy"],
+        adaptive_batching=settings["adaptive_batching"],
+        streaming=settings["streaming"],
+        chunk_rows=settings["chunk_rows"],
+        optimize_memory=settings["optimize_memory"],
+        # 取得状態の保存先がある場合はアップロードの進捗も保存し、失敗した同期を途中から再開する
+        checkpoint_dir=os.path.join(settings["state_dir"], "checkpoints") if settings["state_dir"] else None
+    )
+
+
+def log_results(results: List["SyncResult"]) -> bool:
+    """同期結果のサマリーをログ出力し、全テーブル成功ならTrueを返す"""
+    success_count = sum(1 for r in results if r.success)
+    logger.info(
+        f"Sync completed: {success_count}/{len(results)} tables synced successfully"
+    )
+
+    for result in results:
+        if result.not_modified:
+            logger.info(f"{result.table_name}: not modified, skipped")
+        elif result.success:
+            logger.info(
+                f"{result.table_name}: deleted={result.deleted_count}, "
+                f"inserted={result.inserted_count}, updated={result.updated_count}, "
+                f"skipped={result.skipped_count}"
+            )
+        else:
+            logger.error(f"{result.table_name}: FAILED - {result.error_message}")
+
+    return success_count == len(results)
+
+
+def write_metrics_textfile(path: Optional[str]) -> None:
+    """メトリクスのテキストファイルを書き出し（未設定時は何もしない）"""
+    if not path:
+        return
     try:
-        logger.info("Starting sync process")
+        metrics.REGISTRY.write_textfile(path)
+    except OSError as e:
+        logger.error(f"Failed to write metrics textfile: {e}")
 
-        # 環境変数読み込み
-        turso_url = os.getenv("TURSO_DATABASE_URL")
-        turso_token = os.getenv("TURSO_AUTH_TOKEN")
 
-        if not all([turso_url, turso_token]):
-            logger.error("Missing required environment variables")
-            return 1
+def create_scheduler(
+    orchestrator: "SyncOrchestrator",
+    sheet_configs: Dict[str, int],
+    metrics_textfile: Optional[str] = None
+) -> "SyncScheduler":
+    """環境変数の設定からデーモンモードのスケジューラーを構築"""
+    from scheduler import SyncScheduler
 
-        # コンポーネント初期化
-        csv_fetcher = CSVFetcher()
-        db_client = DatabaseClient()
-        db_client.connect()
+    interval = float(os.getenv("SYNC_INTERVAL_SECONDS", "300"))
+
+    def sync() -> List["SyncResult"]:
+        try:
+            results = orchestrator.sync_all_tables(SPREADSHEET_ID, sheet_configs)
+            log_results(results)
+            return results
+        finally:
+            # 毎回の同期後にテキストファイルを更新
+            write_metrics_textfile(metrics_textfile)
 
-        validator = DataValidator()
-        transformer = DataTransformer()
+    return SyncScheduler(
+        sync,
+        interval=interval,
+        jitter=float(os.getenv("SYNC_INTERVAL_JITTER", "0.1")),
+        max_interval=max(interval, float(os.getenv("SYNC_MAX_INTERVAL_SECONDS", "3600")))
+    )
 
-        # SchemaManagerでテーブル初期化
-        schema_manager = SchemaManager(db_client)
 
-        # サンプルDataFrameでスキーマ初期化（実際は最初のCSV取得後に実行）
-        logger.info("Initializing schemas")
+def dry_run() -> int:
+    """設定を検証し、同期対象と設定をログ出力（通信・pandasの読み込みは行わない）"""
+    try:
+        settings = load_settings()
+    except ValueError as e:
+        logger.error(f"Invalid configuration: {e}")
+        return 1
 
-        # シート設定
-        sheet_configs = {
-            "songs": SONGS_GID,
-            "cards": CARDS_GID,
-            "brooches": BROOCHES_GID
+    logger.info(
+        "Dry run: configuration is valid",
+        extra={
+            "context": {
+                "spreadsheet_id": SPREADSHEET_ID,
+                "sheets": SHEET_CONFIGS,
+                "settings": settings
+            }
         }
+    )
+    return 0
 
-        # SyncOrchestrator初期化と実行
-        orchestrator = SyncOrchestrator(
-            csv_fetcher=csv_fetcher,
-            db_client=db_client,
-            validator=validator,
-            transformer=transformer
-        )
 
-        # 同期実行
-        results = orchestrator.sync_all_tables(SPREADSHEET_ID, sheet_configs)
+def health_check() -> int:
+    """同期先データベース（STORAGE_BACKEND）への接続を確認（pandasは読み込まない）"""
+    from storage_backend import create_storage_backend
+
+    db_client = None
+    try:
+        db_client = create_storage_backend()
+        db_client.connect()
+        return 0
+    except Exception as e:
+        logger.error(f"Health check failed: {e}")
+        return 1
+    finally:
+        if db_client is not None:
+            db_client.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """メイン処理"""
+    args = parse_args(argv)
+
+    if args.dry_run:
+        return dry_run()
+    if args.health_check:
+        return health_check()
+
+    csv_fetcher = None
+    db_client = None
+    metrics_server = None
+    metrics_textfile = os.getenv("METRICS_TEXTFILE")
+
+    try:
+        logger.info("Starting sync process", extra={"context": {"daemon": args.daemon}})
 
-        # 結果サマリー
-        success_count = sum(1 for r in results if r.success)
-        logger.info(
-            f"Sync completed: {success_count}/{len(results)} tables synced successfully"
+        # メトリクスをHTTPで公開（Prometheusからのスクレイプ用）
+        metrics_port = os.getenv("METRICS_PORT")
+        if metrics_port:
+            metrics_server = metrics.REGISTRY.serve(
+                int(metrics_port), host=os.getenv("METRICS_HOST", "127.0.0.1")
+            )
+
+        try:
+            settings = load_settings(daemon=args.daemon)
+        except ValueError as e:
+            logger.error(f"Invalid configuration: {e}")
+            return 1
+        if args.daemon and not os.getenv("SYNC_STATE_DIR"):
+            logger.info(f"SYNC_STATE_DIR not set, using {settings['state_dir']} for daemon mode")
+
+        # 重い依存（pandas等）はここで初めて読み込む
+        from csv_fetcher import CSVFetcher
+        from storage_backend import create_storage_backend, target_key
+
+        # コンポーネント初期化（デーモンモードではプール済みの接続ごと使い回す）
+        db_client = create_storage_backend(
+            settings["storage_backend"],
+            max_in_flight=settings["max_in_flight"],
+            transaction_mode=settings["transaction_mode"]
         )
+        # 取得状態は同期先ごとに保存する（同期先を切り替えた直後に「変更なし」でスキップしない）
+        csv_fetcher = CSVFetcher(state_dir=settings["state_dir"], state_key=target_key(db_client.target))
+        db_client.connect()
+
+        orchestrator = build_orchestrator(csv_fetcher, db_client, settings)
+
+        if args.daemon:
+            stop_event = threading.Event()
 
-        for result in results:
-            if result.success:
-                logger.info(
-                    f"{result.table_name}: deleted={result.deleted_count}, "
-                    f"inserted={result.inserted_count}, skipped={result.skipped_count}"
-                )
-            else:
-                logger.error(f"{result.table_name}: FAILED - {result.error_message}")
+            def request_stop(signum, frame):
+                logger.info(f"Received signal {signum}, stopping after the current sync")
+                stop_event.set()
 
-        return 0 if success_count == len(results) else 1
+            signal.signal(signal.SIGTERM, request_stop)
+            signal.signal(signal.SIGINT, request_stop)
+
+            create_scheduler(orchestrator, SHEET_CONFIGS, metrics_textfile).run_forever(stop_event)
+            return 0
+
+        # 同期実行
+        results = orchestrator.sync_all_tables(SPREADSHEET_ID, SHEET_CONFIGS)
+
+        return 0 if log_results(results) else 1
 
     except Exception as e:
         logger.error(f"Fatal error: {e}")
         return 1
 
+    finally:
+        # プール済みのHTTP接続を解放
+        if csv_fetcher is not None:
+            csv_fetcher.close()
+        if db_client is not None:
+            db_client.close()
+
+        # 失敗時も含めて実行結果のメトリクスを書き出す
+        write_metrics_textfile(metrics_textfile)
+        if metrics_server is not None:
+            metrics_server.shutdown()
+            metrics_server.server_close()
+
 
 if __name__ == "__main__":
     sys.exit(main())
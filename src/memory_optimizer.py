@@ -0,0 +1,121 @@
+"""MemoryOptimizerモジュール - DataFrameのdtype縮小とカテゴリ化"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class MemoryOptimizer:
+    """
+    変換後のDataFrameのメモリ使用量を削減するサービス
+
+    - 整数カラム（int64/Int64）は値が収まる最小の符号付き整数型に縮小
+    - float64カラムはfloat32で値が完全に表現できる場合のみfloat32に縮小
+    - 重複の多い文字列カラム（rarity、分類、アーティスト名等）はcategoryに変換
+
+    縮小したdtypeはwiden_dtypesで元の幅に戻せるため、INSERT文やハッシュの結果は変わらない
+    """
+
+    def __init__(self, max_category_ratio: float = 0.5, min_category_rows: int = 50):
+        """
+        Args:
+            max_category_ratio: category化する文字列カラムのユニーク値数/行数の上限
+            min_category_rows: category化を検討する最小行数（少ない行ではカテゴリ表の方が大きい）
+        """
+        self.max_category_ratio = max_category_ratio
+        self.min_category_rows = min_category_rows
+
+    def optimize(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+        """
+        各カラムを縮小したdtypeに置き換え（dfを直接書き換える）
+
+        Args:
+            df: 変換後のDataFrame
+
+        Returns:
+            (df, 削減したバイト数)
+        """
+        bytes_saved = 0
+        converted: Dict[str, str] = {}
+
+        for column in df.columns:
+            series = df[column]
+            optimized = self._optimize_series(series)
+            if optimized is None:
+                continue
+
+            before = series.memory_usage(index=False, deep=True)
+            after = optimized.memory_usage(index=False, deep=True)
+            if after >= before:
+                continue
+
+            df[column] = optimized
+            bytes_saved += int(before - after)
+            converted[column] = f"{series.dtype}->{optimized.dtype}"
+
+        logger.info(
+            "Optimized DataFrame memory",
+            extra={"context": {"bytes_saved": bytes_saved, "converted_columns": converted}}
+        )
+
+        return df, bytes_saved
+
+    def _optimize_series(self, series: pd.Series):
+        """縮小後のSeries（縮小できない場合はNone）"""
+        dtype = series.dtype
+
+        if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+            return None
+
+        if pd.api.types.is_integer_dtype(dtype):
+            downcast = pd.to_numeric(series, downcast='integer')
+            return downcast if downcast.dtype != dtype else None
+
+        if dtype == np.float64:
+            values = series.to_numpy()
+            narrowed = values.astype(np.float32)
+            # 丸め誤差が出る場合は縮小しない
+            with np.errstate(over='ignore'):
+                exact = np.array_equal(narrowed.astype(np.float64), values, equal_nan=True)
+            return series.astype(np.float32) if exact else None
+
+        if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            if len(series) < self.min_category_rows:
+                return None
+            if series.nunique(dropna=True) > len(series) * self.max_category_ratio:
+                return None
+            categorical = series.astype('category')
+            # カテゴリ値のdtypeが元と異なる場合（object→str等）はwiden_dtypesで戻せないため変換しない
+            if categorical.cat.categories.dtype != dtype:
+                return None
+            return categorical
+
+        return None
+
+
+def widen_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    MemoryOptimizerで縮小したdtypeを64bit整数・float64・元の文字列型に戻す
+
+    縮小したカラムがない場合はdfをそのまま返す
+    """
+    widened: Dict[str, object] = {}
+    for column, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            widened[column] = dtype.categories.dtype
+        elif isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            if pd.api.types.is_integer_dtype(dtype) and dtype != pd.Int64Dtype():
+                widened[column] = 'Int64'
+        elif dtype.kind == 'i' and dtype.itemsize < 8:
+            widened[column] = np.int64
+        elif dtype == np.float32:
+            widened[column] = np.float64
+
+    if not widened:
+        return df
+    return df.astype(widened)
@@ -0,0 +1,347 @@
+"""Metricsモジュール - 同期処理のカウンター・ヒストグラムとOpenMetrics出力"""
+
+import abc
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Sequence, Tuple
+
+from logger import get_logger
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+logger = get_logger(__name__)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# 秒単位のレイテンシ用バケット（+Infは自動で追加）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_bucket_bound(bound: float) -> str:
+    """バケット上限のle値（OpenMetricsの正規表現に合わせ、整数値も"1.0"のように出力）"""
+    if math.isinf(bound):
+        return "+Inf"
+    return repr(float(bound))
+
+
+class _Metric(abc.ABC):
+    """ラベル付きメトリクスの共通処理"""
+
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def collect(self) -> List[str]:
+        """OpenMetricsテキスト形式の行リスト"""
+        lines = [
+            f"# TYPE {self.name} {self.metric_type}",
+            f"# HELP {self.name} {self.documentation}",
+        ]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    @abc.abstractmethod
+    def _samples(self) -> List[str]:
+        """サンプル行のリスト（ロック取得済みで呼ばれる）"""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """記録済みの値をすべて破棄"""
+
+
+class Counter(_Metric):
+    """単調増加するカウンター"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """amountだけ加算（0の加算はラベルの系列を作成するのみ）"""
+        if amount < 0:
+            raise ValueError(f"Counter {self.name} cannot decrease: {amount}")
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """現在値（未記録の系列は0）"""
+        key = self._label_values(labels)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """累積バケット付きヒストグラム"""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # 系列ごとのバケット別件数（非累積）と観測値の合計
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """観測値を記録"""
+        key = self._label_values(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """ブロックの経過時間（秒）を記録"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        """観測回数"""
+        key = self._label_values(labels)
+        with self._lock:
+            return sum(self._counts.get(key, []))
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_bucket_bound(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{labels} {_format_value(self._sums[key])}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+
+class MetricsRegistry:
+    """メトリクスを登録し、OpenMetricsテキストとして出力するレジストリ"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric: _Metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """全メトリクスをOpenMetricsテキスト形式で出力"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = [line for metric in metrics for line in metric.collect()]
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """全メトリクスの記録値をクリア（登録は維持）"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+    def write_textfile(self, path: str) -> None:
+        """
+        OpenMetricsテキストファイルを書き出し（node_exporterのtextfile collector向け）
+
+        収集中に不完全なファイルを読まれないよう、一時ファイルに書いてから置き換える
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        logger.info("Metrics written", extra={"context": {"path": path}})
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+        """
+        /metrics でOpenMetricsテキストを返すHTTPサーバーをバックグラウンドスレッドで起動
+
+        Returns:
+            起動したサーバー（停止時はshutdown()とserver_close()を呼ぶ）
+        """
+        # 起動時間を抑えるため、HTTPで公開する場合のみ読み込む
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+
+        logger.info(
+            "Serving metrics",
+            extra={"context": {"host": host, "port": server.server_address[1]}}
+        )
+        return server
+
+
+# プロセス全体で共有するレジストリ
+REGISTRY = MetricsRegistry()
+
+# CSV取得
+CSV_FETCH_DURATION = REGISTRY.histogram(
+    "i7sync_csv_fetch_duration_seconds",
+    "Time until the CSV export responded (including the body for non-streamed requests)"
+)
+CSV_DOWNLOADED_BYTES = REGISTRY.counter(
+    "i7sync_csv_downloaded_bytes",
+    "CSV export bytes received from Google Sheets"
+)
+CSV_FETCH_RETRIES = REGISTRY.counter(
+    "i7sync_csv_fetch_retries",
+    "CSV export requests retried after a timeout"
+)
+
+# Tursoへのアップロード
+UPLOAD_BATCH_DURATION = REGISTRY.histogram(
+    "i7sync_upload_batch_duration_seconds",
+    "Latency of a single statement batch request to Turso"
+)
+UPLOAD_REQUESTS = REGISTRY.counter(
+    "i7sync_upload_requests",
+    "HTTP requests sent to Turso"
+)
+UPLOAD_BYTES = REGISTRY.counter(
+    "i7sync_upload_bytes",
+    "Request body bytes sent to Turso"
+)
+UPLOAD_BATCH_RETRIES = REGISTRY.counter(
+    "i7sync_upload_batch_retries",
+    "Statement batches shrunk and resent after a 413 response"
+)
+
+# 同期結果
+SYNC_DURATION = REGISTRY.histogram(
+    "i7sync_sync_duration_seconds",
+    "Time to sync a single table",
+    labelnames=("table",)
+)
+SYNC_RUNS = REGISTRY.counter(
+    "i7sync_sync_runs",
+    "Table sync runs by outcome (success, failure, not_modified)",
+    labelnames=("table", "status")
+)
+ROWS_INSERTED = REGISTRY.counter("i7sync_rows_inserted", "Rows inserted", labelnames=("table",))
+ROWS_UPDATED = REGISTRY.counter("i7sync_rows_updated", "Rows updated by delta sync", labelnames=("table",))
+ROWS_DELETED = REGISTRY.counter("i7sync_rows_deleted", "Rows deleted or replaced", labelnames=("table",))
+ROWS_SKIPPED = REGISTRY.counter("i7sync_rows_skipped", "Rows skipped by validation", labelnames=("table",))
+
+# メモリ最適化
+MEMORY_BYTES_SAVED = REGISTRY.counter(
+    "i7sync_memory_bytes_saved",
+    "DataFrame bytes saved by dtype downcasting and categorical encoding",
+    labelnames=("table",)
+)
+
+# 検証
+VALIDATION_FAILURES = REGISTRY.counter(
+    "i7sync_validation_failures",
+    "Rows violating each validation rule",
+    labelnames=("table", "rule")
+)
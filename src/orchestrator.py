@@ -1,14 +1,33 @@
 """SyncOrchestratorモジュール - 同期処理オーケストレーション"""
 
-from typing import Dict, List
-from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, wait
+import threading
 import time
 
+import pandas as pd
+
 from csv_fetcher import CSVFetcher
-from db_client import DatabaseClient
+from storage_backend import BatchCallback, StorageBackend, target_key
 from validators import DataValidator
 from transformers import DataTransformer
 from schema_manager import SchemaManager
+from constants import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CHUNK_ROWS,
+    MULTIROW_STATEMENTS_PER_BATCH,
+    INSERT_MODES,
+    SYNC_STRATEGIES,
+)
+from statement_builder import StatementBuilder
+from memory_optimizer import MemoryOptimizer
+from batch_sizer import AdaptiveBatchSizer
+from checkpoint import CheckpointStore, SyncCheckpoint, compute_content_hash
+from delta_sync import DeltaSynchronizer
+from pipeline import StreamingPipeline
+import instrumentation
+import metrics
 from logger import get_logger
 
 logger = get_logger(__name__)
@@ -23,6 +42,18 @@ class SyncResult:
     skipped_count: int
     success: bool
     error_message: str = ""
+    # 差分同期（delta）で更新された行数
+    updated_count: int = 0
+    # アップロード時に送信したバッチサイズ（ステートメント数）の推移
+    batch_sizes: List[int] = field(default_factory=list)
+    # シートが前回同期時から変更されておらずDB処理をスキップした場合True
+    not_modified: bool = False
+    # チェックポイントから再開した場合、前回までに挿入済みで再送しなかった行数
+    resumed_rows: int = 0
+    # ステージ（fetch/parse/validate/transform/optimize/schema/upload）ごとの計測値
+    # 例: {"upload": {"calls": 1, "wall_seconds": 1.2, "cpu_seconds": 0.3,
+    #                 "peak_rss_delta_bytes": 0, "bytes_sent": 123456, "http_requests": 8}}
+    stage_metrics: Dict[str, Dict[str, float]] = field(default_factory=dict)
 
 
 class SyncTimeoutError(Exception):
@@ -30,23 +61,82 @@ class SyncTimeoutError(Exception):
     pass
 
 
+class SyncCancelledError(Exception):
+    """タイムアウトにより中断されたテーブル同期"""
+    pass
+
+
 class SyncOrchestrator:
     """同期処理オーケストレーター"""
 
+    # INSERT文の構築モード・同期戦略（各値の説明はconstantsを参照）
+    INSERT_MODES = INSERT_MODES
+    SYNC_STRATEGIES = SYNC_STRATEGIES
+
     def __init__(
         self,
         csv_fetcher: CSVFetcher,
-        db_client: DatabaseClient,
+        db_client: StorageBackend,
         validator: DataValidator,
         transformer: DataTransformer,
-        timeout_seconds: int = 1800  # 30分
+        timeout_seconds: int = 1800,  # 30分
+        insert_mode: str = 'literal',
+        max_workers: int = 1,
+        sync_strategy: str = 'full',
+        adaptive_batching: bool = False,
+        streaming: bool = False,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        optimize_memory: bool = False,
+        checkpoint_dir: Optional[str] = None
     ):
+        """
+        Args:
+            csv_fetcher: CSV取得クライアント
+            db_client: データベースクライアント（DatabaseClient、SQLiteClient等のStorageBackend）
+            validator: データ検証サービス
+            transformer: データ変換サービス
+            timeout_seconds: 全テーブル同期のタイムアウト（秒）
+            insert_mode: INSERT文の構築モード（INSERT_MODES参照）
+            max_workers: 並行して同期するテーブル数（1の場合は逐次実行）
+            sync_strategy: 同期戦略（SYNC_STRATEGIES参照）
+            adaptive_batching: Trueの場合、ペイロードサイズと応答時間に応じてバッチサイズを自動調整
+            streaming: Trueの場合、CSVをチャンク単位で取得・変換・アップロードするパイプラインで同期
+                （full戦略のみ対応。条件付き取得によるスキップは行わない）
+            chunk_rows: streaming時の1チャンクあたりの行数
+            optimize_memory: Trueの場合、変換後に数値カラムのdtype縮小と文字列カラムのcategory化を行う
+            checkpoint_dir: 指定時はfull戦略のアップロード進捗をテーブルごとに保存し、
+                途中で失敗した同期を次回同じ内容であれば未確認のバッチから再開する
+        """
+        if insert_mode not in self.INSERT_MODES:
+            raise ValueError(f"Invalid insert mode: {insert_mode}")
+        if sync_strategy not in self.SYNC_STRATEGIES:
+            raise ValueError(f"Invalid sync strategy: {sync_strategy}")
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1: {max_workers}")
+        if streaming and sync_strategy != 'full':
+            raise ValueError(f"Streaming is only supported with the full sync strategy: {sync_strategy}")
+
         self.csv_fetcher = csv_fetcher
         self.db_client = db_client
         self.validator = validator
         self.transformer = transformer
         self.schema_manager = SchemaManager(db_client)
+        self.statement_builder = StatementBuilder()
         self.timeout_seconds = timeout_seconds
+        self.insert_mode = insert_mode
+        self.max_workers = max_workers
+        self.sync_strategy = sync_strategy
+        self.adaptive_batching = adaptive_batching
+        self.streaming = streaming
+        self.chunk_rows = chunk_rows
+        self.optimize_memory = optimize_memory
+        self.memory_optimizer = MemoryOptimizer()
+        # 進捗は同期先のテーブルの状態なので、同期先ごとに保存する
+        self.checkpoint_store = CheckpointStore(checkpoint_dir, target_key(db_client.target)) if checkpoint_dir else None
+        self.delta_synchronizer = DeltaSynchronizer(db_client, self.statement_builder)
+        self.pipeline = StreamingPipeline(db_client, self.schema_manager)
+        # 並行同期のタイムアウト時にセットし、実行中のワーカーをステージ・バッチの区切りで停止させる
+        self._cancelled = threading.Event()
 
     def sync_all_tables(
         self,
@@ -67,25 +157,80 @@ class SyncOrchestrator:
             SyncTimeoutError: 30分以内に完了しない場合
         """
         start_time = time.time()
-        results = []
 
         logger.info(f"Starting sync for all tables")
-
-        for table_name, gid in sheet_configs.items():
-            # タイムアウトチェック
-            elapsed = time.time() - start_time
-            if elapsed > self.timeout_seconds:
-                logger.warning(f"Sync timeout after {elapsed:.1f} seconds")
-                raise SyncTimeoutError(f"Sync timeout after {elapsed:.1f} seconds")
-
-            result = self.sync_single_table(table_name, gid, spreadsheet_id)
-            results.append(result)
+        self._cancelled.clear()
+
+        if self.max_workers > 1 and len(sheet_configs) > 1:
+            results = self._sync_tables_concurrently(spreadsheet_id, sheet_configs, start_time)
+        else:
+            results = []
+            for table_name, gid in sheet_configs.items():
+                # タイムアウトチェック
+                elapsed = time.time() - start_time
+                if elapsed > self.timeout_seconds:
+                    logger.warning(f"Sync timeout after {elapsed:.1f} seconds")
+                    raise SyncTimeoutError(f"Sync timeout after {elapsed:.1f} seconds")
+
+                result = self.sync_single_table(table_name, gid, spreadsheet_id)
+                results.append(result)
 
         total_elapsed = time.time() - start_time
         logger.info(f"Sync completed in {total_elapsed:.1f} seconds")
 
         return results
 
+    def _sync_tables_concurrently(
+        self,
+        spreadsheet_id: str,
+        sheet_configs: Dict[str, int],
+        start_time: float
+    ) -> List[SyncResult]:
+        """
+        スレッドプールで各テーブルの同期を並行実行
+
+        タイムアウトは全ワーカー共通の予算として適用し、結果はsheet_configsの順序で返す。
+        タイムアウト時は実行中のワーカーに中断を要求し、全ワーカーの終了を待ってから例外を送出する
+        （例外の送出後に書き込みが続かないようにするため）
+
+        Raises:
+            SyncTimeoutError: 予算内に全テーブルの同期が完了しない場合
+        """
+        workers = min(self.max_workers, len(sheet_configs))
+        logger.info(
+            "Syncing tables concurrently",
+            extra={"context": {"max_workers": workers, "tables": list(sheet_configs)}}
+        )
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sync")
+        try:
+            futures = [
+                executor.submit(self.sync_single_table, table_name, gid, spreadsheet_id)
+                for table_name, gid in sheet_configs.items()
+            ]
+
+            remaining = self.timeout_seconds - (time.time() - start_time)
+            _, not_done = wait(futures, timeout=max(remaining, 0))
+
+            if not_done:
+                elapsed = time.time() - start_time
+                pending = [
+                    table_name for table_name, future in zip(sheet_configs, futures)
+                    if future in not_done
+                ]
+                logger.warning(
+                    f"Sync timeout after {elapsed:.1f} seconds, waiting for running tables to stop",
+                    extra={"context": {"pending_tables": pending}}
+                )
+                self._cancelled.set()
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise SyncTimeoutError(f"Sync timeout after {elapsed:.1f} seconds")
+
+            return [future.result() for future in futures]
+
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def sync_single_table(
         self,
         table_name: str,
@@ -101,48 +246,100 @@ class SyncOrchestrator:
             spreadsheet_id: SpreadsheetのID
 
         Returns:
-            同期結果
+            同期結果（stage_metricsにステージごとの処理時間・CPU時間・メモリ増分を含む）
         """
+        recorder = instrumentation.StageRecorder()
+        with instrumentation.activate(recorder), metrics.SYNC_DURATION.time(table=table_name):
+            result = self._sync_table(table_name, gid, spreadsheet_id)
+
+        result.stage_metrics = recorder.to_dict()
+        self._record_metrics(result)
+        logger.info(
+            f"Table sync finished: {table_name}",
+            extra={"context": {"success": result.success, "stage_metrics": result.stage_metrics}}
+        )
+        return result
+
+    def _record_metrics(self, result: SyncResult) -> None:
+        """同期結果をメトリクスに反映"""
+        table = result.table_name
+        if result.not_modified:
+            status = "not_modified"
+        else:
+            status = "success" if result.success else "failure"
+        metrics.SYNC_RUNS.inc(table=table, status=status)
+        metrics.ROWS_INSERTED.inc(result.inserted_count, table=table)
+        metrics.ROWS_UPDATED.inc(result.updated_count, table=table)
+        metrics.ROWS_DELETED.inc(result.deleted_count, table=table)
+        metrics.ROWS_SKIPPED.inc(result.skipped_count, table=table)
+
+    def _sync_table(
+        self,
+        table_name: str,
+        gid: int,
+        spreadsheet_id: str
+    ) -> SyncResult:
+        """単一テーブルを同期（計測はsync_single_tableで有効化される）"""
         try:
+            self._check_cancelled(table_name)
             logger.info(f"Syncing table: {table_name}")
 
             # 1. CSVデータ取得
             # Songs: header=1 (row 2), Cards/Brooches: header=0 (row 1)
-            if table_name == 'songs':
-                df = self.csv_fetcher.fetch_csv_as_dataframe(spreadsheet_id, gid, header=1)
+            header = 1 if table_name == 'songs' else 0
+
+            if self.streaming:
+                return self._sync_streaming(table_name, gid, spreadsheet_id, header)
+
+            df = self.csv_fetcher.fetch_csv_if_modified(spreadsheet_id, gid, header=header)
+
+            # 前回同期時から変更がなければDB処理を一切行わない
+            if df is None:
+                logger.info(f"Skipping unchanged table: {table_name}")
+                return SyncResult(
+                    table_name=table_name,
+                    deleted_count=0,
+                    inserted_count=0,
+                    skipped_count=0,
+                    success=True,
+                    not_modified=True
+                )
+
+            # 2-3. データ検証・変換
+            self._check_cancelled(table_name)
+            transformed_df, skipped_count = self._prepare_frame(table_name, df)
+            self._check_cancelled(table_name)
+
+            # 4-5. テーブル作成とデータベース同期 - 変換後のDataFrameを使用
+            # uploadステージにはINSERT文の構築を含む
+            if self.sync_strategy == 'delta':
+                with instrumentation.stage("schema"):
+                    table_recreated = self.schema_manager.ensure_table_exists(table_name, transformed_df)
+                with instrumentation.stage("upload"):
+                    result = self.delta_synchronizer.sync(table_name, transformed_df, table_recreated)
+            elif self.sync_strategy == 'swap':
+                result = self._load_with_swap(table_name, transformed_df)
             else:
-                df = self.csv_fetcher.fetch_csv_as_dataframe(spreadsheet_id, gid, header=0)
-
-            # 2. データ検証
-            if table_name == 'songs':
-                valid_df, errors = self.validator.validate_songs_data(df)
-            elif table_name == 'cards':
-                valid_df, errors = self.validator.validate_cards_data(df)
-            elif table_name == 'brooches':
-                valid_df, errors = self.validator.validate_brooches_data(df)
-            else:
-                raise ValueError(f"Unknown table: {table_name}")
-
-            skipped_count = len(df) - len(valid_df)
-
-            # 3. データ変換
-            transformed_df = self.transformer.transform_for_database(valid_df, table_name=table_name)
-
-            # 4. テーブル作成（存在しない場合） - 変換後のDataFrameを使用
-            self.schema_manager.ensure_table_exists(table_name, transformed_df)
-
-            # 5. データベース同期
-            delete_query = f"DELETE FROM {table_name}"
-            insert_statements = self._build_insert_statements(table_name, transformed_df)
+                with instrumentation.stage("schema"):
+                    table_recreated = self.schema_manager.ensure_table_exists(table_name, transformed_df)
+                with instrumentation.stage("upload"):
+                    insert_statements, batch_size = self._build_load_statements(table_name, transformed_df)
+                    result = self._load_full(
+                        table_name, transformed_df, insert_statements, batch_size, table_recreated
+                    )
 
-            result = self.db_client.execute_transaction(delete_query, insert_statements)
+            # 同期成功後にのみ取得状態を保存（失敗時は次回も再取得する）
+            self.csv_fetcher.commit_fetch_state(spreadsheet_id, gid)
 
             return SyncResult(
                 table_name=table_name,
                 deleted_count=result['deleted'],
                 inserted_count=result['inserted'],
                 skipped_count=skipped_count,
-                success=True
+                success=True,
+                updated_count=result.get('updated', 0),
+                batch_sizes=result.get('batch_sizes', []),
+                resumed_rows=result.get('resumed_rows', 0)
             )
 
         except Exception as e:
@@ -156,35 +353,284 @@ class SyncOrchestrator:
                 error_message=str(e)
             )
 
-    def _build_insert_statements(self, table_name: str, df) -> List[str]:
+    def _check_cancelled(self, table_name: str) -> None:
+        """
+        中断が要求されていれば例外を送出（ステージ間・アップロードのバッチ間で呼ばれる）
+
+        Raises:
+            SyncCancelledError: 並行同期がタイムアウトした場合
+        """
+        if self._cancelled.is_set():
+            raise SyncCancelledError(f"Sync cancelled: {table_name}")
+
+    def _cancellation_callback(
+        self,
+        table_name: str,
+        on_batch_committed: Optional[BatchCallback] = None
+    ) -> BatchCallback:
+        """
+        バッチのコミットごとに中断要求を確認するon_batch_committed（execute_statements用。
+        execute_transactionにはcheck_cancelledで各リクエストの送信前に確認させる）
+
+        中断時は例外により後続のバッチを送信しない（コミット済みのバッチはチェックポイントから再開できる）
+        """
+        def on_committed(start: int, end: int, rows_written: int) -> None:
+            if on_batch_committed:
+                on_batch_committed(start, end, rows_written)
+            self._check_cancelled(table_name)
+        return on_committed
+
+    def _prepare_frame(self, table_name: str, df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+        """
+        DataFrameを検証・変換
+
+        Returns:
+            (変換後のDataFrame, 検証でスキップした行数)
+        """
+        with instrumentation.stage("validate"):
+            if table_name == 'songs':
+                valid_df, errors = self.validator.validate_songs_data(df)
+            elif table_name == 'cards':
+                valid_df, errors = self.validator.validate_cards_data(df)
+            elif table_name == 'brooches':
+                valid_df, errors = self.validator.validate_brooches_data(df)
+            else:
+                raise ValueError(f"Unknown table: {table_name}")
+
+        skipped_count = len(df) - len(valid_df)
+
+        # valid_dfは検証で新たに生成されたフレームのため、コピーせずに変換する
+        with instrumentation.stage("transform"):
+            transformed_df = self.transformer.transform_for_database(valid_df, table_name=table_name, copy=False)
+
+        if self.optimize_memory:
+            with instrumentation.stage("optimize"):
+                transformed_df, bytes_saved = self.memory_optimizer.optimize(transformed_df)
+                instrumentation.add_counters(bytes_saved=bytes_saved)
+            metrics.MEMORY_BYTES_SAVED.inc(bytes_saved, table=table_name)
+
+        return transformed_df, skipped_count
+
+    def _sync_streaming(
+        self,
+        table_name: str,
+        gid: int,
+        spreadsheet_id: str,
+        header: int
+    ) -> SyncResult:
+        """
+        CSVの受信・検証/変換・アップロードを重ねて実行するパイプラインで同期
+
+        スキーマは最初のチャンクから推測するため、後続チャンクにのみ現れる型の違いは
+        SQLiteの型アフィニティで吸収される。
+        各ステージは別スレッドで重なって実行されるため、ステージごとの経過時間の合計は
+        同期全体の経過時間を上回ることがある
+        """
+        def chunks() -> Iterator[pd.DataFrame]:
+            # チャンクの区切りで中断要求を確認する（例外はパイプライン全体の失敗として扱われる）
+            for chunk in self.csv_fetcher.iter_csv_chunks(
+                spreadsheet_id, gid, chunk_rows=self.chunk_rows, header=header
+            ):
+                self._check_cancelled(table_name)
+                yield chunk
+
+        def build_statements(chunk_df: pd.DataFrame) -> Tuple[List[Union[str, Dict[str, Any]]], int]:
+            with instrumentation.stage("upload"):
+                return self._build_load_statements(table_name, chunk_df)
+
+        result = self.pipeline.run(
+            table_name,
+            chunks(),
+            prepare=lambda chunk: self._prepare_frame(table_name, chunk),
+            build_statements=build_statements,
+            batch_sizer=self._create_batch_sizer(
+                MULTIROW_STATEMENTS_PER_BATCH if self.insert_mode == 'multirow' else DEFAULT_BATCH_SIZE
+            )
+        )
+
+        return SyncResult(
+            table_name=table_name,
+            deleted_count=result['deleted'],
+            inserted_count=result['inserted'],
+            skipped_count=result['skipped'],
+            success=True,
+            batch_sizes=result['batch_sizes']
+        )
+
+    def _build_load_statements(
+        self,
+        table_name: str,
+        df: pd.DataFrame
+    ) -> Tuple[List[Union[str, Dict[str, Any]]], int]:
+        """
+        insert_modeに応じたINSERT文と1リクエストあたりの文数を構築
+
+        Returns:
+            (INSERT文のリスト, バッチサイズ)
+        """
+        if self.insert_mode == 'multirow':
+            column_count = len(self.schema_manager.infer_column_types(df))
+            statements = self.statement_builder.build_multirow_statements(table_name, df, column_count)
+            return statements, MULTIROW_STATEMENTS_PER_BATCH
+
+        if self.insert_mode == 'parameterized':
+            return self.statement_builder.build_parameterized_statements(table_name, df), DEFAULT_BATCH_SIZE
+
+        return self._build_insert_statements(table_name, df), DEFAULT_BATCH_SIZE
+
+    def _load_full(
+        self,
+        table_name: str,
+        df: pd.DataFrame,
+        insert_statements: List[Union[str, Dict[str, Any]]],
+        batch_size: int,
+        table_recreated: bool
+    ) -> Dict[str, Any]:
+        """
+        全件DELETE → 全件INSERT
+
+        checkpoint_dir指定時はコミットが確認されたINSERTバッチごとにチェックポイントを保存する。
+        前回の同期が途中で失敗しており、内容ハッシュ・コミット済み範囲のINSERT文のハッシュ・
+        テーブルの行数がすべて一致する場合は、DELETEと確認済みのバッチを送らずに続きから再開する
+
+        Returns:
+            {"deleted": N, "inserted": M, "batch_sizes": [...], "resumed_rows": K}
+        """
+        delete_query = f"DELETE FROM {table_name}"
+        batch_sizer = self._create_batch_sizer(batch_size)
+
+        if self.checkpoint_store is None:
+            return self.db_client.execute_transaction(
+                delete_query,
+                insert_statements,
+                batch_size=batch_size,
+                batch_sizer=batch_sizer,
+                check_cancelled=lambda: self._check_cancelled(table_name)
+            )
+
+        content_hash = compute_content_hash(df)
+        # テーブルを作り直した場合は既存の行が残っていないため再開しない
+        checkpoint = None if table_recreated else self.checkpoint_store.load(table_name)
+        resume_offset = self._resume_offset(table_name, checkpoint, content_hash, insert_statements)
+
+        if not resume_offset:
+            checkpoint = SyncCheckpoint(content_hash=content_hash)
+            self.checkpoint_store.clear(table_name)
+
+        def record_batch(start: int, end: int, rows_written: int) -> None:
+            checkpoint.record(insert_statements, resume_offset + start, resume_offset + end, rows_written)
+            self.checkpoint_store.save(table_name, checkpoint)
+
+        if resume_offset:
+            resumed_rows = checkpoint.committed_rows
+            logger.info(
+                f"Resuming upload from checkpoint: {table_name}",
+                extra={
+                    "context": {
+                        "resume_from_statement": resume_offset,
+                        "total_statements": len(insert_statements),
+                        "resumed_rows": resumed_rows
+                    }
+                }
+            )
+            load_result = self.db_client.execute_statements(
+                insert_statements[resume_offset:],
+                batch_size=batch_size,
+                batch_sizer=batch_sizer,
+                independent=True,
+                on_batch_committed=self._cancellation_callback(table_name, record_batch)
+            )
+            result = {
+                "deleted": 0,
+                "inserted": load_result['rows_written'],
+                "batch_sizes": load_result.get('batch_sizes', []),
+                "resumed_rows": resumed_rows
+            }
+        else:
+            result = self.db_client.execute_transaction(
+                delete_query,
+                insert_statements,
+                batch_size=batch_size,
+                batch_sizer=batch_sizer,
+                on_batch_committed=record_batch,
+                check_cancelled=lambda: self._check_cancelled(table_name)
+            )
+
+        # 全件のアップロードが完了したらチェックポイントは不要
+        self.checkpoint_store.clear(table_name)
+        return result
+
+    def _resume_offset(
+        self,
+        table_name: str,
+        checkpoint: Optional[SyncCheckpoint],
+        content_hash: str,
+        insert_statements: List[Union[str, Dict[str, Any]]]
+    ) -> int:
+        """チェックポイントから再開できるINSERT文の位置（再開できない場合は0）"""
+        if checkpoint is None or not checkpoint.committed_statements:
+            return 0
+
+        resume_offset = checkpoint.resume_offset(content_hash, insert_statements)
+        if not resume_offset:
+            logger.info(f"Discarding checkpoint for changed content: {table_name}")
+            return 0
+
+        # 確認できなかったバッチが一部反映されている等、テーブルの状態がチェックポイントと異なる場合は最初から
+        live_rows = self.db_client.query_rows(f"SELECT COUNT(*) FROM {table_name}")[0][0]
+        if live_rows != checkpoint.committed_rows:
+            logger.warning(
+                f"Discarding checkpoint, row count mismatch: {table_name}",
+                extra={"context": {"live_rows": live_rows, "committed_rows": checkpoint.committed_rows}}
+            )
+            return 0
+
+        return resume_offset
+
+    def _load_with_swap(self, table_name: str, df: pd.DataFrame) -> Dict[str, int]:
+        """
+        ステージングテーブルに全件をロードしてから本番テーブルと入れ替え
+
+        {table}__staging にバッチ挿入した後、単一リクエスト内で RENAME による入れ替えを行うため、
+        読み取り側は常に完全な旧データか完全な新データのどちらかを参照する
+
+        Returns:
+            {"deleted": 旧テーブルの行数, "inserted": 挿入行数, "batch_sizes": [...]}
+        """
+        staging_table = f"{table_name}__staging"
+
+        # 前回の失敗で残ったステージングテーブルを破棄して作り直す
+        with instrumentation.stage("schema"):
+            column_types = self.schema_manager.infer_column_types(df)
+            self.db_client.execute_query(f"DROP TABLE IF EXISTS {staging_table}")
+            self.db_client.execute_query(self.schema_manager.build_create_table_sql(staging_table, column_types))
+
+        with instrumentation.stage("upload"):
+            insert_statements, batch_size = self._build_load_statements(staging_table, df)
+            load_result = self.db_client.execute_statements(
+                insert_statements,
+                batch_size=batch_size,
+                batch_sizer=self._create_batch_sizer(batch_size),
+                independent=True,
+                on_batch_committed=self._cancellation_callback(table_name)
+            )
+
+            # 中断時は入れ替えない（本番テーブルは同期前のまま残る）
+            self._check_cancelled(table_name)
+            replaced_rows = self.db_client.swap_table(table_name, staging_table)
+
+        return {
+            "deleted": replaced_rows,
+            "inserted": load_result['rows_written'],
+            "batch_sizes": load_result.get('batch_sizes', [])
+        }
+
+    def _create_batch_sizer(self, initial_size: int) -> Optional[AdaptiveBatchSizer]:
+        """テーブルごとに独立したバッチサイズコントローラーを生成（無効時はNone）"""
+        if not self.adaptive_batching:
+            return None
+        return AdaptiveBatchSizer(initial_size=initial_size)
+
+    def _build_insert_statements(self, table_name: str, df: pd.DataFrame) -> List[str]:
         """INSERT文のリストを構築"""
-        import pandas as pd
-        import math
-
-        statements = []
-        columns = list(df.columns)
-        # カラム名をバッククォートで囲む
-        quoted_columns = [f'`{col}`' for col in columns]
-
-        for _, row in df.iterrows():
-            # 値を適切にエスケープしてSQL文を構築
-            values = []
-            for col in columns:
-                val = row[col]
-                if pd.isna(val) or (isinstance(val, float) and math.isnan(val)):
-                    values.append('NULL')
-                elif isinstance(val, (int, float)):
-                    # floatの場合、inf/-inf/nanをNULLに変換
-                    if math.isinf(val) or math.isnan(val):
-                        values.append('NULL')
-                    else:
-                        values.append(str(val))
-                else:
-                    # 文字列値をシングルクォートでエスケープ
-                    escaped_val = str(val).replace("'", "''")
-                    values.append(f"'{escaped_val}'")
-
-            stmt = f"INSERT INTO {table_name} ({', '.join(quoted_columns)}) VALUES ({', '.join(values)})"
-            statements.append(stmt)
-
-        return statements
+        return self.statement_builder.build_literal_statements(table_name, df)
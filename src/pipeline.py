@@ -0,0 +1,222 @@
+"""StreamingPipelineモジュール - 取得・検証/変換・アップロードを並行させるストリーミング同期"""
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from storage_backend import StorageBackend
+from schema_manager import SchemaManager
+from batch_sizer import AdaptiveBatchSizer
+from constants import PIPELINE_QUEUE_SIZE
+import instrumentation
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+# キュー待ちで停止要求を確認する間隔（秒）
+_POLL_INTERVAL = 0.1
+
+
+class PipelineCancelledError(Exception):
+    """他ステージの失敗によりパイプラインが停止された"""
+    pass
+
+
+class _StageEnd:
+    """ステージの終了（exceptionが設定されていれば失敗）を後続ステージに伝えるマーカー"""
+
+    def __init__(self, exception: Optional[BaseException] = None):
+        self.exception = exception
+
+
+class StreamingPipeline:
+    """
+    CSVチャンクの取得・検証/変換・アップロードを別スレッドで重ねて実行するパイプライン
+
+    fetch → prepare（検証・変換・INSERT文構築） → upload の各ステージは上限付きキューで接続され、
+    アップロードが遅い場合は前段がブロックされるため、メモリ上のチャンク数は一定に保たれる。
+    テーブルのスキーマは最初のチャンクから推測し、その時点で既存データを削除してから
+    各チャンクのINSERT文を順次アップロードする（full戦略相当）。
+    """
+
+    def __init__(
+        self,
+        db_client: StorageBackend,
+        schema_manager: SchemaManager,
+        queue_size: int = PIPELINE_QUEUE_SIZE
+    ):
+        """
+        Args:
+            db_client: データベースクライアント（DatabaseClient、SQLiteClient等のStorageBackend）
+            schema_manager: スキーマ管理サービス
+            queue_size: ステージ間キューに保持する最大チャンク数
+        """
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be >= 1: {queue_size}")
+
+        self.db_client = db_client
+        self.schema_manager = schema_manager
+        self.queue_size = queue_size
+
+    def run(
+        self,
+        table_name: str,
+        chunks: Iterable[pd.DataFrame],
+        prepare: Callable[[pd.DataFrame], Tuple[pd.DataFrame, int]],
+        build_statements: Callable[[pd.DataFrame], Tuple[List[Union[str, Dict[str, Any]]], int]],
+        batch_sizer: Optional[AdaptiveBatchSizer] = None
+    ) -> Dict[str, Any]:
+        """
+        チャンクを順に処理してテーブルへ反映
+
+        Args:
+            table_name: テーブル名
+            chunks: 取得したCSVチャンクのイテレーター（fetchステージで消費）
+            prepare: チャンクを検証・変換し (変換後DataFrame, スキップ行数) を返す関数
+            build_statements: 変換後DataFrameから (INSERT文リスト, バッチサイズ) を返す関数
+            batch_sizer: アップロードのバッチサイズコントローラー（全チャンクで共有）
+
+        Returns:
+            {"deleted": N, "inserted": M, "skipped": K, "chunks": C, "batch_sizes": [...]}
+
+        Raises:
+            各ステージで発生した例外（最初に失敗したステージのもの）
+        """
+        stop_event = threading.Event()
+        # 呼び出し元スレッドの計測をワーカースレッドに引き継ぐ
+        recorder = instrumentation.current_recorder()
+        fetched: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        prepared: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        def fetch_stage() -> None:
+            try:
+                with instrumentation.activate(recorder):
+                    for chunk in chunks:
+                        self._put(fetched, chunk, stop_event)
+                self._put(fetched, _StageEnd(), stop_event)
+            except PipelineCancelledError:
+                pass
+            except BaseException as e:
+                self._put_end(fetched, e, stop_event)
+
+        def prepare_stage() -> None:
+            try:
+                with instrumentation.activate(recorder):
+                    while True:
+                        item = self._get(fetched, stop_event)
+                        if isinstance(item, _StageEnd):
+                            self._put(prepared, item, stop_event)
+                            return
+                        transformed_df, skipped = prepare(item)
+                        statements, batch_size = build_statements(transformed_df)
+                        self._put(prepared, (transformed_df, statements, batch_size, skipped), stop_event)
+            except PipelineCancelledError:
+                pass
+            except BaseException as e:
+                self._put_end(prepared, e, stop_event)
+
+        workers = [
+            threading.Thread(target=fetch_stage, name=f"pipeline-fetch-{table_name}", daemon=True),
+            threading.Thread(target=prepare_stage, name=f"pipeline-prepare-{table_name}", daemon=True),
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            return self._upload_stage(table_name, prepared, stop_event, batch_sizer)
+        finally:
+            # アップロード失敗時は前段を停止させ、ブロック中のスレッドを解放する
+            stop_event.set()
+            for worker in workers:
+                worker.join()
+
+    def _upload_stage(
+        self,
+        table_name: str,
+        prepared: queue.Queue,
+        stop_event: threading.Event,
+        batch_sizer: Optional[AdaptiveBatchSizer]
+    ) -> Dict[str, Any]:
+        """変換済みチャンクを受け取り、スキーマ確認・既存データ削除の後に順次アップロード"""
+        deleted = 0
+        inserted = 0
+        skipped_total = 0
+        chunk_count = 0
+        batch_sizes: List[int] = []
+
+        while True:
+            item = self._get(prepared, stop_event)
+            if isinstance(item, _StageEnd):
+                if item.exception is not None:
+                    raise item.exception
+                break
+
+            transformed_df, statements, batch_size, skipped = item
+
+            if chunk_count == 0:
+                # 最初のチャンクでスキーマを確定し、既存データを削除
+                with instrumentation.stage("schema"):
+                    self.schema_manager.ensure_table_exists(table_name, transformed_df)
+                with instrumentation.stage("upload"):
+                    delete_result = self.db_client.execute_statements([f"DELETE FROM {table_name}"])
+                deleted = delete_result['rows_written']
+
+            chunk_count += 1
+            skipped_total += skipped
+
+            if statements:
+                with instrumentation.stage("upload"):
+                    result = self.db_client.execute_statements(
+                        statements,
+                        batch_size=batch_size,
+                        batch_sizer=batch_sizer,
+                        independent=True
+                    )
+                inserted += result['rows_written']
+                batch_sizes.extend(result.get('batch_sizes', []))
+
+            logger.info(
+                f"Uploaded chunk {chunk_count} for {table_name}",
+                extra={"context": {"rows": len(transformed_df), "inserted_total": inserted}}
+            )
+
+        if chunk_count == 0:
+            logger.warning(f"No CSV chunks received for {table_name}, table left unchanged")
+
+        return {
+            "deleted": deleted,
+            "inserted": inserted,
+            "skipped": skipped_total,
+            "chunks": chunk_count,
+            "batch_sizes": batch_sizes
+        }
+
+    def _put(self, target: queue.Queue, item: Any, stop_event: threading.Event) -> None:
+        """キューの空きを待って投入（停止要求時はPipelineCancelledError）"""
+        while True:
+            if stop_event.is_set():
+                raise PipelineCancelledError()
+            try:
+                target.put(item, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, source: queue.Queue, stop_event: threading.Event) -> Any:
+        """キューから取り出し（停止要求時はPipelineCancelledError）"""
+        while True:
+            if stop_event.is_set():
+                raise PipelineCancelledError()
+            try:
+                return source.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+    def _put_end(self, target: queue.Queue, exception: BaseException, stop_event: threading.Event) -> None:
+        """失敗を後続ステージに伝える"""
+        try:
+            self._put(target, _StageEnd(exception), stop_event)
+        except PipelineCancelledError:
+            pass
@@ -0,0 +1,147 @@
+"""SyncSchedulerモジュール - 常駐プロセスでの定期同期スケジューラー"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SyncScheduler:
+    """
+    同期処理を一定間隔で繰り返し実行するスケジューラー
+
+    - 実行開始時刻を基準にinterval秒ごとに実行し、jitterの割合で間隔をランダムにずらす
+    - 実行中に次の予定時刻を過ぎた場合、その回はスキップする（同期を重ねて実行しない）
+    - 全テーブルが前回から変更なし（not_modified）の場合は間隔をbackoff_factor倍ずつ
+      max_interval秒まで延ばし、変更・失敗があればintervalに戻す
+    """
+
+    def __init__(
+        self,
+        sync: Callable[[], List[Any]],
+        interval: float = 300.0,
+        jitter: float = 0.1,
+        max_interval: float = 3600.0,
+        backoff_factor: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Args:
+            sync: 1回分の同期処理（SyncResultのリストを返す）
+            interval: 基本の実行間隔（秒）
+            jitter: 間隔をずらす割合（0.1なら±10%）
+            max_interval: 変更なしが続いた場合の最大間隔（秒）
+            backoff_factor: 変更なしのときに間隔を延ばす倍率
+            clock: 単調増加する時刻関数（テスト用）
+            rng: ジッター用の乱数生成器（テスト用）
+        """
+        if interval <= 0:
+            raise ValueError(f"interval must be > 0: {interval}")
+        if not 0 <= jitter < 1:
+            raise ValueError(f"jitter must be in [0, 1): {jitter}")
+        if max_interval < interval:
+            raise ValueError(f"max_interval must be >= interval: {max_interval} < {interval}")
+        if backoff_factor < 1:
+            raise ValueError(f"backoff_factor must be >= 1: {backoff_factor}")
+
+        self.sync = sync
+        self.interval = interval
+        self.jitter = jitter
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.clock = clock
+        self.rng = rng or random.Random()
+
+        self.current_interval = interval
+        self.run_count = 0
+        self.skipped_count = 0
+        self._running = threading.Lock()
+
+    def run_once(self) -> Optional[List[Any]]:
+        """
+        同期を1回実行（他の同期が実行中の場合は実行せずNone）
+
+        同期処理の例外はログに記録して失敗扱いとし、スケジューラーは停止しない
+        """
+        if not self._running.acquire(blocking=False):
+            self.skipped_count += 1
+            logger.warning("Previous sync still running, skipping this run")
+            return None
+
+        try:
+            self.run_count += 1
+            try:
+                results = self.sync()
+            except Exception as e:
+                logger.error(f"Scheduled sync failed: {e}")
+                results = []
+            self._update_interval(results)
+            return results
+        finally:
+            self._running.release()
+
+    def run_forever(self, stop_event: threading.Event) -> None:
+        """
+        stop_eventが設定されるまで同期を繰り返す
+
+        Args:
+            stop_event: 停止要求（シグナルハンドラー等から設定）
+        """
+        logger.info(
+            "Starting sync scheduler",
+            extra={
+                "context": {
+                    "interval": self.interval,
+                    "jitter": self.jitter,
+                    "max_interval": self.max_interval
+                }
+            }
+        )
+
+        while not stop_event.is_set():
+            started = self.clock()
+            self.run_once()
+
+            next_run = started + self.next_delay()
+            now = self.clock()
+            # 同期が間隔より長引いた場合、過ぎた予定は実行せず次の予定まで待つ
+            while next_run <= now:
+                self.skipped_count += 1
+                logger.warning(
+                    "Sync overran its interval, skipping overlapping run",
+                    extra={"context": {"overrun_seconds": round(now - next_run, 3)}}
+                )
+                next_run += self.next_delay()
+
+            logger.info(
+                "Next sync scheduled",
+                extra={"context": {"in_seconds": round(next_run - now, 3), "interval": self.current_interval}}
+            )
+            stop_event.wait(next_run - now)
+
+        logger.info(
+            "Sync scheduler stopped",
+            extra={"context": {"runs": self.run_count, "skipped": self.skipped_count}}
+        )
+
+    def next_delay(self) -> float:
+        """現在の間隔にジッターを加えた次回までの待ち時間（秒）"""
+        spread = self.current_interval * self.jitter
+        return self.current_interval + self.rng.uniform(-spread, spread)
+
+    def _update_interval(self, results: List[Any]) -> None:
+        """変更なしが続く場合は間隔を延ばし、それ以外は基本間隔に戻す"""
+        unchanged = bool(results) and all(r.success and r.not_modified for r in results)
+        if unchanged:
+            self.current_interval = min(self.current_interval * self.backoff_factor, self.max_interval)
+            logger.info(
+                "No sheet changes, backing off",
+                extra={"context": {"interval": self.current_interval}}
+            )
+        else:
+            self.current_interval = self.interval
@@ -1,10 +1,10 @@
 """SchemaManagerモジュール - データベーススキーマ管理"""
 
 import re
-from typing import Dict
+from typing import Dict, Tuple
 import pandas as pd
 
-from db_client import DatabaseClient
+from storage_backend import StorageBackend
 from logger import get_logger
 
 logger = get_logger(__name__)
@@ -18,17 +18,26 @@ class SchemaCreationError(Exception):
 class SchemaManager:
     """スキーマ管理サービス"""
 
-    def __init__(self, db_client: DatabaseClient):
+    def __init__(self, db_client: StorageBackend):
         self.db_client = db_client
 
-    def ensure_table_exists(self, table_name: str, df: pd.DataFrame) -> None:
+    def ensure_table_exists(self, table_name: str, df: pd.DataFrame) -> bool:
         """
-        テーブルが存在しない場合は作成（既存の場合は削除して再作成）
+        テーブルのスキーマをDataFrameに合わせる
+
+        現在のスキーマ（PRAGMA table_info）と推測した型を比較し、
+        - テーブルが存在しない場合は作成
+        - 一致する場合は何もしない
+        - カラムの追加・削除のみの場合はALTER TABLE ADD/DROP COLUMN
+        - 型または主キーが変わった場合のみ削除して再作成
 
         Args:
             table_name: テーブル名
             df: スキーマ推測用のDataFrame
 
+        Returns:
+            テーブルを新規作成・再作成した（既存データが失われた）場合True
+
         Raises:
             SchemaCreationError: テーブル作成失敗時
         """
@@ -36,35 +45,109 @@ class SchemaManager:
             logger.info(f"Ensuring table exists: {table_name}")
 
             column_types = self.infer_column_types(df)
-            columns_def = []
+            live_columns = self.get_live_columns(table_name)
+
+            if not live_columns:
+                self._create_table(table_name, column_types)
+                logger.info(f"Table {table_name} created successfully")
+                return True
+
+            if self._requires_rebuild(column_types, live_columns):
+                # 型・主キーの変更はALTER TABLEで対応できないため再作成
+                drop_table_sql = f"DROP TABLE IF EXISTS {table_name}"
+                self.db_client.execute_query(drop_table_sql)
+                self._create_table(table_name, column_types)
+                logger.info(f"Table {table_name} rebuilt due to column type change")
+                return True
+
+            added = [col for col in column_types if col not in live_columns]
+            removed = [col for col in live_columns if col not in column_types]
+
+            for column_name in added:
+                self.db_client.execute_query(
+                    f"ALTER TABLE {table_name} ADD COLUMN `{column_name}` {column_types[column_name]}"
+                )
+            for column_name in removed:
+                self.db_client.execute_query(f"ALTER TABLE {table_name} DROP COLUMN `{column_name}`")
+
+            if added or removed:
+                logger.info(
+                    f"Table {table_name} altered",
+                    extra={"context": {"added_columns": added, "dropped_columns": removed}}
+                )
+            else:
+                logger.info(f"Table {table_name} schema is up to date")
+
+            return False
+
+        except Exception as e:
+            logger.error(f"Failed to ensure table {table_name}: {e}")
+            raise SchemaCreationError(f"Failed to ensure table {table_name}: {e}")
 
-            for column_name, sql_type in column_types.items():
-                # カラム名をバッククォートで囲む
-                quoted_name = f"`{column_name}`"
+    def get_live_columns(self, table_name: str) -> Dict[str, Tuple[str, bool]]:
+        """
+        データベース上の現在のカラム定義を取得
 
-                if column_name == 'ID':
-                    columns_def.append(f"{quoted_name} {sql_type} PRIMARY KEY")
-                else:
-                    columns_def.append(f"{quoted_name} {sql_type}")
+        Args:
+            table_name: テーブル名
 
-            # 既存のテーブルを削除して再作成（スキーマ変更を反映）
-            drop_table_sql = f"DROP TABLE IF EXISTS {table_name}"
-            self.db_client.execute_query(drop_table_sql)
-            logger.info(f"Dropped existing table {table_name} if it existed")
+        Returns:
+            {"column_name": ("SQL_TYPE", is_primary_key)}（テーブルが存在しない場合は空）
+        """
+        rows = self.db_client.query_rows(f"PRAGMA table_info({table_name})")
+        # PRAGMA table_info: cid, name, type, notnull, dflt_value, pk
+        return {row[1]: (str(row[2]).upper(), bool(row[5])) for row in rows}
+
+    def build_create_table_sql(self, table_name: str, column_types: Dict[str, str]) -> str:
+        """
+        CREATE TABLE文を構築
 
-            create_table_sql = f"""
-            CREATE TABLE {table_name} (
+        Args:
+            table_name: テーブル名
+            column_types: {"column_name": "SQL_TYPE"}
+
+        Returns:
+            CREATE TABLE文
+        """
+        columns_def = []
+
+        for column_name, sql_type in column_types.items():
+            # カラム名をバッククォートで囲む
+            quoted_name = f"`{column_name}`"
+
+            if column_name == 'ID':
+                columns_def.append(f"{quoted_name} {sql_type} PRIMARY KEY")
+            else:
+                columns_def.append(f"{quoted_name} {sql_type}")
+
+        return f"""
+            CREATE TABLE IF NOT EXISTS {table_name} (
                 {', '.join(columns_def)}
             )
             """
 
-            self.db_client.execute_query(create_table_sql)
-
-            logger.info(f"Table {table_name} created successfully")
-
-        except Exception as e:
-            logger.error(f"Failed to ensure table {table_name}: {e}")
-            raise SchemaCreationError(f"Failed to ensure table {table_name}: {e}")
+    def _create_table(self, table_name: str, column_types: Dict[str, str]) -> None:
+        """テーブルを作成"""
+        self.db_client.execute_query(self.build_create_table_sql(table_name, column_types))
+
+    def _requires_rebuild(
+        self,
+        column_types: Dict[str, str],
+        live_columns: Dict[str, Tuple[str, bool]]
+    ) -> bool:
+        """既存カラムの型・主キー変更（ALTER TABLEで対応できない変更）があるか判定"""
+        for column_name, (live_type, live_pk) in live_columns.items():
+            if column_name in column_types:
+                if live_type != column_types[column_name].upper():
+                    return True
+                if live_pk != (column_name == 'ID'):
+                    return True
+            elif live_pk:
+                # 主キー列は削除できない
+                return True
+
+        # 主キー列はADD COLUMNで追加できない
+        return 'ID' in column_types and 'ID' not in live_columns
 
     def infer_column_types(self, df: pd.DataFrame) -> Dict[str, str]:
         """
@@ -79,8 +162,12 @@ class SchemaManager:
         type_mapping = {
             'int64': 'INTEGER',
             'int32': 'INTEGER',
+            'int16': 'INTEGER',  # MemoryOptimizerで縮小した整数
+            'int8': 'INTEGER',
             'Int64': 'INTEGER',  # pandas nullable integer
             'Int32': 'INTEGER',  # pandas nullable integer
+            'Int16': 'INTEGER',
+            'Int8': 'INTEGER',
             'float64': 'REAL',
             'float32': 'REAL',
             'object': 'TEXT',
@@ -95,7 +182,11 @@ class SchemaManager:
                 column_types[column] = 'INTEGER'
                 continue
 
-            dtype_str = str(df[column].dtype)
+            dtype = df[column].dtype
+            # categoryはカテゴリ値のdtypeで判定
+            if isinstance(dtype, pd.CategoricalDtype):
+                dtype = dtype.categories.dtype
+            dtype_str = str(dtype)
             sql_type = type_mapping.get(dtype_str, 'TEXT')
             column_types[column] = sql_type
 
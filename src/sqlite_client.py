@@ -0,0 +1,312 @@
+"""SQLiteClientモジュール - ローカルSQLiteデータベース接続"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from itertools import groupby
+from typing import Any, Dict, Iterator, List, Optional
+
+import metrics
+from batch_sizer import AdaptiveBatchSizer
+from constants import DEFAULT_SQLITE_DATABASE_PATH
+from db_client import DatabaseConnectionError, DatabaseTransactionError
+from logger import get_logger
+from storage_backend import BatchCallback, CancelCheck, Statement
+
+logger = get_logger(__name__)
+
+
+class SQLiteClient:
+    """
+    ローカルSQLiteクライアント（sqlite3モジュール経由、StorageBackendの実装）
+
+    - WALモードで開き、同期中も読み取り側（配信用のミラー等）をブロックしない
+    - 1回の呼び出しのステートメントは単一のトランザクション内で実行し、失敗時はロールバックする
+    - 同じSQLが続く引数付きステートメント（parameterized / multirow）はexecutemanyでまとめて実行する
+
+    ネットワークを経由しないため、バッチ分割・並行送信（batch_size、batch_sizer、independent）は
+    使用せず、全ステートメントを1バッチとして扱う
+    """
+
+    def __init__(self, database_path: Optional[str] = None, timeout: float = 30.0):
+        """
+        Args:
+            database_path: データベースファイルのパス（省略時はSQLITE_DATABASE_PATH環境変数）
+            timeout: 他の接続の書き込みロック解放を待つ秒数
+        """
+        self.database_path = database_path or os.getenv("SQLITE_DATABASE_PATH", DEFAULT_SQLITE_DATABASE_PATH)
+        # ":memory:"・URI形式以外は作業ディレクトリに依らない絶対パスで識別する
+        if self.database_path.startswith((":memory:", "file:")):
+            self.target = f"sqlite:{self.database_path}"
+        else:
+            self.target = f"sqlite:{os.path.abspath(self.database_path)}"
+        self.timeout = timeout
+        self.connection: Optional[sqlite3.Connection] = None
+        # テーブルの並行同期・ストリーミングの各スレッドから同じ接続を使うため直列化する
+        self._lock = threading.RLock()
+
+    def close(self) -> None:
+        """接続を閉じる"""
+        with self._lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def connect(self) -> None:
+        """
+        SQLiteデータベースを開き、WALモードに設定
+
+        Raises:
+            DatabaseConnectionError: 接続失敗時
+        """
+        try:
+            logger.info(f"Connecting to SQLite database: {self.database_path}")
+
+            with self._lock:
+                if self.connection is None:
+                    # 自動コミットで開き、トランザクションはBEGIN/COMMITで明示的に制御する
+                    self.connection = sqlite3.connect(
+                        self.database_path,
+                        timeout=self.timeout,
+                        isolation_level=None,
+                        check_same_thread=False
+                    )
+                journal_mode = self.connection.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+                # WALではNORMALでもコミット済みデータの整合性は保たれる
+                self.connection.execute("PRAGMA synchronous=NORMAL")
+
+            logger.info(
+                "Successfully connected to SQLite database",
+                extra={"context": {"path": self.database_path, "journal_mode": journal_mode}}
+            )
+
+        except sqlite3.Error as e:
+            logger.error(f"Failed to connect to SQLite: {e}")
+            raise DatabaseConnectionError(f"Failed to connect to SQLite: {e}")
+
+    def execute_transaction(
+        self,
+        delete_query: str,
+        insert_statements: List[Statement],
+        batch_size: int = 50,
+        batch_sizer: Optional[AdaptiveBatchSizer] = None,
+        on_batch_committed: Optional[BatchCallback] = None,
+        check_cancelled: Optional[CancelCheck] = None
+    ) -> Dict[str, Any]:
+        """
+        単一トランザクション内で削除と一括挿入を実行
+
+        Args:
+            delete_query: DELETE文（例: "DELETE FROM songs"）
+            insert_statements: INSERT文のリスト（SQL文字列、または{"q": SQL, "params": [...]}形式）
+            batch_size: 未使用（DatabaseClientとの互換のため）
+            batch_sizer: 未使用（DatabaseClientとの互換のため）
+            on_batch_committed: コミット後に全INSERT文を1バッチとして呼ばれる
+            check_cancelled: トランザクションの開始前に1回だけ呼ばれる
+
+        Returns:
+            {"deleted": N, "inserted": M, "batch_sizes": [挿入したステートメント数]}
+
+        Raises:
+            DatabaseTransactionError: トランザクション失敗時（変更はロールバックされる）
+        """
+        try:
+            logger.info(
+                "Executing transaction",
+                extra={
+                    "context": {
+                        "delete_query": delete_query,
+                        "insert_count": len(insert_statements)
+                    }
+                }
+            )
+
+            if check_cancelled:
+                check_cancelled()
+            with self._transaction() as connection:
+                deleted_count = connection.execute(delete_query).rowcount
+                inserted_count = self._execute_all(connection, insert_statements)
+            if on_batch_committed and insert_statements:
+                on_batch_committed(0, len(insert_statements), inserted_count)
+
+            logger.info(
+                "Transaction completed successfully",
+                extra={
+                    "context": {
+                        "deleted": deleted_count,
+                        "inserted": inserted_count
+                    }
+                }
+            )
+
+            return {
+                "deleted": deleted_count,
+                "inserted": inserted_count,
+                "batch_sizes": [len(insert_statements)] if insert_statements else []
+            }
+
+        except sqlite3.Error as e:
+            logger.error(
+                "Transaction failed",
+                extra={"context": {"error": str(e)}}
+            )
+            raise DatabaseTransactionError(f"Transaction failed: {e}")
+
+    def execute_statements(
+        self,
+        statements: List[Statement],
+        batch_size: int = 50,
+        batch_sizer: Optional[AdaptiveBatchSizer] = None,
+        independent: bool = False,
+        on_batch_committed: Optional[BatchCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        ステートメント列を単一トランザクション内で順番に実行
+
+        Args:
+            statements: SQL文字列、または{"q": SQL, "params": [...]}形式のリスト
+            batch_size: 未使用（DatabaseClientとの互換のため）
+            batch_sizer: 未使用（DatabaseClientとの互換のため）
+            independent: 未使用（DatabaseClientとの互換のため）
+            on_batch_committed: コミット後に全ステートメントを1バッチとして呼ばれる
+
+        Returns:
+            {"rows_written": N, "batch_sizes": [ステートメント数]}
+
+        Raises:
+            DatabaseTransactionError: 実行失敗時（変更はロールバックされる）
+        """
+        try:
+            with self._transaction() as connection:
+                rows_written = self._execute_all(connection, statements)
+            if on_batch_committed and statements:
+                on_batch_committed(0, len(statements), rows_written)
+            return {"rows_written": rows_written, "batch_sizes": [len(statements)] if statements else []}
+
+        except sqlite3.Error as e:
+            logger.error(
+                "Statement execution failed",
+                extra={"context": {"error": str(e)}}
+            )
+            raise DatabaseTransactionError(f"Statement execution failed: {e}")
+
+    def swap_table(self, table_name: str, staging_table: str) -> int:
+        """
+        ステージングテーブルを本番テーブルと入れ替え
+
+        存在確認・行数取得・RENAME・DROPを単一トランザクション内で実行する
+
+        Args:
+            table_name: 本番テーブル名
+            staging_table: ロード済みのステージングテーブル名
+
+        Returns:
+            入れ替え前の本番テーブルの行数（存在しなかった場合は0）
+
+        Raises:
+            DatabaseTransactionError: 入れ替え失敗時
+        """
+        old_table = f"{table_name}__old"
+
+        try:
+            with self._transaction() as connection:
+                exists = connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+                    [table_name]
+                ).fetchall()
+                replaced_rows = connection.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0] if exists else 0
+
+                logger.info(
+                    "Swapping staging table",
+                    extra={"context": {"table": table_name, "staging_table": staging_table, "replaced_rows": replaced_rows}}
+                )
+
+                connection.execute(f"DROP TABLE IF EXISTS {old_table}")
+                if exists:
+                    connection.execute(f"ALTER TABLE {table_name} RENAME TO {old_table}")
+                connection.execute(f"ALTER TABLE {staging_table} RENAME TO {table_name}")
+                connection.execute(f"DROP TABLE IF EXISTS {old_table}")
+
+            return replaced_rows
+
+        except sqlite3.Error as e:
+            logger.error(f"Table swap failed: {e}")
+            raise DatabaseTransactionError(f"Table swap failed: {e}")
+
+    def query_rows(self, query: str, params: Optional[List[Any]] = None) -> List[List[Any]]:
+        """
+        SELECT等のクエリを実行して結果行を返す
+
+        Args:
+            query: SQL文
+            params: 位置パラメータ
+
+        Returns:
+            結果行のリスト（各行はカラム値のリスト）
+
+        Raises:
+            DatabaseTransactionError: クエリ失敗時
+        """
+        try:
+            with self._lock:
+                rows = self._get_connection().execute(query, params or []).fetchall()
+            return [list(row) for row in rows]
+        except sqlite3.Error as e:
+            logger.error(f"Query failed: {e}")
+            raise DatabaseTransactionError(f"Query failed: {e}")
+
+    def execute_query(self, query: str, params: Optional[List[Any]] = None) -> List[List[Any]]:
+        """
+        単一クエリを実行
+
+        Args:
+            query: SQL文
+            params: 位置パラメータ
+
+        Returns:
+            結果行のリスト（DDL・DMLの場合は空）
+        """
+        return self.query_rows(query, params)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """書き込みトランザクション（例外時はロールバック）"""
+        with self._lock:
+            connection = self._get_connection()
+            with metrics.UPLOAD_BATCH_DURATION.time():
+                # 開始時に書き込みロックを取得し、途中でのロック競合（SQLITE_BUSY）を避ける
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    yield connection
+                except BaseException:
+                    if connection.in_transaction:
+                        connection.execute("ROLLBACK")
+                    raise
+                connection.execute("COMMIT")
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """接続を返す（未接続の場合は接続する）"""
+        if self.connection is None:
+            self.connect()
+        return self.connection
+
+    def _execute_all(self, connection: sqlite3.Connection, statements: List[Statement]) -> int:
+        """
+        ステートメント列を実行し、変更行数の合計を返す
+
+        同じSQLが連続する引数付きステートメントはexecutemanyで1回にまとめる
+        """
+        changes_before = connection.total_changes
+        for query, group in groupby(statements, key=self._executemany_key):
+            if query is None:
+                for statement in group:
+                    connection.execute(statement)
+            else:
+                connection.executemany(query, (statement.get("params") or [] for statement in group))
+        return connection.total_changes - changes_before
+
+    @staticmethod
+    def _executemany_key(statement: Statement) -> Optional[str]:
+        """引数付きステートメントはSQL、SQL文字列はNone（1文ずつ実行）"""
+        return statement["q"] if isinstance(statement, dict) else None
@@ -0,0 +1,246 @@
+"""StatementBuilderモジュール - INSERT文の構築"""
+
+import math
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from constants import (
+    SQLITE_MAX_VARIABLE_NUMBER,
+    SQLITE_MAX_SQL_LENGTH,
+    MULTIROW_MAX_ROWS_PER_STATEMENT,
+)
+from memory_optimizer import widen_dtypes
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class StatementBuilder:
+    """DataFrameからTurso HTTP API用のステートメントを構築するサービス"""
+
+    def quote_columns(self, columns: List[str]) -> str:
+        """カラム名をバッククォートで囲んでカンマ区切りで結合"""
+        return ', '.join(f'`{col}`' for col in columns)
+
+    def build_literal_statements(self, table_name: str, df: pd.DataFrame) -> List[str]:
+        """
+        値をSQLリテラルとして埋め込んだINSERT文のリストを構築
+
+        各カラムを1回ずつリテラル文字列に変換してから行ごとに結合する。
+        iterrowsでセルごとに整形していた従来の実装と同一の文字列を生成するため、
+        セルの型は従来と同じくDataFrame.valuesの共通dtypeから決まる
+        （例: 全カラムが整数ならnumpy整数となり、クォートされる）。
+        MemoryOptimizerで縮小したカラムは元の幅に戻してから変換するため、出力は縮小前と同一
+
+        Args:
+            table_name: テーブル名
+            df: 挿入するDataFrame
+
+        Returns:
+            ["INSERT INTO ... VALUES (1, 'a', NULL)", ...]
+        """
+        if len(df) == 0:
+            return []
+
+        prefix = f"INSERT INTO {table_name} ({self.quote_columns(list(df.columns))}) VALUES ("
+        if len(df.columns) == 0:
+            return [prefix + ")"] * len(df)
+
+        values = widen_dtypes(df).values
+        literal_columns = [self._column_to_literals(values[:, i]) for i in range(values.shape[1])]
+        statements = [prefix + ', '.join(row) + ')' for row in zip(*literal_columns)]
+
+        logger.debug(f"Built {len(statements)} literal statements for {table_name}")
+
+        return statements
+
+    def build_parameterized_statements(self, table_name: str, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        パラメータ化INSERT文のリストを構築
+
+        カラムリストとプレースホルダーSQLはテーブルごとに1回だけ構築し、
+        各行は型付きの引数配列として送信する
+
+        Args:
+            table_name: テーブル名
+            df: 挿入するDataFrame
+
+        Returns:
+            [{"q": "INSERT INTO ... VALUES (?, ...)", "params": [...]}, ...]
+        """
+        columns = list(df.columns)
+        placeholders = ', '.join(['?'] * len(columns))
+        query = f"INSERT INTO {table_name} ({self.quote_columns(columns)}) VALUES ({placeholders})"
+
+        statements = [{"q": query, "params": params} for params in self.to_param_rows(df)]
+
+        logger.debug(f"Built {len(statements)} parameterized statements for {table_name}")
+
+        return statements
+
+    def build_multirow_statements(
+        self,
+        table_name: str,
+        df: pd.DataFrame,
+        column_count: int
+    ) -> List[Dict[str, Any]]:
+        """
+        複数行をまとめた INSERT ... VALUES (...),(...),... 文のリストを構築
+
+        1文あたりの行数はSQLiteのホストパラメータ数上限とSQL長上限から自動計算する
+
+        Args:
+            table_name: テーブル名
+            df: 挿入するDataFrame
+            column_count: カラム数（SchemaManager.infer_column_typesの結果から取得）
+
+        Returns:
+            [{"q": "INSERT INTO ... VALUES (?, ...), (?, ...)", "params": [...]}, ...]
+        """
+        prefix = f"INSERT INTO {table_name} ({self.quote_columns(list(df.columns))}) VALUES "
+        row_placeholder = f"({', '.join(['?'] * column_count)})"
+        rows_per_statement = self.compute_rows_per_statement(
+            column_count, len(prefix.encode('utf-8')), len(row_placeholder)
+        )
+
+        param_rows = self.to_param_rows(df)
+        statements = []
+        queries: Dict[int, str] = {}
+
+        for start in range(0, len(param_rows), rows_per_statement):
+            chunk = param_rows[start:start + rows_per_statement]
+            # 同じ行数の文はSQLを使い回す（最後の端数の文のみ別SQL）
+            if len(chunk) not in queries:
+                queries[len(chunk)] = prefix + ', '.join([row_placeholder] * len(chunk))
+
+            params = [value for row in chunk for value in row]
+            statements.append({"q": queries[len(chunk)], "params": params})
+
+        logger.debug(
+            f"Built {len(statements)} multi-row statements for {table_name}",
+            extra={"context": {"rows_per_statement": rows_per_statement, "rows": len(param_rows)}}
+        )
+
+        return statements
+
+    def compute_rows_per_statement(
+        self,
+        column_count: int,
+        prefix_length: int = 0,
+        row_length: int = 0
+    ) -> int:
+        """
+        SQLiteの上限内に収まる1文あたりの行数を計算
+
+        Args:
+            column_count: カラム数
+            prefix_length: "INSERT INTO ... VALUES " 部分の長さ（バイト）
+            row_length: 1行分のプレースホルダー "(?, ?, ...)" の長さ
+
+        Returns:
+            1文あたりの行数（最低1）
+        """
+        if column_count <= 0:
+            return 1
+
+        by_params = SQLITE_MAX_VARIABLE_NUMBER // column_count
+        # 行間の区切り ", " の2バイトを加算
+        by_length = (SQLITE_MAX_SQL_LENGTH - prefix_length) // (row_length + 2) if row_length else by_params
+
+        return max(1, min(by_params, by_length, MULTIROW_MAX_ROWS_PER_STATEMENT))
+
+    def to_param_rows(self, df: pd.DataFrame) -> List[List[Any]]:
+        """
+        DataFrameをJSONシリアライズ可能な行ごとの引数配列に変換
+
+        カラム単位で1回だけ変換を行い、NaN/inf/NAはNone、
+        NumPyスカラーはPythonのint/floatに変換する
+
+        Args:
+            df: 変換するDataFrame
+
+        Returns:
+            行ごとの引数リスト
+        """
+        if len(df.columns) == 0:
+            return [[] for _ in range(len(df))]
+
+        df = widen_dtypes(df)
+        column_values = [self._column_to_params(df[col]) for col in df.columns]
+        return [list(row) for row in zip(*column_values)]
+
+    def _column_to_params(self, series: pd.Series) -> List[Any]:
+        """単一カラムを引数値のリストに変換"""
+        if pd.api.types.is_bool_dtype(series.dtype) and not series.hasnans:
+            return [int(v) for v in series.to_numpy()]
+
+        if pd.api.types.is_integer_dtype(series.dtype):
+            # Int64等のnullable整数はNAを含む可能性がある
+            values = series.astype(object).to_numpy()
+            mask = series.isna().to_numpy()
+            return [None if is_na else int(v) for v, is_na in zip(values, mask)]
+
+        if pd.api.types.is_float_dtype(series.dtype):
+            values = series.to_numpy(dtype='float64', na_value=np.nan)
+            mask = ~np.isfinite(values)
+            return [None if is_invalid else v for v, is_invalid in zip(values.tolist(), mask)]
+
+        return [self._to_param_value(v) for v in series.astype(object).to_numpy()]
+
+    def _column_to_literals(self, values: np.ndarray) -> List[str]:
+        """DataFrame.valuesの1カラム分をSQLリテラル文字列のリストに変換"""
+        if values.dtype == np.float64:
+            finite = np.isfinite(values).tolist()
+            return [str(v) if ok else 'NULL' for v, ok in zip(values.tolist(), finite)]
+
+        if values.dtype.kind in 'iub':
+            # numpy整数・真偽値はint/floatのインスタンスではないため文字列として扱われる
+            return ["'" + v + "'" for v in map(str, values.tolist())]
+
+        if values.dtype.kind == 'O':
+            literals = np.full(len(values), 'NULL', dtype=object)
+            present = ~pd.isna(values)
+            items = values[present]
+
+            is_str = np.fromiter((type(v) is str for v in items), dtype=bool, count=len(items))
+            converted = np.empty(len(items), dtype=object)
+            if is_str.any():
+                escaped = pd.Series(items[is_str], dtype=object).str.replace("'", "''", regex=False)
+                converted[is_str] = ("'" + escaped + "'").to_numpy(dtype=object)
+            if not is_str.all():
+                converted[~is_str] = [self._to_literal(v) for v in items[~is_str]]
+
+            literals[present] = converted
+            return literals.tolist()
+
+        # datetime64等はSeries経由でTimestampに変換（iterrowsと同じボックス化）
+        cells = pd.Series(values) if values.dtype.kind in 'Mm' else values
+        return [self._to_literal(v) for v in cells]
+
+    def _to_literal(self, val: Any) -> str:
+        """単一値をSQLリテラル文字列に変換"""
+        if pd.isna(val) or (isinstance(val, float) and math.isnan(val)):
+            return 'NULL'
+        if isinstance(val, (int, float)):
+            # floatの場合、inf/-inf/nanをNULLに変換
+            if math.isinf(val) or math.isnan(val):
+                return 'NULL'
+            return str(val)
+        # 文字列値をシングルクォートでエスケープ
+        escaped_val = str(val).replace("'", "''")
+        return f"'{escaped_val}'"
+
+    def _to_param_value(self, val: Any) -> Any:
+        """単一値を引数値に変換"""
+        if val is None or (not isinstance(val, str) and pd.isna(val)):
+            return None
+        if isinstance(val, (bool, np.bool_)):
+            return int(val)
+        if isinstance(val, (int, np.integer)):
+            return int(val)
+        if isinstance(val, (float, np.floating)):
+            val = float(val)
+            return None if math.isinf(val) else val
+        return str(val)
@@ -0,0 +1,114 @@
+"""StorageBackendモジュール - 同期先データベースの共通インターフェース"""
+
+import hashlib
+import os
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Protocol, Union
+
+from constants import STORAGE_BACKENDS
+
+if TYPE_CHECKING:
+    from batch_sizer import AdaptiveBatchSizer
+
+# ステートメント: SQL文字列、または{"q": SQL, "params": [...]}形式
+Statement = Union[str, Dict[str, Any]]
+
+# バッチのコミット通知: (開始位置, 終了位置, 書き込み行数)。statements[開始位置:終了位置]がコミット済み
+BatchCallback = Callable[[int, int, int], None]
+
+# 中断の確認: 中断が要求されていれば例外を送出する（アップロードの各リクエストの送信前に呼ばれる）
+CancelCheck = Callable[[], None]
+
+
+class StorageBackend(Protocol):
+    """
+    同期先データベースのインターフェース
+
+    SchemaManager・DeltaSynchronizer・SyncOrchestrator・StreamingPipelineはこのメソッドのみを使用する。
+    実装: DatabaseClient（Turso HTTP API）、SQLiteClient（ローカルのSQLiteファイル）
+    """
+
+    # 同期先の識別子（バックエンド名とURL・パス。例: "turso:https://db.example.turso.io"）
+    target: str
+
+    def connect(self) -> None:
+        """接続を確立（失敗時はDatabaseConnectionError）"""
+        ...
+
+    def close(self) -> None:
+        """接続を解放"""
+        ...
+
+    def execute_query(self, query: str, params: Optional[List[Any]] = None) -> Any:
+        """単一クエリ（DDL等）を実行（戻り値は実装依存）"""
+        ...
+
+    def query_rows(self, query: str, params: Optional[List[Any]] = None) -> List[List[Any]]:
+        """SELECT・PRAGMA table_info等のクエリ結果行を返す（スキーマの取得にも使用）"""
+        ...
+
+    def execute_statements(
+        self,
+        statements: List[Statement],
+        batch_size: int = 50,
+        batch_sizer: Optional["AdaptiveBatchSizer"] = None,
+        independent: bool = False,
+        on_batch_committed: Optional[BatchCallback] = None
+    ) -> Dict[str, Any]:
+        """ステートメント列を順番に実行し、{"rows_written": N, "batch_sizes": [...]}を返す"""
+        ...
+
+    def execute_transaction(
+        self,
+        delete_query: str,
+        insert_statements: List[Statement],
+        batch_size: int = 50,
+        batch_sizer: Optional["AdaptiveBatchSizer"] = None,
+        on_batch_committed: Optional[BatchCallback] = None,
+        check_cancelled: Optional[CancelCheck] = None
+    ) -> Dict[str, Any]:
+        """
+        全件削除と一括挿入を実行し、{"deleted": N, "inserted": M, "batch_sizes": [...]}を返す
+
+        on_batch_committedはINSERTバッチのコミットが確定するたびに先頭から順に呼ばれる。
+        check_cancelledは各リクエストの送信前に呼ばれ、例外を送出した場合は未コミットの変更を
+        ロールバックして中断する
+        """
+        ...
+
+    def swap_table(self, table_name: str, staging_table: str) -> int:
+        """ステージングテーブルを本番テーブルとアトミックに入れ替え、入れ替え前の行数を返す"""
+        ...
+
+
+def target_key(target: str) -> str:
+    """同期先の識別子から状態ファイル名に使う短いキーを生成（同期先ごとに状態を分けるため）"""
+    return hashlib.sha256(target.encode("utf-8")).hexdigest()[:16]
+
+
+def create_storage_backend(
+    backend: Optional[str] = None,
+    max_in_flight: int = 1,
+    transaction_mode: str = "batched"
+) -> StorageBackend:
+    """
+    STORAGE_BACKEND環境変数（省略時はturso）に応じた同期先クライアントを生成
+
+    Args:
+        backend: turso または sqlite（省略時は環境変数）
+        max_in_flight: Tursoで同時に送信するバッチ数
+        transaction_mode: Tursoでの全件DELETE → 全件INSERTの送信方式（SQLiteは常に単一トランザクション）
+
+    Raises:
+        ValueError: 不明なバックエンド、または必要な環境変数がない場合
+    """
+    backend = backend or os.getenv("STORAGE_BACKEND", "turso")
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Invalid STORAGE_BACKEND: {backend}")
+
+    # 使用しないバックエンドの依存は読み込まない
+    if backend == "sqlite":
+        from sqlite_client import SQLiteClient
+        return SQLiteClient()
+
+    from db_client import DatabaseClient
+    return DatabaseClient(max_in_flight=max_in_flight, transaction_mode=transaction_mode)
@@ -1,5 +1,6 @@
 """DataTransformerモジュール - データ変換"""
 
+import numpy as np
 import pandas as pd
 
 from logger import get_logger
@@ -10,54 +11,67 @@ logger = get_logger(__name__)
 class DataTransformer:
     """データ変換サービス"""
 
-    def transform_for_database(self, df: pd.DataFrame, table_name: str = None) -> pd.DataFrame:
+    def transform_for_database(
+        self,
+        df: pd.DataFrame,
+        table_name: str = None,
+        copy: bool = True
+    ) -> pd.DataFrame:
         """
         SpreadsheetのDataFrameをデータベース挿入用に変換
 
         Args:
             df: 元のDataFrame
+            table_name: テーブル名（songsの場合はノーツ数カラムのnullを0で補完）
+            copy: Falseの場合はdfを直接書き換える（呼び出し側がdfを以後使わない場合にコピーを省略）
 
         Returns:
-            変換後のDataFrame
+            変換後のDataFrame（copy=Falseの場合はdf自身）
         """
-        df_copy = df.copy()
+        if copy:
+            df = df.copy()
 
         # Unnamed列（空のヘッダー）を削除
-        unnamed_cols = [col for col in df_copy.columns if str(col).startswith('Unnamed:')]
+        unnamed_cols = [col for col in df.columns if str(col).startswith('Unnamed:')]
         if unnamed_cols:
             logger.info(f"Dropping unnamed columns: {unnamed_cols}")
-            df_copy = df_copy.drop(columns=unnamed_cols)
+            df.drop(columns=unnamed_cols, inplace=True)
 
         # カラム名を正規化（文字エンコーディング問題を回避）
-        df_copy.columns = [str(col).strip() for col in df_copy.columns]
+        df.columns = [str(col).strip() for col in df.columns]
 
-        # 空文字列をNaNに変換
-        df_copy = df_copy.replace('', pd.NA)
+        # 空文字列をNaNに変換（空文字列を含みうる文字列・object型のカラムのみ）
+        for column in df.columns:
+            series = df[column]
+            if not (pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)):
+                continue
+            if series.eq('').any():
+                df[column] = series.replace('', pd.NA)
 
         # songsテーブルの場合、Shout/Beat/Melodyノーツ数カラムのnullを0に置き換え
         if table_name == 'songs':
             # カラム名が "カテゴリー_Shout×1白" のような形式になるため、contains + endsで判定
-            notes_columns = [col for col in df_copy.columns if
+            notes_columns = [col for col in df.columns if
                            ('Shout' in col or 'Beat' in col or 'Melody' in col)
                            and (col.endswith('白') or col.endswith('色'))]
 
             for col in notes_columns:
-                if col in df_copy.columns:
-                    df_copy[col] = df_copy[col].fillna(0)
+                if col in df.columns:
+                    df[col] = df[col].fillna(0)
                     logger.debug(f"Filled null values with 0 in column: {col}")
 
-        # データ型の最適化
-        for column in df_copy.columns:
-            # 数値型の最適化
-            if df_copy[column].dtype in ['int64', 'float64']:
-                try:
-                    if df_copy[column].dtype == 'float64':
-                        # 整数に変換できる場合は変換
-                        if df_copy[column].dropna().apply(lambda x: x.is_integer()).all():
-                            df_copy[column] = df_copy[column].astype('Int64')
-                except Exception:
-                    pass
-
-        logger.debug(f"Transformed DataFrame with {len(df_copy)} rows and columns: {list(df_copy.columns)}")
-
-        return df_copy
+        # データ型の最適化: 整数値のみのfloat64カラムはnullable整数に変換
+        for column in df.columns:
+            if df[column].dtype == 'float64' and self._is_integral(df[column].to_numpy()):
+                df[column] = df[column].astype('Int64')
+
+        logger.debug(f"Transformed DataFrame with {len(df)} rows and columns: {list(df.columns)}")
+
+        return df
+
+    def _is_integral(self, values: np.ndarray) -> bool:
+        """NaN以外の値がすべてint64の範囲内の整数値か（全てNaNの場合もTrue）"""
+        present = values[~np.isnan(values)]
+        # inf・int64範囲外の値はInt64に変換できないためfloatのまま残す
+        in_range = (present >= -2.0 ** 63) & (present < 2.0 ** 63)
+        return bool(in_range.all() and (np.trunc(present) == present).all())
@@ -1,13 +1,24 @@
 """DataValidatorモジュール - データ検証"""
 
-from typing import List, Tuple
+from typing import Callable, List, NamedTuple, Optional, Tuple
+import numpy as np
 import pandas as pd
 
+import metrics
 from logger import get_logger
 
 logger = get_logger(__name__)
 
 
+class ValidationRule(NamedTuple):
+    """カラム単位で評価済みの検証ルール"""
+    name: str
+    # 行ごとの違反フラグ（Trueが違反）
+    mask: np.ndarray
+    # (行ラベル, 行位置) からエラーメッセージを生成
+    message: Callable[[object, int], str]
+
+
 class DataValidator:
     """データ検証サービス"""
 
@@ -23,41 +34,28 @@ class DataValidator:
         Returns:
             (有効なDataFrame, エラーメッセージリスト)
         """
-        errors = []
-        valid_indices = []
-
-        for idx, row in df.iterrows():
-            row_errors = []
-
-            # 必須フィールドチェック: ID、分類、アーティスト名
-            if pd.isna(row.get('ID')):
-                row_errors.append(f"Row {idx}: Missing ID")
-
-            # 分類とアーティスト名が両方とも存在することを確認
-            if pd.isna(row.get('分類')) or str(row.get('分類')).strip() == '':
-                row_errors.append(f"Row {idx}: Missing 分類")
-
-            if pd.isna(row.get('アーティスト名')) or str(row.get('アーティスト名')).strip() == '':
-                row_errors.append(f"Row {idx}: Missing アーティスト名")
-
-            # 数値フィールドチェック（存在する場合のみ）
-            numeric_fields = ['ノーツ数', '秒数']
-            for field in numeric_fields:
-                if field in row and not pd.isna(row[field]):
-                    try:
-                        float(row[field])
-                    except (ValueError, TypeError):
-                        row_errors.append(f"Row {idx}: Invalid numeric value in {field}")
-
-            if row_errors:
-                errors.extend(row_errors)
-                # デバッグ用に最初の10件のみログ出力
-                if len(errors) <= 30:
-                    logger.warning(f"Validation error in songs data: {row_errors}")
-            else:
-                valid_indices.append(idx)
-
-        return df.loc[valid_indices], errors
+        # 必須フィールドチェック: ID、分類、アーティスト名
+        rules = [
+            ValidationRule('missing_id', self._missing_mask(df, 'ID'),
+                           lambda idx, pos: f"Row {idx}: Missing ID"),
+            ValidationRule('missing_category', self._blank_mask(df, '分類'),
+                           lambda idx, pos: f"Row {idx}: Missing 分類"),
+            ValidationRule('missing_artist', self._blank_mask(df, 'アーティスト名'),
+                           lambda idx, pos: f"Row {idx}: Missing アーティスト名"),
+        ]
+
+        # 数値フィールドチェック（存在する場合のみ）
+        numeric_fields = ['ノーツ数', '秒数']
+        for field in numeric_fields:
+            if field in df.columns:
+                rules.append(ValidationRule(
+                    f'invalid_numeric:{field}',
+                    self._invalid_numeric_mask(df[field]),
+                    lambda idx, pos, field=field: f"Row {idx}: Invalid numeric value in {field}"
+                ))
+
+        # デバッグ用に最初の30件のみログ出力
+        return self._apply_rules(df, rules, 'songs', log_limit=30)
 
     def validate_cards_data(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
         """
@@ -69,30 +67,25 @@ class DataValidator:
         Returns:
             (有効なDataFrame, エラーメッセージリスト)
         """
-        errors = []
-        valid_indices = []
-
-        for idx, row in df.iterrows():
-            row_errors = []
-
-            # ID・cardIDフィールドチェック
-            if pd.isna(row.get('ID')):
-                row_errors.append(f"Row {idx}: Missing ID")
-            if pd.isna(row.get('cardID')):
-                row_errors.append(f"Row {idx}: Missing cardID")
-
-            # rarityチェック
-            if 'rarity' in row and not pd.isna(row['rarity']):
-                if row['rarity'] not in self.VALID_RARITIES:
-                    row_errors.append(f"Row {idx}: Invalid rarity {row['rarity']}")
-
-            if row_errors:
-                errors.extend(row_errors)
-                logger.warning(f"Validation error in cards data: {row_errors}")
-            else:
-                valid_indices.append(idx)
-
-        return df.loc[valid_indices], errors
+        # ID・cardIDフィールドチェック
+        rules = [
+            ValidationRule('missing_id', self._missing_mask(df, 'ID'),
+                           lambda idx, pos: f"Row {idx}: Missing ID"),
+            ValidationRule('missing_card_id', self._missing_mask(df, 'cardID'),
+                           lambda idx, pos: f"Row {idx}: Missing cardID"),
+        ]
+
+        # rarityチェック
+        if 'rarity' in df.columns:
+            rarity = df['rarity']
+            invalid = (rarity.notna() & ~rarity.isin(self.VALID_RARITIES)).to_numpy(dtype=bool)
+            rules.append(ValidationRule(
+                'invalid_rarity',
+                invalid,
+                lambda idx, pos: f"Row {idx}: Invalid rarity {rarity.iloc[pos]}"
+            ))
+
+        return self._apply_rules(df, rules, 'cards')
 
     def validate_brooches_data(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
         """
@@ -104,33 +97,102 @@ class DataValidator:
         Returns:
             (有効なDataFrame, エラーメッセージリスト)
         """
+        # ID・cardIDフィールドチェック
+        rules = [
+            ValidationRule('missing_id', self._missing_mask(df, 'ID'),
+                           lambda idx, pos: f"Row {idx}: Missing ID"),
+            ValidationRule('missing_card_id', self._missing_mask(df, 'cardID'),
+                           lambda idx, pos: f"Row {idx}: Missing cardID"),
+        ]
+
+        # スコア関連フィールドの非負チェック
+        score_fields = ['オート', '楽曲', 'スコア', '上限']
+        for field in score_fields:
+            if field in df.columns:
+                numeric, invalid = self._coerce_numeric(df[field])
+                rules.append(ValidationRule(
+                    f'invalid_numeric:{field}',
+                    invalid,
+                    lambda idx, pos, field=field: f"Row {idx}: Invalid numeric value in {field}"
+                ))
+                rules.append(ValidationRule(
+                    f'negative_value:{field}',
+                    (numeric < 0).to_numpy(dtype=bool),
+                    lambda idx, pos, field=field: f"Row {idx}: Negative value in {field}"
+                ))
+
+        return self._apply_rules(df, rules, 'brooches')
+
+    def _apply_rules(
+        self,
+        df: pd.DataFrame,
+        rules: List[ValidationRule],
+        table_name: str,
+        log_limit: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, List[str]]:
+        """
+        検証ルールのマスクを結合し、違反行のみエラーメッセージを生成
+
+        Args:
+            df: 検証対象のDataFrame
+            rules: 評価済みの検証ルール
+            table_name: ログ出力用のテーブル名
+            log_limit: ログ出力するエラー件数の上限（Noneは無制限）
+
+        Returns:
+            (有効なDataFrame, エラーメッセージリスト)
+        """
+        failed = np.zeros(len(df), dtype=bool)
+        for rule in rules:
+            failed |= rule.mask
+            metrics.VALIDATION_FAILURES.inc(int(rule.mask.sum()), table=table_name, rule=rule.name)
+
         errors = []
-        valid_indices = []
-
-        for idx, row in df.iterrows():
-            row_errors = []
-
-            # ID・cardIDフィールドチェック
-            if pd.isna(row.get('ID')):
-                row_errors.append(f"Row {idx}: Missing ID")
-            if pd.isna(row.get('cardID')):
-                row_errors.append(f"Row {idx}: Missing cardID")
-
-            # スコア関連フィールドの非負チェック
-            score_fields = ['オート', '楽曲', 'スコア', '上限']
-            for field in score_fields:
-                if field in row and not pd.isna(row[field]):
-                    try:
-                        value = float(row[field])
-                        if value < 0:
-                            row_errors.append(f"Row {idx}: Negative value in {field}")
-                    except (ValueError, TypeError):
-                        row_errors.append(f"Row {idx}: Invalid numeric value in {field}")
-
-            if row_errors:
-                errors.extend(row_errors)
-                logger.warning(f"Validation error in brooches data: {row_errors}")
-            else:
-                valid_indices.append(idx)
-
-        return df.loc[valid_indices], errors
+        for pos in np.flatnonzero(failed):
+            idx = df.index[pos]
+            row_errors = [rule.message(idx, pos) for rule in rules if rule.mask[pos]]
+            errors.extend(row_errors)
+
+            if log_limit is None or len(errors) <= log_limit:
+                logger.warning(f"Validation error in {table_name} data: {row_errors}")
+
+        return df[~failed], errors
+
+    def _missing_mask(self, df: pd.DataFrame, column: str) -> np.ndarray:
+        """欠損値マスク（カラム自体が存在しない場合は全行違反）"""
+        if column not in df.columns:
+            return np.ones(len(df), dtype=bool)
+        return df[column].isna().to_numpy(dtype=bool)
+
+    def _blank_mask(self, df: pd.DataFrame, column: str) -> np.ndarray:
+        """欠損値または空白のみの文字列マスク"""
+        if column not in df.columns:
+            return np.ones(len(df), dtype=bool)
+        series = df[column]
+        blank = series.astype(str).str.strip().eq('')
+        return (series.isna() | blank).to_numpy(dtype=bool)
+
+    def _invalid_numeric_mask(self, series: pd.Series) -> np.ndarray:
+        """数値に変換できない値のマスク（欠損値は対象外）"""
+        return self._coerce_numeric(series)[1]
+
+    def _coerce_numeric(self, series: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+        """
+        値を数値に変換し、(数値Series, 変換できない値のマスク) を返す
+
+        pd.to_numericで変換できなかった値のみfloat()で再変換し、
+        全角数字（'１２'）や区切り付き（'1_000'）などfloat()が受け付ける値は有効とする
+        """
+        numeric = pd.to_numeric(series, errors='coerce')
+        invalid = (series.notna() & numeric.isna()).to_numpy(dtype=bool, copy=True)
+        if not invalid.any():
+            return numeric, invalid
+
+        numeric = numeric.astype('float64')
+        for pos in np.flatnonzero(invalid):
+            try:
+                numeric.iloc[pos] = float(series.iloc[pos])
+            except (ValueError, TypeError):
+                continue
+            invalid[pos] = False
+        return numeric, invalid
@@ -0,0 +1,10 @@
+"""pytest共通設定 - リポジトリのどこから実行してもsrc/とbenchmarks/をimportできるようにする"""
+
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for path in (REPO_ROOT, os.path.join(REPO_ROOT, "src")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,37 @@
+"""AdaptiveBatchSizerのユニットテスト"""
+
+from batch_sizer import AdaptiveBatchSizer
+
+
+class TestAdaptiveBatchSizer:
+    """AdaptiveBatchSizerクラスのテスト"""
+
+    def test_grows_when_fast(self):
+        """目標より十分速い応答ではバッチを拡大"""
+        sizer = AdaptiveBatchSizer(initial_size=10, target_latency=2.0)
+        sizer.record_success(10, 1000, 0.1)
+        assert sizer.next_batch_size() == 15
+
+    def test_shrinks_when_slow(self):
+        """目標レイテンシ超過時はバッチを縮小"""
+        sizer = AdaptiveBatchSizer(initial_size=10, target_latency=2.0)
+        sizer.record_success(10, 1000, 3.0)
+        assert sizer.next_batch_size() == 5
+
+    def test_payload_bytes_cap_batch_size(self):
+        """1文あたりのバイト数から目標ペイロードサイズを超えないよう制限"""
+        sizer = AdaptiveBatchSizer(initial_size=100, target_bytes=10_000)
+        sizer.record_success(100, 100_000, 0.1)
+        assert sizer.next_batch_size() == 10
+
+    def test_failure_shrinks_and_respects_minimum(self):
+        """413/5xx時は縮小し、最小サイズを下回らない（再送は413のみ）"""
+        sizer = AdaptiveBatchSizer(initial_size=2, min_size=1)
+        assert sizer.is_retryable_status(413)
+        assert not sizer.is_retryable_status(502)
+        assert not sizer.is_retryable_status(400)
+        assert sizer.should_shrink(504)
+        assert not sizer.should_shrink(400)
+        sizer.record_failure(2, 100, 413)
+        sizer.record_failure(1, 50, 413)
+        assert sizer.next_batch_size() == 1
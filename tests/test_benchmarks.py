@@ -0,0 +1,68 @@
+"""オフラインベンチマーク（ローカルスタンドイン）のテスト"""
+
+import pytest
+import requests
+
+from benchmarks.stand_ins import FakeTursoServer
+from benchmarks.run_benchmarks import run_benchmark
+
+
+class TestFakeTursoServer:
+    """FakeTursoServerのテスト"""
+
+    def test_statements_protocol(self):
+        """{"statements": [...]} 形式で実行し、Turso形式の結果を返す"""
+        with FakeTursoServer() as turso:
+            response = requests.post(turso.base_url, json={"statements": [
+                "CREATE TABLE t (id INTEGER)",
+                {"q": "INSERT INTO t VALUES (?), (?)", "params": [1, 2]},
+                "SELECT COUNT(*) FROM t",
+                "SELECT * FROM missing",
+            ]})
+
+        results = response.json()
+        assert results[1]["results"]["rows_written"] == 2
+        assert results[2]["results"]["rows"] == [[2]]
+        assert "error" in results[3]
+
+
+class TestRunBenchmark:
+    """run_benchmarkのテスト"""
+
+    @pytest.mark.parametrize("insert_mode", ["literal", "multirow"])
+    def test_small_benchmark_syncs_all_tables(self, insert_mode):
+        """合成シートが全テーブル同期され、ステージごとの計測値が出力される"""
+        runs = run_benchmark(200, insert_mode=insert_mode)
+
+        assert [run["table"] for run in runs] == ["songs", "cards", "brooches"]
+        for run in runs:
+            assert run["success"], run["error"]
+            assert run["stored_rows"] == run["inserted"] == 200 - run["skipped"]
+            assert {"fetch", "validate", "transform", "schema", "upload"} <= set(run["stages"])
+
+    @pytest.mark.parametrize("sync_strategy", ["full", "delta", "swap"])
+    def test_sqlite_backend(self, sync_strategy):
+        """SQLiteバックエンドでも全テーブルが同期され、Tursoスタンドインへの送信はない"""
+        runs = run_benchmark(200, backend="sqlite", insert_mode="parameterized", sync_strategy=sync_strategy)
+
+        for run in runs:
+            assert run["success"], run["error"]
+            assert run["stored_rows"] == run["inserted"] == 200 - run["skipped"]
+            assert run["turso_requests"] == 0
+
+    def test_pipeline_transaction_mode(self):
+        """Hranaパイプラインの単一トランザクションでも全テーブルが同期される"""
+        runs = run_benchmark(200, tables=["songs"], transaction_mode="pipeline", insert_mode="parameterized")
+
+        for run in runs:
+            assert run["success"], run["error"]
+            assert run["stored_rows"] == run["inserted"] == 200 - run["skipped"]
+
+    def test_streaming_fetch_is_timed(self):
+        """ストリーミング時もチャンクの受信・解析がfetchステージとして計測される"""
+        runs = run_benchmark(200, tables=["cards"], streaming=True, chunk_rows=50, trace_memory=False)
+
+        for run in runs:
+            assert run["success"], run["error"]
+            assert run["stages"]["fetch"]["calls"] >= 4
+            assert run["stages"]["fetch"]["wall_seconds"] > 0
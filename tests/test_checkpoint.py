@@ -0,0 +1,147 @@
+"""チェックポイント（再開可能な全件同期）のテスト"""
+
+import os
+import pandas as pd
+import pytest
+import requests
+from unittest.mock import patch
+
+from checkpoint import CheckpointStore, SyncCheckpoint, compute_content_hash
+from csv_fetcher import CSVFetcher
+from db_client import DatabaseClient
+from orchestrator import SyncOrchestrator
+from transformers import DataTransformer
+from validators import DataValidator
+from benchmarks.stand_ins import FakeSheetsServer, FakeTursoServer
+from benchmarks.synthetic import generate_cards
+
+STATEMENTS = [f"INSERT INTO t VALUES ({i})" for i in range(10)]
+
+
+class TestSyncCheckpoint:
+    """SyncCheckpoint・CheckpointStoreのテスト"""
+
+    def test_resume_offset_requires_matching_content_and_ranges(self):
+        """内容ハッシュとコミット済み範囲のINSERT文が一致する場合のみ再開"""
+        checkpoint = SyncCheckpoint(content_hash="abc")
+        checkpoint.record(STATEMENTS, 0, 4, 4)
+        checkpoint.record(STATEMENTS, 4, 8, 4)
+        # 連続しない範囲は記録しない
+        checkpoint.record(STATEMENTS, 9, 10, 1)
+
+        assert (checkpoint.committed_statements, checkpoint.committed_rows) == (8, 8)
+        assert checkpoint.resume_offset("abc", STATEMENTS) == 8
+        assert checkpoint.resume_offset("other", STATEMENTS) == 0
+        changed = STATEMENTS[:5] + ["INSERT INTO t VALUES (-1)"] + STATEMENTS[6:]
+        assert checkpoint.resume_offset("abc", changed) == 0
+
+    def test_store_roundtrip(self, tmp_path):
+        """保存・読み込み・削除（壊れたファイルは無視）"""
+        store = CheckpointStore(str(tmp_path / "checkpoints"))
+        checkpoint = SyncCheckpoint(content_hash="abc")
+        checkpoint.record(STATEMENTS, 0, 5, 5)
+
+        store.save("songs", checkpoint)
+        assert store.load("songs") == checkpoint
+
+        store.clear("songs")
+        assert store.load("songs") is None
+
+        with open(tmp_path / "checkpoints" / "cards.json", "w") as f:
+            f.write("{broken")
+        assert store.load("cards") is None
+
+    def test_store_is_keyed_by_sync_target(self, tmp_path):
+        """同じディレクトリでも同期先が異なるチェックポイントは読み込まない"""
+        checkpoint = SyncCheckpoint(content_hash="abc")
+        checkpoint.record(STATEMENTS, 0, 5, 5)
+        CheckpointStore(str(tmp_path), target_key="turso").save("songs", checkpoint)
+
+        assert CheckpointStore(str(tmp_path), target_key="turso").load("songs") == checkpoint
+        assert CheckpointStore(str(tmp_path), target_key="sqlite").load("songs") is None
+
+    def test_content_hash(self):
+        """値・dtypeが変わるとハッシュも変わる"""
+        df = pd.DataFrame({"ID": pd.array([1, 2], dtype="Int64"), "name": ["a", "b"]})
+
+        assert compute_content_hash(df) == compute_content_hash(df.copy())
+        assert compute_content_hash(df) != compute_content_hash(df.assign(name=["a", "c"]))
+
+
+class TestResumableSync:
+    """SyncOrchestratorでの再開のテスト"""
+
+    @pytest.fixture
+    def servers(self):
+        with FakeSheetsServer() as sheets, FakeTursoServer() as turso:
+            sheets.add_sheet("sheet", 2, generate_cards(300))
+            yield sheets, turso
+
+    def make_orchestrator(self, sheets, turso, checkpoint_dir):
+        with patch.dict(os.environ, {"TURSO_DATABASE_URL": turso.base_url, "TURSO_AUTH_TOKEN": "test_token"}):
+            db_client = DatabaseClient()
+        return SyncOrchestrator(
+            csv_fetcher=CSVFetcher(max_retries=1, url_template=sheets.url_template),
+            db_client=db_client,
+            validator=DataValidator(),
+            transformer=DataTransformer(),
+            insert_mode="parameterized",
+            checkpoint_dir=checkpoint_dir
+        )
+
+    def fail_after(self, client: DatabaseClient, calls: int):
+        """calls回目以降のPOSTを接続エラーにする"""
+        original = client._post
+        count = {"n": 0}
+
+        def post(*args, **kwargs):
+            count["n"] += 1
+            if count["n"] > calls:
+                raise requests.ConnectionError("connection lost")
+            return original(*args, **kwargs)
+
+        return patch.object(client, "_post", side_effect=post)
+
+    def test_rerun_resumes_from_first_unconfirmed_batch(self, servers, tmp_path):
+        """途中で失敗した同期は、同じ内容なら未確認のバッチから再開する"""
+        sheets, turso = servers
+        checkpoint_dir = str(tmp_path / "checkpoints")
+
+        orchestrator = self.make_orchestrator(sheets, turso, checkpoint_dir)
+        # スキーマ確認（PRAGMA + CREATE）・DELETE・2バッチのみ成功
+        with self.fail_after(orchestrator.db_client, 5):
+            failed = orchestrator.sync_single_table("cards", 2, "sheet")
+        assert not failed.success
+        committed = orchestrator.checkpoint_store.load("cards")
+        assert committed.committed_rows == turso.query("SELECT COUNT(*) FROM cards")[0][0] == 100
+
+        requests_before = turso.request_count
+        result = self.make_orchestrator(sheets, turso, checkpoint_dir).sync_single_table("cards", 2, "sheet")
+
+        assert result.success, result.error_message
+        assert result.resumed_rows == 100
+        assert result.deleted_count == 0
+        expected_rows = 300 - result.skipped_count
+        assert result.inserted_count == expected_rows - 100
+        assert turso.query("SELECT COUNT(*), COUNT(DISTINCT ID) FROM cards")[0] == (expected_rows, expected_rows)
+        # スキーマ確認・行数照合と残りのバッチのみ送信（DELETEと確認済みの2バッチは再送しない）
+        full_batches = -(-expected_rows // 50)
+        assert turso.request_count - requests_before == 2 + (full_batches - 2)
+        assert orchestrator.checkpoint_store.load("cards") is None
+
+    def test_rerun_restarts_when_table_changed(self, servers, tmp_path):
+        """テーブルの行数がチェックポイントと異なる場合は最初から同期"""
+        sheets, turso = servers
+        checkpoint_dir = str(tmp_path / "checkpoints")
+
+        orchestrator = self.make_orchestrator(sheets, turso, checkpoint_dir)
+        with self.fail_after(orchestrator.db_client, 5):
+            orchestrator.sync_single_table("cards", 2, "sheet")
+        turso.execute(["DELETE FROM cards WHERE rowid IN (SELECT rowid FROM cards LIMIT 1)"])
+
+        result = self.make_orchestrator(sheets, turso, checkpoint_dir).sync_single_table("cards", 2, "sheet")
+
+        assert result.success, result.error_message
+        assert result.resumed_rows == 0
+        assert result.deleted_count == 99
+        assert turso.query("SELECT COUNT(*) FROM cards")[0][0] == 300 - result.skipped_count
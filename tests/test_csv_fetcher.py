@@ -3,13 +3,10 @@
 import pytest
 import pandas as pd
 from unittest.mock import patch, Mock
-from io import StringIO
+from io import StringIO, BytesIO
 import requests
 
-import sys
-sys.path.insert(0, '/Users/yaoko/git/i7_datasync/src')
-
-from csv_fetcher import CSVFetcher, CSVFetchError
+from csv_fetcher import CSVFetcher, CSVFetchError, CSVDownloadError
 
 
 class TestCSVFetcher:
@@ -22,10 +19,10 @@ class TestCSVFetcher:
         # モックCSVデータ
         mock_csv = "ID,name,value\n1,Test,100\n2,Sample,200"
 
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.text = mock_csv
+            mock_response.raw = BytesIO(mock_csv.encode("utf-8"))
             mock_get.return_value = mock_response
 
             df = fetcher.fetch_csv_as_dataframe("test_spreadsheet_id", 123456)
@@ -38,7 +35,7 @@ class TestCSVFetcher:
         """HTTP 404エラー時に例外発生"""
         fetcher = CSVFetcher()
 
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 404
             mock_response.raise_for_status.side_effect = requests.HTTPError("404 Not Found")
@@ -51,7 +48,7 @@ class TestCSVFetcher:
         """HTTP 500エラー時に例外発生"""
         fetcher = CSVFetcher()
 
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 500
             mock_response.raise_for_status.side_effect = requests.HTTPError("500 Server Error")
@@ -64,7 +61,7 @@ class TestCSVFetcher:
         """タイムアウト時に例外発生"""
         fetcher = CSVFetcher()
 
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_get.side_effect = requests.Timeout("Request timeout")
 
             with pytest.raises(CSVFetchError):
@@ -74,7 +71,7 @@ class TestCSVFetcher:
         """リトライロジックのテスト（3回失敗後に例外）"""
         fetcher = CSVFetcher()
 
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_get.side_effect = requests.Timeout("Request timeout")
 
             with pytest.raises(CSVFetchError):
@@ -89,3 +86,180 @@ class TestCSVFetcher:
         url = fetcher._build_csv_url("abc123", 456789)
         expected = "https://docs.google.com/spreadsheets/d/abc123/export?format=csv&gid=456789"
         assert url == expected
+
+    def test_session_is_reused_across_fetches(self):
+        """複数回の取得で同じプール付きセッションを使い回す"""
+        fetcher = CSVFetcher(pool_size=4)
+
+        adapter = fetcher.session.get_adapter("https://docs.google.com")
+        assert adapter._pool_maxsize == 4
+        assert adapter.max_retries.status_forcelist == (429, 500, 502, 503, 504)
+
+        with patch.object(fetcher.session, 'get') as mock_get:
+            mock_get.side_effect = lambda *args, **kwargs: Mock(raw=BytesIO(b"ID\n1"))
+
+            fetcher.fetch_csv_as_dataframe("sheet", 1)
+            fetcher.fetch_csv_as_dataframe("sheet", 2)
+
+            assert mock_get.call_count == 2
+
+    def _mock_response(self, status_code=200, content=b"ID\n1\n", headers=None):
+        """条件付き取得テスト用のレスポンスモック（本文はストリームとしてのみ読める）"""
+        response = Mock(spec=["status_code", "raw", "headers", "close", "raise_for_status"])
+        response.status_code = status_code
+        response.raw = BytesIO(content)
+        response.headers = headers or {}
+        return response
+
+    def _respond_with(self, *args, **kwargs):
+        """呼び出しごとに新しいレスポンスモックを返すside_effect"""
+        return lambda *_, **__: self._mock_response(*args, **kwargs)
+
+    def test_fetch_csv_if_modified_uses_conditional_headers(self, tmp_path):
+        """保存済みETagで条件付きリクエストを送り、304ならNoneを返す"""
+        fetcher = CSVFetcher(state_dir=str(tmp_path))
+
+        with patch.object(fetcher.session, 'get') as mock_get:
+            mock_get.side_effect = self._respond_with(headers={"ETag": '"v1"'})
+            df = fetcher.fetch_csv_if_modified("sheet", 1)
+            assert len(df) == 1
+            assert mock_get.call_args.kwargs['headers'] == {}
+            assert mock_get.call_args.kwargs['stream'] is True
+
+            fetcher.commit_fetch_state("sheet", 1)
+
+            mock_get.side_effect = self._respond_with(status_code=304, content=b"")
+            assert fetcher.fetch_csv_if_modified("sheet", 1) is None
+            assert mock_get.call_args.kwargs['headers'] == {"If-None-Match": '"v1"'}
+
+    def test_fetch_csv_if_modified_same_digest(self, tmp_path):
+        """ETagがなくても本文のダイジェストが一致すればNoneを返す"""
+        fetcher = CSVFetcher(state_dir=str(tmp_path))
+
+        with patch.object(fetcher.session, 'get') as mock_get:
+            mock_get.side_effect = self._respond_with()
+            assert fetcher.fetch_csv_if_modified("sheet", 1) is not None
+            fetcher.commit_fetch_state("sheet", 1)
+
+            assert fetcher.fetch_csv_if_modified("sheet", 1) is None
+
+            mock_get.side_effect = self._respond_with(content=b"ID\n1\n2\n")
+            assert len(fetcher.fetch_csv_if_modified("sheet", 1)) == 2
+
+    def test_fetch_state_saved_only_after_commit(self, tmp_path):
+        """commit_fetch_stateを呼ぶまでは状態が保存されない"""
+        fetcher = CSVFetcher(state_dir=str(tmp_path))
+
+        with patch.object(fetcher.session, 'get') as mock_get:
+            mock_get.side_effect = self._respond_with()
+            fetcher.fetch_csv_if_modified("sheet", 1)
+
+            # 同期失敗を想定（commitしない）→ 次回も取得される
+            assert fetcher.fetch_csv_if_modified("sheet", 1) is not None
+            assert not (tmp_path / "sheet_1.json").exists()
+
+    def test_fetch_state_is_kept_per_sync_target(self, tmp_path):
+        """state_keyが異なる同期先では、別の同期先で保存した取得状態を使わない"""
+        turso_fetcher = CSVFetcher(state_dir=str(tmp_path), state_key="turso")
+        sqlite_fetcher = CSVFetcher(state_dir=str(tmp_path), state_key="sqlite")
+
+        with patch.object(turso_fetcher.session, 'get') as turso_get, \
+                patch.object(sqlite_fetcher.session, 'get') as sqlite_get:
+            turso_get.side_effect = self._respond_with()
+            sqlite_get.side_effect = self._respond_with()
+
+            turso_fetcher.fetch_csv_if_modified("sheet", 1)
+            turso_fetcher.commit_fetch_state("sheet", 1)
+
+            assert turso_fetcher.fetch_csv_if_modified("sheet", 1) is None
+            assert sqlite_fetcher.fetch_csv_if_modified("sheet", 1) is not None
+            assert (tmp_path / "turso_sheet_1.json").exists()
+
+    def test_iter_csv_chunks_streams_response(self):
+        """ストリーミング受信した本文をchunk_rows行ごとに返す"""
+        fetcher = CSVFetcher()
+
+        with patch.object(fetcher.session, 'get') as mock_get:
+            response = Mock()
+            response.status_code = 200
+            response.raw = BytesIO("ID,name\n1,あ\n2,い\n3,う\n".encode("utf-8"))
+            mock_get.return_value = response
+
+            chunks = list(fetcher.iter_csv_chunks("sheet", 1, chunk_rows=2))
+
+            assert [len(chunk) for chunk in chunks] == [2, 1]
+            assert chunks[1]['name'].tolist() == ['う']
+            assert mock_get.call_args.kwargs['stream'] is True
+            response.close.assert_called_once()
+
+    def test_read_timeout_during_body_is_retried(self):
+        """本文の受信途中のタイムアウトはCSVFetchErrorとしてリクエストからやり直す"""
+        import urllib3
+
+        class InterruptedBody(BytesIO):
+            """先頭の8バイトを返した後に読み込みタイムアウトする本文"""
+            def read(self, *args):
+                if self.tell() > 0:
+                    raise urllib3.exceptions.ReadTimeoutError(None, None, "Read timed out.")
+                return super().read(8)
+
+            read1 = read
+
+            def readinto(self, buffer):
+                data = self.read()
+                buffer[:len(data)] = data
+                return len(data)
+
+        fetcher = CSVFetcher(retry_delay=0)
+        body = "ID,value\n1,10\n2,20\n3,30\n".encode("utf-8")
+
+        with patch.object(fetcher.session, 'get') as mock_get:
+            mock_get.side_effect = [Mock(raw=InterruptedBody(body)), Mock(raw=BytesIO(body))]
+            df = fetcher.fetch_csv_as_dataframe("sheet", 1)
+
+            assert df['ID'].tolist() == [1, 2, 3]
+            assert mock_get.call_count == 2
+
+        with patch.object(fetcher.session, 'get') as mock_get:
+            mock_get.side_effect = lambda *args, **kwargs: Mock(raw=InterruptedBody(body))
+            with pytest.raises(CSVDownloadError):
+                fetcher.fetch_csv_as_dataframe("sheet", 1)
+            assert mock_get.call_count == 3
+
+            # ストリーミングではやり直さず、解析エラーではなく取得エラーとして伝える
+            with pytest.raises(CSVFetchError, match="Download interrupted"):
+                list(fetcher.iter_csv_chunks("sheet", 1, chunk_rows=1))
+
+    def test_fetch_csv_as_dataframe_concatenates_chunks(self):
+        """chunk_rows指定時は受信したチャンクを結合して返す"""
+        fetcher = CSVFetcher()
+
+        with patch.object(fetcher.session, 'get') as mock_get:
+            mock_get.return_value = Mock(raw=BytesIO(b"ID,value\n1,10\n2,20\n3,30\n"))
+
+            df = fetcher.fetch_csv_as_dataframe("sheet", 1, chunk_rows=2)
+
+            assert df['ID'].tolist() == [1, 2, 3]
+            assert df.index.tolist() == [0, 1, 2]
+
+    def test_multirow_header_with_quoted_cells(self):
+        """クォート内のカンマ・改行を含むヘッダーでも正しくカラム名を結合"""
+        fetcher = CSVFetcher()
+        csv_text = 'Cat A,,"Cat, B"\nid,"name, full","multi\nline"\n1,"x, y",3\n'
+
+        df = fetcher._parse_multirow_header(csv_text, 1)
+
+        assert list(df.columns) == ['Cat A_id', 'Cat A_name, full', 'Cat, B_multi\nline']
+        assert df.iloc[0].tolist() == [1, 'x, y', 3]
+
+    def test_multirow_header_streamed_in_chunks(self):
+        """2行ヘッダーのシートもストリーミングでチャンク取得できる"""
+        fetcher = CSVFetcher()
+
+        with patch.object(fetcher.session, 'get') as mock_get:
+            mock_get.return_value = Mock(raw=BytesIO("分類,\nID,曲名\n1,a\n2,b\n3,c\n".encode("utf-8")))
+
+            chunks = list(fetcher.iter_csv_chunks("sheet", 1, chunk_rows=2, header=1, use_multirow_header=True))
+
+            assert [len(chunk) for chunk in chunks] == [2, 1]
+            assert all(list(chunk.columns) == ['分類_ID', '分類_曲名'] for chunk in chunks)
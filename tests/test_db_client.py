@@ -2,12 +2,12 @@
 
 import pytest
 import os
+import json
+import requests
 from unittest.mock import patch, Mock, MagicMock
 
-import sys
-sys.path.insert(0, '/Users/yaoko/git/i7_datasync/src')
-
 from db_client import DatabaseClient, DatabaseConnectionError, DatabaseTransactionError
+from batch_sizer import AdaptiveBatchSizer
 
 
 class TestDatabaseClient:
@@ -98,3 +98,292 @@ class TestDatabaseClient:
 
             with pytest.raises(DatabaseTransactionError):
                 client.execute_transaction(delete_query, insert_statements)
+
+    def test_execute_query_with_params(self):
+        """パラメータ指定時は{"q", "params"}形式で送信"""
+        with patch.dict(os.environ, {
+            'TURSO_DATABASE_URL': 'libsql://test.turso.io',
+            'TURSO_AUTH_TOKEN': 'test_token'
+        }):
+            client = DatabaseClient()
+
+            with patch('requests.Session.post') as mock_post:
+                mock_post.return_value.json.return_value = [{"results": {"rows": []}}]
+
+                client.execute_query("SELECT * FROM songs WHERE ID = ?", [1])
+
+                sent = json.loads(mock_post.call_args.kwargs['data'])
+                assert sent == {"statements": [{"q": "SELECT * FROM songs WHERE ID = ?", "params": [1]}]}
+
+    def test_session_carries_auth_header(self):
+        """認証ヘッダーはセッションに設定され、POSTのリトライは接続エラーのみ"""
+        with patch.dict(os.environ, {
+            'TURSO_DATABASE_URL': 'libsql://test.turso.io',
+            'TURSO_AUTH_TOKEN': 'test_token'
+        }):
+            client = DatabaseClient(pool_size=3)
+
+            assert client.session.headers["Authorization"] == "Bearer test_token"
+            adapter = client.session.get_adapter(client.http_url)
+            assert adapter._pool_maxsize == 3
+            assert adapter.max_retries.read == 0
+            assert adapter.max_retries.status == 0
+
+    def test_query_rows_and_statement_errors(self):
+        """query_rowsは結果行を返し、ステートメントエラーは例外になる"""
+        with patch.dict(os.environ, {
+            'TURSO_DATABASE_URL': 'libsql://test.turso.io',
+            'TURSO_AUTH_TOKEN': 'test_token'
+        }):
+            client = DatabaseClient()
+
+            with patch('requests.Session.post') as mock_post:
+                mock_post.return_value.json.return_value = [{"results": {"columns": ["ID"], "rows": [[1], [2]]}}]
+                assert client.query_rows("SELECT ID FROM songs") == [[1], [2]]
+
+                mock_post.return_value.json.return_value = [
+                    {"results": {"rows_written": 1}},
+                    {"error": {"message": "no such table"}}
+                ]
+                with pytest.raises(DatabaseTransactionError):
+                    client.execute_statements(["UPDATE a SET x = 1", "UPDATE b SET x = 1"])
+
+    def test_swap_table_single_request(self):
+        """入れ替えはBEGIN〜COMMITを含む単一リクエストで実行"""
+        with patch.dict(os.environ, {
+            'TURSO_DATABASE_URL': 'libsql://test.turso.io',
+            'TURSO_AUTH_TOKEN': 'test_token'
+        }):
+            client = DatabaseClient()
+
+            with patch('requests.Session.post') as mock_post:
+                mock_post.return_value.json.side_effect = [
+                    [{"results": {"rows": [["songs"]]}}],
+                    [{"results": {"rows": [[42]]}}],
+                    [{"results": {"rows_written": 0}}] * 6,
+                ]
+
+                replaced = client.swap_table("songs", "songs__staging")
+
+                assert replaced == 42
+                assert mock_post.call_count == 3
+                swap_statements = json.loads(mock_post.call_args.kwargs['data'])['statements']
+                assert swap_statements == [
+                    "BEGIN",
+                    "DROP TABLE IF EXISTS songs__old",
+                    "ALTER TABLE songs RENAME TO songs__old",
+                    "ALTER TABLE songs__staging RENAME TO songs",
+                    "DROP TABLE IF EXISTS songs__old",
+                    "COMMIT",
+                ]
+
+    def test_execute_statements_shrinks_batch_on_413(self):
+        """413応答時はバッチを縮小して同じ位置から再送"""
+        with patch.dict(os.environ, {
+            'TURSO_DATABASE_URL': 'libsql://test.turso.io',
+            'TURSO_AUTH_TOKEN': 'test_token'
+        }):
+            client = DatabaseClient()
+            sizer = AdaptiveBatchSizer(initial_size=4)
+
+            def fake_post(url, data, timeout):
+                statements = json.loads(data)['statements']
+                response = Mock()
+                response.status_code = 413 if len(statements) > 2 else 200
+                response.json.return_value = [{"results": {"rows_written": 1}}] * len(statements)
+                return response
+
+            with patch('requests.Session.post', side_effect=fake_post):
+                result = client.execute_statements(["INSERT"] * 6, batch_sizer=sizer)
+
+            assert result["rows_written"] == 6
+            assert sum(result["batch_sizes"]) == 6
+            assert all(size <= 2 for size in result["batch_sizes"])
+
+    def test_execute_statements_does_not_resend_on_5xx(self):
+        """5xx応答のバッチは反映済みの可能性があるため再送せずに失敗する"""
+        with patch.dict(os.environ, {
+            'TURSO_DATABASE_URL': 'libsql://test.turso.io',
+            'TURSO_AUTH_TOKEN': 'test_token'
+        }):
+            client = DatabaseClient()
+            sizer = AdaptiveBatchSizer(initial_size=4)
+            committed = []
+
+            response = Mock()
+            response.status_code = 504
+            response.raise_for_status.side_effect = requests.HTTPError("504 Gateway Timeout", response=response)
+
+            with patch('requests.Session.post', return_value=response) as mock_post:
+                with pytest.raises(DatabaseTransactionError):
+                    client.execute_statements(
+                        ["INSERT"] * 6, batch_sizer=sizer,
+                        on_batch_committed=lambda start, end, rows: committed.append((start, end))
+                    )
+
+            assert mock_post.call_count == 1
+            assert committed == []
+            assert sizer.next_batch_size() == 2
+
+    def test_concurrent_batches_bounded_and_aggregated(self):
+        """max_in_flight件まで並行送信し、rows_writtenを合計する"""
+        import threading
+        import time
+
+        with patch.dict(os.environ, {
+            'TURSO_DATABASE_URL': 'libsql://test.turso.io',
+            'TURSO_AUTH_TOKEN': 'test_token'
+        }):
+            client = DatabaseClient(max_in_flight=3)
+            lock = threading.Lock()
+            in_flight = []
+            peak = []
+
+            def fake_post(url, data, timeout):
+                with lock:
+                    in_flight.append(1)
+                    peak.append(len(in_flight))
+                time.sleep(0.02)
+                with lock:
+                    in_flight.pop()
+                statements = json.loads(data)['statements']
+                response = Mock()
+                response.json.return_value = [{"results": {"rows_written": 1}}] * len(statements)
+                return response
+
+            with patch('requests.Session.post', side_effect=fake_post):
+                result = client.execute_statements(["INSERT"] * 10, batch_size=2, independent=True)
+
+            assert result == {"rows_written": 10, "batch_sizes": [2, 2, 2, 2, 2]}
+            assert 1 < max(peak) <= 3
+
+    def test_concurrent_batches_report_first_failure(self):
+        """後続バッチが先に失敗しても、最初に失敗したバッチのエラーを報告する"""
+        import time
+        import json as json_module
+
+        with patch.dict(os.environ, {
+            'TURSO_DATABASE_URL': 'libsql://test.turso.io',
+            'TURSO_AUTH_TOKEN': 'test_token'
+        }):
+            client = DatabaseClient(max_in_flight=4)
+
+            def fake_post(url, data=None, json=None, timeout=None):
+                statements = json['statements'] if json else json_module.loads(data)['statements']
+                response = Mock()
+                if statements == ["BAD-1"]:
+                    time.sleep(0.05)
+                    response.json.return_value = [{"error": {"message": "slow batch error"}}]
+                elif statements == ["BAD-3"]:
+                    response.json.return_value = [{"error": {"message": "fast batch error"}}]
+                else:
+                    response.json.return_value = [{"results": {"rows_written": 1}}]
+                return response
+
+            with patch('requests.Session.post', side_effect=fake_post):
+                with pytest.raises(DatabaseTransactionError, match="slow batch error"):
+                    client.execute_transaction(
+                        "DELETE FROM songs", ["OK", "BAD-1", "OK", "BAD-3"], batch_size=1
+                    )
+
+    def test_upload_counters_recorded_in_caller_stage(self):
+        """並行送信時も送信バイト数とリクエスト数は呼び出し元のステージに記録される"""
+        import instrumentation
+
+        with patch.dict(os.environ, {
+            'TURSO_DATABASE_URL': 'libsql://test.turso.io',
+            'TURSO_AUTH_TOKEN': 'test_token'
+        }):
+            client = DatabaseClient(max_in_flight=2)
+            sent = []
+
+            def fake_post(url, data, timeout):
+                sent.append(len(data))
+                statements = json.loads(data)['statements']
+                response = Mock()
+                response.json.return_value = [{"results": {"rows_written": 1}}] * len(statements)
+                return response
+
+            recorder = instrumentation.StageRecorder()
+            with patch('requests.Session.post', side_effect=fake_post):
+                with instrumentation.activate(recorder), instrumentation.stage("upload"):
+                    client.execute_statements(["INSERT"] * 6, batch_size=2, independent=True)
+
+            stats = recorder.to_dict()["upload"]
+            assert stats["http_requests"] == 3
+            assert stats["bytes_sent"] == sum(sent)
+
+    def test_pipeline_transaction_commits_in_last_batch(self):
+        """pipelineモードではDELETEと全バッチを同じストリームで送り、最後のバッチでCOMMITする"""
+        from benchmarks.stand_ins import FakeTursoServer
+
+        with FakeTursoServer() as turso:
+            turso.execute(["CREATE TABLE songs (ID INTEGER PRIMARY KEY, name TEXT)", "INSERT INTO songs VALUES (1, 'old')"])
+            requests_before = turso.request_count
+
+            with patch.dict(os.environ, {'TURSO_DATABASE_URL': turso.base_url, 'TURSO_AUTH_TOKEN': 'test_token'}):
+                client = DatabaseClient(transaction_mode="pipeline")
+            insert = "INSERT INTO songs (ID, name) VALUES (?, ?)"
+            result = client.execute_transaction(
+                "DELETE FROM songs",
+                [{"q": insert, "params": [i, f"新曲{i}"]} for i in range(1, 5)] + ["INSERT INTO songs VALUES (5, 'literal')"],
+                batch_size=2
+            )
+            client.close()
+
+            assert result == {"deleted": 1, "inserted": 5, "batch_sizes": [2, 2, 1]}
+            # コミット用の追加リクエストはない
+            assert turso.request_count - requests_before == 3
+            assert turso.query("SELECT name FROM songs WHERE ID = 2") == [("新曲2",)]
+            assert turso._streams == {}
+
+    def test_pipeline_transaction_failure_rolls_back(self):
+        """pipelineモードで途中のバッチが失敗した場合、DELETEを含めて全てロールバックされる"""
+        from benchmarks.stand_ins import FakeTursoServer
+
+        with FakeTursoServer() as turso:
+            turso.execute(["CREATE TABLE songs (ID INTEGER PRIMARY KEY, name TEXT)", "INSERT INTO songs VALUES (1, 'old')"])
+
+            with patch.dict(os.environ, {'TURSO_DATABASE_URL': turso.base_url, 'TURSO_AUTH_TOKEN': 'test_token'}):
+                client = DatabaseClient(transaction_mode="pipeline")
+            with pytest.raises(DatabaseTransactionError, match="UNIQUE"):
+                client.execute_transaction(
+                    "DELETE FROM songs",
+                    ["INSERT INTO songs VALUES (1, 'a')", "INSERT INTO songs VALUES (2, 'b')",
+                     "INSERT INTO songs VALUES (2, 'dup')", "INSERT INTO songs VALUES (3, 'c')"],
+                    batch_size=2
+                )
+            client.close()
+
+            assert turso.query("SELECT ID, name FROM songs") == [(1, "old")]
+            assert turso._streams == {}
+
+    def test_pipeline_transaction_cancelled_rolls_back(self):
+        """pipelineモードで途中のリクエスト前に中断された場合、ROLLBACKしてストリームを閉じる"""
+        from benchmarks.stand_ins import FakeTursoServer
+
+        with FakeTursoServer() as turso:
+            turso.execute(["CREATE TABLE songs (ID INTEGER PRIMARY KEY, name TEXT)", "INSERT INTO songs VALUES (1, 'old')"])
+            requests_before = turso.request_count
+            checks = []
+
+            def check_cancelled():
+                checks.append(len(checks))
+                if len(checks) > 2:
+                    raise RuntimeError("Sync cancelled")
+
+            with patch.dict(os.environ, {'TURSO_DATABASE_URL': turso.base_url, 'TURSO_AUTH_TOKEN': 'test_token'}):
+                client = DatabaseClient(transaction_mode="pipeline")
+            with pytest.raises(DatabaseTransactionError, match="Sync cancelled"):
+                client.execute_transaction(
+                    "DELETE FROM songs",
+                    [f"INSERT INTO songs VALUES ({i}, 'new')" for i in range(1, 9)],
+                    batch_size=2,
+                    check_cancelled=check_cancelled
+                )
+            client.close()
+
+            # 2リクエスト送信後に中断し、3件目の代わりにROLLBACKを送る
+            assert turso.request_count - requests_before == 3
+            assert turso.query("SELECT ID, name FROM songs") == [(1, "old")]
+            assert turso._streams == {}
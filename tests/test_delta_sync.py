@@ -0,0 +1,127 @@
+"""DeltaSynchronizerのユニットテスト"""
+
+import sqlite3
+import pytest
+import pandas as pd
+
+from delta_sync import DeltaSynchronizer, DeltaSyncError, ROW_HASH_TABLE
+
+
+class SQLiteStubClient:
+    """DatabaseClientのステートメント形式をsqlite3で実行するスタブ"""
+
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.executed = []
+
+    def _execute(self, statement):
+        if isinstance(statement, dict):
+            self.executed.append(statement["q"])
+            return self.conn.execute(statement["q"], statement.get("params", []))
+        self.executed.append(statement)
+        return self.conn.execute(statement)
+
+    def execute_query(self, query, params=None):
+        self._execute({"q": query, "params": params or []})
+
+    def query_rows(self, query, params=None):
+        return [list(row) for row in self._execute({"q": query, "params": params or []}).fetchall()]
+
+    def execute_statements(self, statements, batch_size=50):
+        rows_written = sum(self._execute(stmt).rowcount for stmt in statements)
+        self.conn.commit()
+        return {"rows_written": rows_written}
+
+
+class TestDeltaSynchronizer:
+    """DeltaSynchronizerクラスのテスト"""
+
+    @pytest.fixture
+    def client(self):
+        client = SQLiteStubClient()
+        client.conn.execute("CREATE TABLE cards (`ID` INTEGER PRIMARY KEY, `name` TEXT, `power` REAL)")
+        return client
+
+    def table_rows(self, client):
+        return client.conn.execute("SELECT * FROM cards ORDER BY ID").fetchall()
+
+    def test_initial_sync_inserts_all_rows(self, client):
+        """初回は全行がINSERTされる"""
+        synchronizer = DeltaSynchronizer(client)
+        df = pd.DataFrame({'ID': [1, 2], 'name': ['a', 'b'], 'power': [1.5, 2.5]})
+
+        result = synchronizer.sync('cards', df)
+
+        assert result == {"deleted": 0, "updated": 0, "inserted": 2}
+        assert self.table_rows(client) == [(1, 'a', 1.5), (2, 'b', 2.5)]
+
+    def test_only_changed_rows_are_written(self, client):
+        """追加・変更・削除された行のみ反映される"""
+        synchronizer = DeltaSynchronizer(client)
+        synchronizer.sync('cards', pd.DataFrame({
+            'ID': [1, 2, 3], 'name': ['a', 'b', 'c'], 'power': [1.0, 2.0, 3.0]
+        }))
+        client.executed.clear()
+
+        result = synchronizer.sync('cards', pd.DataFrame({
+            'ID': [1, 2, 4], 'name': ['a', 'B', 'd'], 'power': [1.0, 2.0, 4.0]
+        }))
+
+        assert result == {"deleted": 1, "updated": 1, "inserted": 1}
+        assert self.table_rows(client) == [(1, 'a', 1.0), (2, 'B', 2.0), (4, 'd', 4.0)]
+        assert sum(q.startswith("UPDATE cards") for q in client.executed) == 1
+
+    def test_unchanged_frame_issues_no_writes(self, client):
+        """変更がなければ書き込みは発生しない"""
+        synchronizer = DeltaSynchronizer(client)
+        df = pd.DataFrame({'ID': [1, 2], 'name': ['a', 'b'], 'power': [1.0, None]})
+        synchronizer.sync('cards', df)
+        client.executed.clear()
+
+        result = synchronizer.sync('cards', df.copy())
+
+        assert result == {"deleted": 0, "updated": 0, "inserted": 0}
+        assert not any(q.startswith(("INSERT", "UPDATE", "DELETE")) for q in client.executed)
+
+    def test_recreated_table_discards_stored_hashes(self, client):
+        """テーブル再作成時は保存済みハッシュを破棄して全行INSERT"""
+        synchronizer = DeltaSynchronizer(client)
+        df = pd.DataFrame({'ID': [1], 'name': ['a'], 'power': [1.0]})
+        synchronizer.sync('cards', df)
+        client.conn.execute("DELETE FROM cards")
+
+        result = synchronizer.sync('cards', df, table_recreated=True)
+
+        assert result["inserted"] == 1
+        assert self.table_rows(client) == [(1, 'a', 1.0)]
+        assert client.conn.execute(f"SELECT COUNT(*) FROM {ROW_HASH_TABLE}").fetchone()[0] == 1
+
+    def test_existing_rows_without_hashes_are_reconciled(self, client):
+        """保存済みハッシュがない既存テーブルでも、シートから消えた行は削除される"""
+        client.conn.executemany(
+            "INSERT INTO cards VALUES (?, ?, ?)",
+            [(1, 'a', 1.0), (2, 'b', 2.0), (3, 'c', 3.0)]
+        )
+        synchronizer = DeltaSynchronizer(client)
+
+        result = synchronizer.sync('cards', pd.DataFrame({
+            'ID': [1, 3, 4], 'name': ['a', 'C', 'd'], 'power': [1.0, 3.0, 4.0]
+        }))
+
+        assert result == {"deleted": 1, "updated": 2, "inserted": 1}
+        assert self.table_rows(client) == [(1, 'a', 1.0), (3, 'C', 3.0), (4, 'd', 4.0)]
+        assert client.conn.execute(f"SELECT COUNT(*) FROM {ROW_HASH_TABLE}").fetchone()[0] == 3
+
+        # 2回目以降は保存済みハッシュで差分を計算する
+        client.executed.clear()
+        assert synchronizer.sync('cards', pd.DataFrame({
+            'ID': [1, 3, 4], 'name': ['a', 'C', 'd'], 'power': [1.0, 3.0, 4.0]
+        })) == {"deleted": 0, "updated": 0, "inserted": 0}
+
+    def test_duplicate_ids_rejected(self, client):
+        """ID重複時はエラー"""
+        synchronizer = DeltaSynchronizer(client)
+        df = pd.DataFrame({'ID': [1, 1], 'name': ['a', 'b'], 'power': [1.0, 2.0]})
+
+        with pytest.raises(DeltaSyncError):
+            synchronizer.sync('cards', df)
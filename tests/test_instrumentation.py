@@ -0,0 +1,63 @@
+"""instrumentationモジュールのユニットテスト"""
+
+import threading
+import time
+
+import instrumentation
+from instrumentation import StageRecorder
+
+
+class TestStageRecorder:
+    """StageRecorderとステージ計測のテスト"""
+
+    def test_stage_records_time_and_calls(self):
+        """同じステージの計測値は合計される"""
+        recorder = StageRecorder()
+        with instrumentation.activate(recorder):
+            for _ in range(2):
+                with instrumentation.stage("fetch"):
+                    time.sleep(0.01)
+
+        stats = recorder.to_dict()["fetch"]
+        assert stats["calls"] == 2
+        assert stats["wall_seconds"] >= 0.02
+        assert stats["cpu_seconds"] >= 0
+        assert stats["peak_rss_delta_bytes"] >= 0
+
+    def test_counters_go_to_innermost_stage(self):
+        """カウンターは実行中の最も内側のステージに加算"""
+        recorder = StageRecorder()
+        with instrumentation.activate(recorder):
+            instrumentation.add_counters(http_requests=1)
+            with instrumentation.stage("upload"):
+                instrumentation.add_counters(bytes_sent=10, http_requests=1)
+                with instrumentation.stage("schema"):
+                    instrumentation.add_counters(http_requests=1)
+                instrumentation.add_counters(bytes_sent=5, http_requests=1)
+
+        stages = recorder.to_dict()
+        assert (stages["upload"]["bytes_sent"], stages["upload"]["http_requests"]) == (15, 2)
+        assert stages["schema"]["http_requests"] == 1
+
+    def test_no_recorder_is_noop(self):
+        """レコーダー未設定時は何も記録しない"""
+        with instrumentation.stage("fetch"):
+            instrumentation.add_counters(bytes_sent=10)
+        assert instrumentation.current_recorder() is None
+
+    def test_activate_in_worker_thread(self):
+        """activateで別スレッドのステージを同じレコーダーに集計"""
+        recorder = StageRecorder()
+
+        def worker():
+            with instrumentation.activate(recorder):
+                with instrumentation.stage("parse"):
+                    pass
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert recorder.to_dict()["parse"]["calls"] == 3
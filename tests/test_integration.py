@@ -13,12 +13,9 @@
 
 import pytest
 import os
-import sys
 import pandas as pd
 from typing import Dict, List
 
-sys.path.insert(0, '/Users/yaoko/git/i7_datasync/src')
-
 from csv_fetcher import CSVFetcher
 from db_client import DatabaseClient
 from schema_manager import SchemaManager
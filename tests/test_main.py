@@ -0,0 +1,89 @@
+"""CLIエントリーポイント（main.py）のテスト"""
+
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+from benchmarks.stand_ins import FakeTursoServer
+
+import main
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# `import main` の累積import時間の上限（マイクロ秒）
+IMPORT_TIME_BUDGET_US = 250_000
+
+# CLIの軽量パスで読み込んではいけない重い依存
+HEAVY_MODULES = ("pandas", "numpy")
+
+ENV = {"TURSO_DATABASE_URL": "libsql://test.turso.io", "TURSO_AUTH_TOKEN": "test_token"}
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    """src/をカレントディレクトリにしてPythonを実行"""
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=SRC_DIR,
+        env=dict(os.environ, **ENV),
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+
+
+def imported_modules(importtime_stderr: str) -> dict:
+    """-X importtime の出力から {モジュール名: 累積時間(us)} を取得"""
+    modules = {}
+    for line in importtime_stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestMain:
+    """main.pyのテスト"""
+
+    def test_import_time_within_budget(self):
+        """main.pyのimportは重い依存を読み込まず、予算内に収まる"""
+        result = run_python("-X", "importtime", "-c", "import main")
+
+        assert result.returncode == 0, result.stderr
+        modules = imported_modules(result.stderr)
+        assert not [name for name in modules if name.split(".")[0] in HEAVY_MODULES]
+        assert modules["main"] < IMPORT_TIME_BUDGET_US
+
+    def test_help_and_dry_run_skip_pandas(self):
+        """--help / --dry-run ではpandasを読み込まない"""
+        script = (
+            "import sys, main\n"
+            "assert main.main(['--dry-run']) == 0\n"
+            "print(sorted(m for m in ('pandas', 'numpy') if m in sys.modules))\n"
+        )
+        dry_run = run_python("-c", script)
+        help_run = run_python("-X", "importtime", "main.py", "--help")
+
+        assert dry_run.returncode == 0, dry_run.stderr
+        assert dry_run.stdout.strip().splitlines()[-1] == "[]"
+        assert help_run.returncode == 0
+        assert "--health-check" in help_run.stdout
+        assert not [name for name in imported_modules(help_run.stderr) if name.split(".")[0] in HEAVY_MODULES]
+
+    def test_dry_run_rejects_invalid_settings(self):
+        """不正な設定は--dry-runで検出"""
+        with patch.dict(os.environ, dict(ENV, SYNC_STRATEGY="unknown")):
+            assert main.main(["--dry-run"]) == 1
+        with patch.dict(os.environ, dict(ENV, SYNC_STREAMING="true", SYNC_STRATEGY="delta")):
+            assert main.main(["--dry-run"]) == 1
+
+    def test_health_check(self):
+        """--health-checkはTursoへの接続結果を終了コードで返す"""
+        with FakeTursoServer() as turso:
+            with patch.dict(os.environ, {"TURSO_DATABASE_URL": turso.base_url, "TURSO_AUTH_TOKEN": "token"}):
+                assert main.main(["--health-check"]) == 0
+            assert turso.request_count == 1
+
+        with patch.dict(os.environ, {"TURSO_DATABASE_URL": "ftp://invalid", "TURSO_AUTH_TOKEN": "token"}):
+            assert main.main(["--health-check"]) == 1
@@ -0,0 +1,71 @@
+"""MemoryOptimizerのユニットテスト"""
+
+import numpy as np
+import pandas as pd
+from unittest.mock import Mock
+
+from memory_optimizer import MemoryOptimizer, widen_dtypes
+from statement_builder import StatementBuilder
+from schema_manager import SchemaManager
+from delta_sync import DeltaSynchronizer
+
+
+def make_frame(rows: int = 200) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'ID': pd.array(np.arange(1, rows + 1), dtype='Int64'),
+        'count': rng.integers(0, 100, rows),
+        'nullable': pd.array([None if i % 7 == 0 else i for i in range(rows)], dtype='Int64'),
+        'half': rng.integers(0, 4, rows) / 2.0,
+        'ratio': rng.random(rows),
+        'rarity': pd.Series(rng.choice(['SSR', 'SR', "R'"], rows), dtype='str'),
+        'name': pd.Series([f"name{i}" for i in range(rows)], dtype='str'),
+        'artist': pd.Series([None if i % 5 == 0 else f"artist{i % 3}" for i in range(rows)], dtype='str'),
+        'mixed': pd.Series([None if i % 5 == 0 else f"artist{i % 3}" for i in range(rows)], dtype=object),
+    })
+
+
+class TestMemoryOptimizer:
+    """MemoryOptimizerクラスのテスト"""
+
+    def test_downcasts_and_categorizes(self):
+        """数値は安全な最小幅に縮小し、重複の多い文字列のみcategory化"""
+        df, bytes_saved = MemoryOptimizer().optimize(make_frame())
+
+        assert str(df['ID'].dtype) == 'Int16'
+        assert df['count'].dtype == np.int8
+        assert str(df['nullable'].dtype) == 'Int16'
+        assert df['half'].dtype == np.float32
+        # float32で表現できない値は縮小しない
+        assert df['ratio'].dtype == np.float64
+        assert isinstance(df['rarity'].dtype, pd.CategoricalDtype)
+        assert isinstance(df['artist'].dtype, pd.CategoricalDtype)
+        # 元のdtypeに戻せないobjectカラムはそのまま
+        assert df['mixed'].dtype == object
+        assert not isinstance(df['name'].dtype, pd.CategoricalDtype)
+        assert bytes_saved > 0
+
+    def test_statements_unchanged(self):
+        """縮小後もINSERT文・引数は縮小前と同一"""
+        builder = StatementBuilder()
+        original = make_frame()
+        optimized, _ = MemoryOptimizer().optimize(make_frame())
+
+        assert builder.build_literal_statements("t", optimized) == builder.build_literal_statements("t", original)
+        assert builder.to_param_rows(optimized) == builder.to_param_rows(original)
+
+    def test_schema_and_hashes_unchanged(self):
+        """縮小後もカラム型の推測と差分同期の行ハッシュは縮小前と同一"""
+        original = make_frame()
+        optimized, _ = MemoryOptimizer().optimize(make_frame())
+
+        schema_manager = SchemaManager(Mock())
+        assert schema_manager.infer_column_types(optimized) == schema_manager.infer_column_types(original)
+
+        synchronizer = DeltaSynchronizer(Mock(), StatementBuilder())
+        assert synchronizer.compute_row_hashes(optimized) == synchronizer.compute_row_hashes(original)
+
+    def test_widen_without_narrow_columns_returns_same_frame(self):
+        """縮小したカラムがなければコピーしない"""
+        df = pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']})
+        assert widen_dtypes(df) is df
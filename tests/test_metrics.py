@@ -0,0 +1,88 @@
+"""metricsモジュールのユニットテスト"""
+
+import os
+import urllib.request
+
+import pandas as pd
+import pytest
+
+import metrics
+from metrics import MetricsRegistry
+from validators import DataValidator
+
+
+class TestMetricsRegistry:
+    """MetricsRegistryのテスト"""
+
+    def test_render_openmetrics(self):
+        """カウンターとヒストグラムをOpenMetricsテキストで出力"""
+        registry = MetricsRegistry()
+        rows = registry.counter("rows", "Rows", labelnames=("table",))
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+        rows.inc(3, table="songs")
+        rows.inc(2, table='ca"rds')
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(5)
+
+        text = registry.render()
+        assert "# TYPE rows counter" in text
+        assert 'rows_total{table="songs"} 3' in text
+        assert 'rows_total{table="ca\\"rds"} 2' in text
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1.0"} 2' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+        assert "latency_seconds_count 3" in text
+        assert "latency_seconds_sum 5.55" in text
+        assert text.endswith("# EOF\n")
+
+    def test_rejects_invalid_labels_and_negative_increment(self):
+        """ラベル不一致と負の加算はエラー"""
+        registry = MetricsRegistry()
+        counter = registry.counter("runs", "Runs", labelnames=("table",))
+
+        with pytest.raises(ValueError):
+            counter.inc()
+        with pytest.raises(ValueError):
+            counter.inc(-1, table="songs")
+        with pytest.raises(ValueError):
+            registry.counter("runs", "Duplicate")
+
+    def test_write_textfile(self, tmp_path):
+        """テキストファイルを置き換えで書き出す"""
+        registry = MetricsRegistry()
+        registry.counter("runs", "Runs").inc()
+        path = tmp_path / "sync.prom"
+
+        registry.write_textfile(str(path))
+
+        assert "runs_total 1" in path.read_text(encoding="utf-8")
+        assert os.listdir(tmp_path) == ["sync.prom"]
+
+    def test_serve_http(self):
+        """/metricsでOpenMetricsテキストを返す"""
+        registry = MetricsRegistry()
+        registry.counter("runs", "Runs").inc(2)
+        server = registry.serve(0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode("utf-8")
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert "runs_total 2" in body
+        assert content_type.startswith("application/openmetrics-text")
+
+    def test_validation_failures_per_rule(self):
+        """検証ルールごとの違反行数を記録"""
+        before = metrics.VALIDATION_FAILURES.value(table="cards", rule="invalid_rarity")
+        df = pd.DataFrame({'ID': [1, 2, 3], 'cardID': ['a', 'b', 'c'], 'rarity': ['SSR', 'X', 'Y']})
+
+        DataValidator().validate_cards_data(df)
+
+        after = metrics.VALIDATION_FAILURES.value(table="cards", rule="invalid_rarity")
+        assert after - before == 2
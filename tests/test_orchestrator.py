@@ -0,0 +1,202 @@
+"""SyncOrchestratorのユニットテスト"""
+
+import time
+import threading
+import pytest
+import pandas as pd
+from unittest.mock import Mock, patch
+
+from orchestrator import SyncOrchestrator, SyncResult, SyncTimeoutError
+
+
+def make_orchestrator(**kwargs) -> SyncOrchestrator:
+    """モックコンポーネントでSyncOrchestratorを生成"""
+    return SyncOrchestrator(
+        csv_fetcher=Mock(),
+        db_client=Mock(),
+        validator=Mock(),
+        transformer=Mock(),
+        **kwargs
+    )
+
+
+class TestSyncOrchestrator:
+    """SyncOrchestratorクラスのテスト"""
+
+    SHEET_CONFIGS = {"songs": 1, "cards": 2, "brooches": 3}
+
+    def test_invalid_insert_mode(self):
+        """未知のINSERTモードはエラー"""
+        with pytest.raises(ValueError):
+            make_orchestrator(insert_mode='unknown')
+
+    def test_concurrent_sync_returns_config_order(self):
+        """並行同期でも結果はsheet_configsの順序で返る"""
+        orchestrator = make_orchestrator(max_workers=3)
+        delays = {"songs": 0.2, "cards": 0.1, "brooches": 0.0}
+        active = []
+        max_active = []
+        lock = threading.Lock()
+
+        def fake_sync(table_name, gid, spreadsheet_id):
+            with lock:
+                active.append(table_name)
+                max_active.append(len(active))
+            time.sleep(delays[table_name])
+            with lock:
+                active.remove(table_name)
+            return SyncResult(table_name, 0, gid, 0, True)
+
+        with patch.object(orchestrator, 'sync_single_table', side_effect=fake_sync):
+            results = orchestrator.sync_all_tables("sheet", self.SHEET_CONFIGS)
+
+        assert [r.table_name for r in results] == ["songs", "cards", "brooches"]
+        assert [r.inserted_count for r in results] == [1, 2, 3]
+        assert max(max_active) > 1
+
+    def test_concurrent_sync_timeout(self):
+        """並行同期でもタイムアウト予算が全体に適用される"""
+        orchestrator = make_orchestrator(max_workers=3, timeout_seconds=0.1)
+
+        finished = []
+
+        def slow_sync(table_name, gid, spreadsheet_id):
+            time.sleep(0.5 if table_name == "songs" else 0.0)
+            finished.append(table_name)
+            return SyncResult(table_name, 0, 0, 0, True)
+
+        with patch.object(orchestrator, 'sync_single_table', side_effect=slow_sync):
+            with pytest.raises(SyncTimeoutError):
+                orchestrator.sync_all_tables("sheet", self.SHEET_CONFIGS)
+
+        # 実行中のワーカーの終了を待ってから例外が送出される
+        assert "songs" in finished
+
+    def test_concurrent_sync_timeout_stops_running_uploads(self):
+        """タイムアウト時は実行中のアップロードをバッチの区切りで止め、終了を待ってから例外を送出"""
+        orchestrator = make_orchestrator(max_workers=3, timeout_seconds=0.1)
+        orchestrator.schema_manager = Mock()
+        writes = []
+
+        def slow_transaction(delete_query, insert_statements, batch_size=50, batch_sizer=None,
+                             on_batch_committed=None, check_cancelled=None):
+            for start in range(0, 20):
+                check_cancelled()
+                if "songs" in delete_query:
+                    time.sleep(0.05)
+                writes.append(delete_query)
+            return {"deleted": 0, "inserted": 20, "batch_sizes": [1] * 20}
+
+        orchestrator.db_client.execute_transaction.side_effect = slow_transaction
+        frame = pd.DataFrame({"ID": [1]})
+        orchestrator.csv_fetcher.fetch_csv_if_modified.return_value = frame
+
+        with patch.object(orchestrator, '_prepare_frame', return_value=(frame, 0)), \
+                patch.object(orchestrator, '_build_load_statements', return_value=(["INSERT"], 1)):
+            with pytest.raises(SyncTimeoutError):
+                orchestrator.sync_all_tables("sheet", self.SHEET_CONFIGS)
+
+        writes_at_raise = len(writes)
+        time.sleep(0.2)
+
+        # 例外の送出後に書き込みが続かず、songsは途中で止まっている
+        assert len(writes) == writes_at_raise
+        assert writes.count("DELETE FROM songs") < 20
+        assert writes.count("DELETE FROM cards") == 20
+        assert not [t for t in threading.enumerate() if t.name.startswith("sync")]
+
+    def test_sequential_sync_by_default(self):
+        """max_workers=1では逐次実行"""
+        orchestrator = make_orchestrator()
+        calls = []
+
+        def fake_sync(table_name, gid, spreadsheet_id):
+            calls.append((table_name, threading.current_thread().name))
+            return SyncResult(table_name, 0, 0, 0, True)
+
+        with patch.object(orchestrator, 'sync_single_table', side_effect=fake_sync):
+            orchestrator.sync_all_tables("sheet", self.SHEET_CONFIGS)
+
+        assert [c[0] for c in calls] == ["songs", "cards", "brooches"]
+        assert all(c[1] == threading.current_thread().name for c in calls)
+
+    def test_not_modified_sheet_skips_database(self):
+        """変更のないシートはDB処理を行わずnot_modifiedを返す"""
+        orchestrator = make_orchestrator()
+        orchestrator.csv_fetcher.fetch_csv_if_modified.return_value = None
+
+        result = orchestrator.sync_single_table("cards", 2, "sheet")
+
+        assert result.success is True
+        assert result.not_modified is True
+        orchestrator.db_client.execute_query.assert_not_called()
+        orchestrator.db_client.execute_transaction.assert_not_called()
+        orchestrator.csv_fetcher.commit_fetch_state.assert_not_called()
+
+    def test_swap_strategy_loads_staging_then_swaps(self):
+        """swap戦略はステージングテーブルにロードしてから入れ替える"""
+        orchestrator = make_orchestrator(sync_strategy='swap', insert_mode='parameterized')
+        df = pd.DataFrame({'ID': [1, 2], 'cardID': ['a', 'b']})
+        orchestrator.csv_fetcher.fetch_csv_if_modified.return_value = df
+        orchestrator.validator.validate_cards_data.return_value = (df, [])
+        orchestrator.transformer.transform_for_database.return_value = df
+        orchestrator.db_client.execute_statements.return_value = {"rows_written": 2}
+        orchestrator.db_client.swap_table.return_value = 5
+
+        result = orchestrator.sync_single_table("cards", 2, "sheet")
+
+        assert result.success is True
+        assert (result.deleted_count, result.inserted_count) == (5, 2)
+        statements = orchestrator.db_client.execute_statements.call_args[0][0]
+        assert all(stmt['q'].startswith("INSERT INTO cards__staging") for stmt in statements)
+        orchestrator.db_client.swap_table.assert_called_once_with("cards", "cards__staging")
+        orchestrator.db_client.execute_transaction.assert_not_called()
+
+    def test_streaming_requires_full_strategy(self):
+        """ストリーミングはfull戦略以外ではエラー"""
+        with pytest.raises(ValueError):
+            make_orchestrator(streaming=True, sync_strategy='delta')
+
+    def test_streaming_sync_uploads_chunks(self):
+        """ストリーミング同期はチャンクごとに検証・変換してアップロードする"""
+        orchestrator = make_orchestrator(streaming=True, chunk_rows=2, insert_mode='parameterized')
+        orchestrator.pipeline.schema_manager = Mock()
+        chunks = [pd.DataFrame({'ID': [1, 2]}), pd.DataFrame({'ID': [3]})]
+        orchestrator.csv_fetcher.iter_csv_chunks.return_value = iter(chunks)
+        orchestrator.validator.validate_cards_data.side_effect = lambda df: (df, [])
+        orchestrator.transformer.transform_for_database.side_effect = lambda df, table_name, **kwargs: df
+        orchestrator.db_client.execute_statements.side_effect = lambda stmts, **kwargs: {
+            "rows_written": len(stmts)
+        }
+
+        result = orchestrator.sync_single_table("cards", 2, "sheet")
+
+        assert result.success is True
+        assert result.inserted_count == 3
+        assert orchestrator.csv_fetcher.iter_csv_chunks.call_args.kwargs['chunk_rows'] == 2
+        orchestrator.csv_fetcher.fetch_csv_if_modified.assert_not_called()
+
+    def test_stage_metrics_recorded(self):
+        """ステージごとの計測値とアップロードの送信量がSyncResultに記録される"""
+        import instrumentation
+
+        orchestrator = make_orchestrator()
+        orchestrator.schema_manager = Mock()
+        df = pd.DataFrame({'ID': [1, 2], 'cardID': ['a', 'b']})
+        orchestrator.csv_fetcher.fetch_csv_if_modified.return_value = df
+        orchestrator.validator.validate_cards_data.return_value = (df, [])
+        orchestrator.transformer.transform_for_database.return_value = df
+
+        def fake_transaction(delete_query, statements, **kwargs):
+            instrumentation.add_counters(bytes_sent=100, http_requests=2)
+            return {"deleted": 0, "inserted": len(statements)}
+
+        orchestrator.db_client.execute_transaction.side_effect = fake_transaction
+
+        result = orchestrator.sync_single_table("cards", 2, "sheet")
+
+        assert result.success is True
+        assert {"validate", "transform", "schema", "upload"} <= set(result.stage_metrics)
+        assert result.stage_metrics["upload"]["bytes_sent"] == 100
+        assert result.stage_metrics["upload"]["http_requests"] == 2
+        assert result.stage_metrics["validate"]["calls"] == 1
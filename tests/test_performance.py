@@ -17,15 +17,12 @@
 
 import pytest
 import os
-import sys
 import time
 import psutil
 import pandas as pd
 from typing import Dict, List
 import io
 
-sys.path.insert(0, '/Users/yaoko/git/i7_datasync/src')
-
 from csv_fetcher import CSVFetcher
 from db_client import DatabaseClient
 from schema_manager import SchemaManager
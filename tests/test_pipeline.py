@@ -0,0 +1,88 @@
+"""StreamingPipelineのユニットテスト"""
+
+import threading
+import pytest
+import pandas as pd
+from unittest.mock import Mock
+
+from pipeline import StreamingPipeline
+
+
+def build_statements(df):
+    return [f"INSERT {row_id}" for row_id in df['ID']], 50
+
+
+class TestStreamingPipeline:
+    """StreamingPipelineクラスのテスト"""
+
+    def make_pipeline(self, queue_size=2):
+        db_client = Mock()
+        db_client.execute_statements.side_effect = lambda stmts, **kwargs: {
+            "rows_written": len(stmts), "batch_sizes": [len(stmts)]
+        }
+        return StreamingPipeline(db_client, Mock(), queue_size=queue_size)
+
+    def test_chunks_uploaded_in_order(self):
+        """スキーマ確認・DELETEの後に各チャンクが順にアップロードされる"""
+        pipeline = self.make_pipeline()
+        chunks = [pd.DataFrame({'ID': [1, 2]}), pd.DataFrame({'ID': [3, None]})]
+
+        def prepare(chunk):
+            valid = chunk.dropna()
+            return valid, len(chunk) - len(valid)
+
+        result = pipeline.run("cards", iter(chunks), prepare, build_statements)
+
+        assert result["inserted"] == 3
+        assert result["skipped"] == 1
+        assert result["chunks"] == 2
+        pipeline.schema_manager.ensure_table_exists.assert_called_once()
+        sent = [c.args[0] for c in pipeline.db_client.execute_statements.call_args_list]
+        assert sent == [["DELETE FROM cards"], ["INSERT 1", "INSERT 2"], ["INSERT 3.0"]]
+
+    def test_upload_starts_before_fetch_finishes(self):
+        """後続チャンクの取得中に先頭チャンクのアップロードが始まる"""
+        pipeline = self.make_pipeline()
+        first_uploaded = threading.Event()
+
+        def on_upload(stmts, **kwargs):
+            if stmts[0].startswith("INSERT"):
+                first_uploaded.set()
+            return {"rows_written": len(stmts)}
+
+        pipeline.db_client.execute_statements.side_effect = on_upload
+
+        def chunks():
+            yield pd.DataFrame({'ID': [1]})
+            # 最初のチャンクのアップロードを待ってから次を返す
+            assert first_uploaded.wait(timeout=5)
+            yield pd.DataFrame({'ID': [2]})
+
+        result = pipeline.run("cards", chunks(), lambda c: (c, 0), build_statements)
+
+        assert result["inserted"] == 2
+
+    def test_fetch_error_propagates_and_stops(self):
+        """取得ステージの例外は呼び出し元に伝わる"""
+        pipeline = self.make_pipeline()
+
+        def chunks():
+            yield pd.DataFrame({'ID': [1]})
+            raise RuntimeError("connection reset")
+
+        with pytest.raises(RuntimeError, match="connection reset"):
+            pipeline.run("cards", chunks(), lambda c: (c, 0), build_statements)
+
+    def test_upload_error_cancels_upstream_stages(self):
+        """アップロード失敗時は前段のスレッドも停止する"""
+        pipeline = self.make_pipeline(queue_size=1)
+        pipeline.db_client.execute_statements.side_effect = RuntimeError("turso down")
+
+        def endless():
+            while True:
+                yield pd.DataFrame({'ID': [1]})
+
+        with pytest.raises(RuntimeError, match="turso down"):
+            pipeline.run("cards", endless(), lambda c: (c, 0), build_statements)
+
+        assert not any(t.name.startswith("pipeline-") for t in threading.enumerate())
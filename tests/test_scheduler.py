@@ -0,0 +1,113 @@
+"""SyncSchedulerのユニットテスト"""
+
+import random
+import threading
+
+import pytest
+
+from orchestrator import SyncResult
+from scheduler import SyncScheduler
+
+
+def unchanged(table_name: str = "songs") -> SyncResult:
+    return SyncResult(table_name, 0, 0, 0, True, not_modified=True)
+
+
+def synced(table_name: str = "songs") -> SyncResult:
+    return SyncResult(table_name, 1, 1, 0, True)
+
+
+class FakeClock:
+    """stop_event.waitで進む擬似時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSyncScheduler:
+    """SyncSchedulerクラスのテスト"""
+
+    def test_backs_off_while_unchanged_and_resets(self):
+        """変更なしの間は間隔を延ばし、変更があれば基本間隔に戻す"""
+        outcomes = [[unchanged()], [unchanged()], [unchanged()], [synced()]]
+        scheduler = SyncScheduler(lambda: outcomes.pop(0), interval=10, jitter=0, max_interval=30)
+
+        intervals = []
+        for _ in range(4):
+            scheduler.run_once()
+            intervals.append(scheduler.current_interval)
+
+        assert intervals == [20, 30, 30, 10]
+
+    def test_failure_resets_interval(self):
+        """同期の例外はスケジューラーを止めず、基本間隔に戻す"""
+        def failing():
+            raise RuntimeError("boom")
+
+        scheduler = SyncScheduler(failing, interval=10, jitter=0, max_interval=40)
+        scheduler.current_interval = 40
+
+        assert scheduler.run_once() == []
+        assert scheduler.current_interval == 10
+
+    def test_jitter_within_bounds(self):
+        """ジッターは間隔の±jitterの範囲"""
+        scheduler = SyncScheduler(list, interval=100, jitter=0.2, rng=random.Random(1))
+        delays = [scheduler.next_delay() for _ in range(100)]
+        assert all(80 <= d <= 120 for d in delays)
+        assert len(set(delays)) > 1
+
+    def test_skips_overlapping_run(self):
+        """実行中の同期がある場合は重ねて実行しない"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_sync():
+            started.set()
+            release.wait(5)
+            return [synced()]
+
+        scheduler = SyncScheduler(slow_sync, interval=10)
+        worker = threading.Thread(target=scheduler.run_once)
+        worker.start()
+        started.wait(5)
+
+        assert scheduler.run_once() is None
+        release.set()
+        worker.join()
+        assert (scheduler.run_count, scheduler.skipped_count) == (1, 1)
+
+    def test_run_forever_skips_overrun_ticks(self):
+        """間隔より長い同期の後は過ぎた予定を飛ばして次の予定まで待つ"""
+        clock = FakeClock()
+        stop_event = threading.Event()
+        waits = []
+
+        def sync():
+            clock.now += 25  # 間隔10秒に対して25秒かかる
+            return [synced()]
+
+        def fake_wait(timeout):
+            waits.append(timeout)
+            clock.now += timeout
+            if len(waits) == 2:
+                stop_event.set()
+
+        stop_event.wait = fake_wait
+        scheduler = SyncScheduler(sync, interval=10, jitter=0, clock=clock)
+        scheduler.run_forever(stop_event)
+
+        assert waits == [5, 5]
+        assert (scheduler.run_count, scheduler.skipped_count) == (2, 4)
+
+    def test_invalid_settings(self):
+        """不正な設定はエラー"""
+        with pytest.raises(ValueError):
+            SyncScheduler(list, interval=0)
+        with pytest.raises(ValueError):
+            SyncScheduler(list, interval=10, max_interval=5)
+        with pytest.raises(ValueError):
+            SyncScheduler(list, jitter=1.5)
@@ -4,9 +4,6 @@ import pytest
 import pandas as pd
 from unittest.mock import Mock, patch
 
-import sys
-sys.path.insert(0, '/Users/yaoko/git/i7_datasync/src')
-
 from schema_manager import SchemaManager
 
 
@@ -31,8 +28,9 @@ class TestSchemaManager:
         assert column_types['score'] == 'REAL'
 
     def test_ensure_table_exists(self):
-        """テーブル作成"""
+        """テーブルが存在しない場合は作成"""
         mock_db_client = Mock()
+        mock_db_client.query_rows.return_value = []
         manager = SchemaManager(mock_db_client)
 
         df = pd.DataFrame({
@@ -40,11 +38,61 @@ class TestSchemaManager:
             'name': ['test1', 'test2']
         })
 
-        manager.ensure_table_exists('test_table', df)
+        created = manager.ensure_table_exists('test_table', df)
 
         # CREATE TABLE文が実行されたことを確認
+        assert created is True
         mock_db_client.execute_query.assert_called_once()
         call_args = mock_db_client.execute_query.call_args[0][0]
         assert 'CREATE TABLE IF NOT EXISTS' in call_args
         assert 'test_table' in call_args
-        assert 'ID INTEGER PRIMARY KEY' in call_args
+        assert '`ID` INTEGER PRIMARY KEY' in call_args
+
+    def test_ensure_table_exists_schema_unchanged(self):
+        """スキーマが一致する場合は何もしない"""
+        mock_db_client = Mock()
+        mock_db_client.query_rows.return_value = [
+            [0, 'ID', 'INTEGER', 0, None, 1],
+            [1, 'name', 'TEXT', 0, None, 0],
+        ]
+        manager = SchemaManager(mock_db_client)
+
+        df = pd.DataFrame({'ID': [1], 'name': ['a']})
+
+        assert manager.ensure_table_exists('test_table', df) is False
+        mock_db_client.query_rows.assert_called_once_with("PRAGMA table_info(test_table)")
+        mock_db_client.execute_query.assert_not_called()
+
+    def test_ensure_table_exists_adds_and_drops_columns(self):
+        """カラムの追加・削除はALTER TABLEで反映"""
+        mock_db_client = Mock()
+        mock_db_client.query_rows.return_value = [
+            [0, 'ID', 'INTEGER', 0, None, 1],
+            [1, 'old', 'TEXT', 0, None, 0],
+        ]
+        manager = SchemaManager(mock_db_client)
+
+        df = pd.DataFrame({'ID': [1], 'score': [1.5]})
+
+        assert manager.ensure_table_exists('test_table', df) is False
+        executed = [c[0][0] for c in mock_db_client.execute_query.call_args_list]
+        assert executed == [
+            "ALTER TABLE test_table ADD COLUMN `score` REAL",
+            "ALTER TABLE test_table DROP COLUMN `old`",
+        ]
+
+    def test_ensure_table_exists_rebuilds_on_type_change(self):
+        """型が変わった場合のみ削除して再作成"""
+        mock_db_client = Mock()
+        mock_db_client.query_rows.return_value = [
+            [0, 'ID', 'INTEGER', 0, None, 1],
+            [1, 'score', 'INTEGER', 0, None, 0],
+        ]
+        manager = SchemaManager(mock_db_client)
+
+        df = pd.DataFrame({'ID': [1], 'score': [1.5]})
+
+        assert manager.ensure_table_exists('test_table', df) is True
+        executed = [c[0][0] for c in mock_db_client.execute_query.call_args_list]
+        assert executed[0] == "DROP TABLE IF EXISTS test_table"
+        assert '`score` REAL' in executed[1]
@@ -0,0 +1,94 @@
+"""SQLiteClientのユニットテスト"""
+
+import os
+import pytest
+from unittest.mock import patch
+
+from db_client import DatabaseClient, DatabaseTransactionError
+from sqlite_client import SQLiteClient
+from storage_backend import create_storage_backend, target_key
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = SQLiteClient(str(tmp_path / "test.db"))
+    client.connect()
+    client.execute_query("CREATE TABLE songs (`ID` INTEGER PRIMARY KEY, `name` TEXT)")
+    yield client
+    client.close()
+
+
+class TestSQLiteClient:
+    """SQLiteClientクラスのテスト"""
+
+    def test_connect_enables_wal(self, client):
+        """WALモードで開く"""
+        assert client.query_rows("PRAGMA journal_mode") == [["wal"]]
+
+    def test_execute_transaction_replaces_rows(self, client):
+        """削除と一括挿入（引数付き・SQL文字列の混在）を実行して件数を返す"""
+        client.execute_statements(["INSERT INTO songs VALUES (1, 'old')"])
+
+        insert = "INSERT INTO songs (`ID`, `name`) VALUES (?, ?)"
+        result = client.execute_transaction(
+            "DELETE FROM songs",
+            [{"q": insert, "params": [i, f"song{i}"]} for i in range(1, 101)]
+            + ["INSERT INTO songs VALUES (101, 'literal')"]
+            + [{"q": "INSERT INTO songs VALUES (?, ?), (?, ?)", "params": [102, 'a', 103, 'b']}]
+        )
+
+        assert result == {"deleted": 1, "inserted": 103, "batch_sizes": [102]}
+        assert client.query_rows("SELECT COUNT(*) FROM songs") == [[103]]
+        assert client.query_rows("SELECT name FROM songs WHERE ID = ?", [50]) == [["song50"]]
+
+    def test_execute_transaction_failure_rollback(self, client):
+        """途中で失敗した場合は削除も含めてロールバック"""
+        client.execute_statements(["INSERT INTO songs VALUES (1, 'old')"])
+
+        with pytest.raises(DatabaseTransactionError):
+            client.execute_transaction(
+                "DELETE FROM songs",
+                ["INSERT INTO songs VALUES (2, 'new')", "INSERT INTO missing VALUES (1)"]
+            )
+
+        assert client.query_rows("SELECT ID, name FROM songs") == [[1, "old"]]
+
+    def test_swap_table(self, client):
+        """ステージングテーブルと入れ替えて旧テーブルの行数を返す"""
+        client.execute_statements(["INSERT INTO songs VALUES (1, 'old')", "INSERT INTO songs VALUES (2, 'old')"])
+        client.execute_query("CREATE TABLE songs__staging (`ID` INTEGER PRIMARY KEY, `name` TEXT)")
+        client.execute_statements(["INSERT INTO songs__staging VALUES (3, 'new')"])
+
+        assert client.swap_table("songs", "songs__staging") == 2
+        assert client.query_rows("SELECT ID, name FROM songs") == [[3, "new"]]
+        assert client.query_rows(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'songs__%'"
+        ) == []
+
+
+class TestCreateStorageBackend:
+    """create_storage_backendのテスト"""
+
+    def test_selects_backend_from_env(self, tmp_path):
+        """STORAGE_BACKEND環境変数でバックエンドを切り替え"""
+        env = {
+            "STORAGE_BACKEND": "sqlite",
+            "SQLITE_DATABASE_PATH": str(tmp_path / "env.db"),
+            "TURSO_DATABASE_URL": "libsql://test.turso.io",
+            "TURSO_AUTH_TOKEN": "test_token"
+        }
+        with patch.dict(os.environ, env):
+            sqlite_backend = create_storage_backend()
+            turso_backend = create_storage_backend("turso")
+            with pytest.raises(ValueError):
+                create_storage_backend("postgres")
+
+        assert isinstance(sqlite_backend, SQLiteClient)
+        assert sqlite_backend.database_path == env["SQLITE_DATABASE_PATH"]
+        assert isinstance(turso_backend, DatabaseClient)
+        turso_backend.close()
+
+        # 同期先ごとに異なる識別子・状態キーになる
+        assert sqlite_backend.target == f"sqlite:{env['SQLITE_DATABASE_PATH']}"
+        assert turso_backend.target == "turso:https://test.turso.io"
+        assert target_key(sqlite_backend.target) != target_key(turso_backend.target)
@@ -0,0 +1,150 @@
+"""StatementBuilderのユニットテスト"""
+
+import json
+import math
+import pytest
+import numpy as np
+import pandas as pd
+
+from statement_builder import StatementBuilder
+
+
+def legacy_build_insert_statements(table_name, df):
+    """iterrowsでセルごとに整形する従来実装（出力比較用）"""
+    statements = []
+    columns = list(df.columns)
+    quoted_columns = [f'`{col}`' for col in columns]
+
+    for _, row in df.iterrows():
+        values = []
+        for col in columns:
+            val = row[col]
+            if pd.isna(val) or (isinstance(val, float) and math.isnan(val)):
+                values.append('NULL')
+            elif isinstance(val, (int, float)):
+                if math.isinf(val) or math.isnan(val):
+                    values.append('NULL')
+                else:
+                    values.append(str(val))
+            else:
+                escaped_val = str(val).replace("'", "''")
+                values.append(f"'{escaped_val}'")
+
+        stmt = f"INSERT INTO {table_name} ({', '.join(quoted_columns)}) VALUES ({', '.join(values)})"
+        statements.append(stmt)
+
+    return statements
+
+
+LITERAL_FRAMES = {
+    "mixed": pd.DataFrame({
+        'ID': pd.array([1, None, 3], dtype='Int64'),
+        'name': ["It's", None, 'Song3'],
+        'score': [1.5, np.inf, np.nan],
+        'count': [1, 2, 3],
+        'flag': [True, False, True],
+    }),
+    "all_int": pd.DataFrame({'ID': [1, 2], 'count': [10, 20]}),
+    "int_and_float": pd.DataFrame({'ID': [1, 2], 'score': [0.1, -np.inf]}),
+    "all_bool": pd.DataFrame({'flag': [True, False]}),
+    "float32": pd.DataFrame({'value': np.array([1.5, np.nan, np.inf], dtype='float32'), 'name': ['a', 'b', 'c']}),
+    "object_numbers": pd.DataFrame({'mixed': [1, 'x', 2.5, None, float('nan'), "a'b"]}),
+    "random": pd.DataFrame({
+        'ID': np.arange(200),
+        'value': np.random.default_rng(0).normal(size=200) * 1e6,
+        'tiny': np.random.default_rng(1).normal(size=200) * 1e-8,
+        'text': [f"v'{i}" if i % 7 else None for i in range(200)],
+    }),
+}
+
+
+class TestStatementBuilder:
+    """StatementBuilderクラスのテスト"""
+
+    def test_build_parameterized_statements(self):
+        """プレースホルダーSQLと引数配列が構築される"""
+        builder = StatementBuilder()
+        df = pd.DataFrame({
+            'ID': [1, 2],
+            'name': ["It's", 'Song2'],
+            'score': [1.5, 2.0]
+        })
+
+        statements = builder.build_parameterized_statements('songs', df)
+
+        assert len(statements) == 2
+        assert statements[0]['q'] == "INSERT INTO songs (`ID`, `name`, `score`) VALUES (?, ?, ?)"
+        assert statements[0]['params'] == [1, "It's", 1.5]
+        assert statements[1]['params'] == [2, 'Song2', 2.0]
+        # 全行で同一のSQLを共有する
+        assert statements[0]['q'] is statements[1]['q']
+
+    def test_null_and_inf_become_none(self):
+        """NaN・inf・NAはNoneに変換される"""
+        builder = StatementBuilder()
+        df = pd.DataFrame({
+            'ID': pd.array([1, None], dtype='Int64'),
+            'value': [np.inf, np.nan],
+            'text': ['a', None]
+        })
+
+        rows = builder.to_param_rows(df)
+
+        assert rows == [[1, None, 'a'], [None, None, None]]
+
+    def test_params_are_json_serializable(self):
+        """NumPy型がPython型に変換されJSONシリアライズ可能"""
+        builder = StatementBuilder()
+        df = pd.DataFrame({
+            'ID': np.array([1, 2], dtype='int64'),
+            'flag': [True, False],
+            'ratio': np.array([0.5, 0.25], dtype='float32')
+        })
+
+        rows = builder.to_param_rows(df)
+
+        assert json.dumps(rows) == '[[1, 1, 0.5], [2, 0, 0.25]]'
+        assert all(type(row[0]) is int for row in rows)
+
+    def test_build_multirow_statements(self):
+        """複数行が1文にまとめられ、引数は行順に平坦化される"""
+        builder = StatementBuilder()
+        df = pd.DataFrame({'ID': [1, 2, 3], 'name': ['a', 'b', None]})
+
+        statements = builder.build_multirow_statements('cards', df, column_count=2)
+
+        assert len(statements) == 1
+        assert statements[0]['q'] == "INSERT INTO cards (`ID`, `name`) VALUES (?, ?), (?, ?), (?, ?)"
+        assert statements[0]['params'] == [1, 'a', 2, 'b', 3, None]
+
+    def test_multirow_respects_parameter_limit(self):
+        """ホストパラメータ数上限を超えないように文が分割される"""
+        builder = StatementBuilder()
+        column_count = 100
+        df = pd.DataFrame({f'c{i}': range(1000) for i in range(column_count)})
+
+        statements = builder.build_multirow_statements('songs', df, column_count=column_count)
+
+        assert all(len(stmt['params']) <= 32766 for stmt in statements)
+        assert sum(len(stmt['params']) for stmt in statements) == 1000 * column_count
+
+    def test_compute_rows_per_statement(self):
+        """パラメータ数・SQL長・行数上限のうち最小値が選ばれる"""
+        builder = StatementBuilder()
+
+        assert builder.compute_rows_per_statement(2) == 500
+        assert builder.compute_rows_per_statement(1000) == 32
+        assert builder.compute_rows_per_statement(10, prefix_length=999_000, row_length=498) == 2
+
+    @pytest.mark.parametrize("name", sorted(LITERAL_FRAMES))
+    def test_literal_statements_match_legacy_builder(self, name):
+        """カラム単位の変換でも従来のiterrows実装と同一の文字列になる"""
+        builder = StatementBuilder()
+        df = LITERAL_FRAMES[name]
+
+        assert builder.build_literal_statements('songs', df) == legacy_build_insert_statements('songs', df)
+
+    def test_literal_statements_empty_frame(self):
+        """空のDataFrameでは文を生成しない"""
+        builder = StatementBuilder()
+        assert builder.build_literal_statements('songs', pd.DataFrame({'ID': []})) == []
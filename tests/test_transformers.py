@@ -0,0 +1,92 @@
+"""DataTransformerのユニットテスト"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from transformers import DataTransformer
+
+
+def legacy_transform(df: pd.DataFrame, table_name: str = None) -> pd.DataFrame:
+    """セルごとにis_integerを呼び、全体をreplaceしていた従来の実装（比較用）"""
+    df_copy = df.copy()
+    unnamed_cols = [col for col in df_copy.columns if str(col).startswith('Unnamed:')]
+    if unnamed_cols:
+        df_copy = df_copy.drop(columns=unnamed_cols)
+    df_copy.columns = [str(col).strip() for col in df_copy.columns]
+    df_copy = df_copy.replace('', pd.NA)
+    if table_name == 'songs':
+        notes_columns = [col for col in df_copy.columns if
+                         ('Shout' in col or 'Beat' in col or 'Melody' in col)
+                         and (col.endswith('白') or col.endswith('色'))]
+        for col in notes_columns:
+            df_copy[col] = df_copy[col].fillna(0)
+    for column in df_copy.columns:
+        if df_copy[column].dtype in ['int64', 'float64']:
+            try:
+                if df_copy[column].dtype == 'float64':
+                    if df_copy[column].dropna().apply(lambda x: x.is_integer()).all():
+                        df_copy[column] = df_copy[column].astype('Int64')
+            except Exception:
+                pass
+    return df_copy
+
+
+TRANSFORM_FRAMES = {
+    "mixed": pd.DataFrame({
+        ' ID ': [1.0, 2.0, np.nan],
+        'score': [1.5, 2.0, 3.0],
+        'name': pd.Series(['a', '', None], dtype='str'),
+        'obj': pd.Series(['', 1, 'x'], dtype=object),
+        'count': [1, 2, 3],
+        'Unnamed: 5': [None, None, None],
+    }),
+    "special_floats": pd.DataFrame({
+        'inf': [1.0, np.inf, 2.0],
+        'all_nan': [np.nan, np.nan, np.nan],
+        'huge': [1e20, 2.0, np.nan],
+        'negative': [-1.0, -0.0, 3.0],
+    }),
+    "songs_notes": pd.DataFrame({
+        'ID': [1, 2],
+        '楽曲_Shout×1白': [np.nan, 3.0],
+        '楽曲_Beat×2色': [np.nan, np.nan],
+        '曲名': ['x', ''],
+    }),
+}
+
+
+class TestDataTransformer:
+    """DataTransformerクラスのテスト"""
+
+    # 従来の実装はint64範囲外の値の変換を試みて警告を出す
+    @pytest.mark.filterwarnings("ignore::RuntimeWarning")
+    @pytest.mark.parametrize("name", list(TRANSFORM_FRAMES))
+    @pytest.mark.parametrize("table_name", [None, "songs"])
+    def test_matches_legacy_transform(self, name, table_name):
+        """ベクトル化した変換は従来の実装と同じ結果を返す"""
+        df = TRANSFORM_FRAMES[name]
+
+        expected = legacy_transform(df, table_name)
+        actual = DataTransformer().transform_for_database(df, table_name=table_name)
+
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_copy_false_transforms_in_place(self):
+        """copy=Falseの場合は渡したDataFrameをそのまま変換する"""
+        df = pd.DataFrame({'ID': [1.0, 2.0], 'name': ['a', '']})
+
+        result = DataTransformer().transform_for_database(df, copy=False)
+
+        assert result is df
+        assert str(df['ID'].dtype) == 'Int64'
+        assert df['name'].isna().tolist() == [False, True]
+
+    def test_copy_default_leaves_input(self):
+        """既定では入力のDataFrameを変更しない"""
+        df = pd.DataFrame({'ID': [1.0, 2.0], 'name': ['a', '']})
+
+        DataTransformer().transform_for_database(df)
+
+        assert df['ID'].dtype == 'float64'
+        assert df['name'].tolist() == ['a', '']
@@ -3,9 +3,6 @@
 import pytest
 import pandas as pd
 
-import sys
-sys.path.insert(0, '/Users/yaoko/git/i7_datasync/src')
-
 from validators import DataValidator
 
 
@@ -80,3 +77,73 @@ class TestDataValidator:
 
         assert len(valid_df) == 2
         assert len(errors) == 0
+
+    def test_validate_cards_data_error_messages(self):
+        """カードデータ検証 - 違反行のみルール順にエラーメッセージを生成"""
+        validator = DataValidator()
+        df = pd.DataFrame({
+            'ID': [1, None, 3],
+            'cardID': ['C001', None, 'C003'],
+            'rarity': ['UR', 'SSR', 'XR']
+        })
+
+        valid_df, errors = validator.validate_cards_data(df)
+
+        assert valid_df['ID'].tolist() == [1]
+        assert errors == [
+            "Row 1: Missing ID",
+            "Row 1: Missing cardID",
+            "Row 2: Invalid rarity XR",
+        ]
+
+    def test_validate_brooches_data_negative_and_invalid(self):
+        """ブローチデータ検証 - 負の値と数値変換不可の値"""
+        validator = DataValidator()
+        df = pd.DataFrame({
+            'ID': [1, 2, 3],
+            'cardID': ['C001', 'C002', 'C003'],
+            'スコア': [100, -5, 'abc']
+        })
+
+        valid_df, errors = validator.validate_brooches_data(df)
+
+        assert len(valid_df) == 1
+        assert errors == [
+            "Row 1: Negative value in スコア",
+            "Row 2: Invalid numeric value in スコア",
+        ]
+
+    def test_numeric_check_accepts_values_float_accepts(self):
+        """全角数字・区切り付きの数値など、float()で変換できる値は有効"""
+        validator = DataValidator()
+        df = pd.DataFrame({
+            'ID': [1, 2, 3, 4],
+            'cardID': ['C001', 'C002', 'C003', 'C004'],
+            'スコア': ['１２', '1_000', '-５', 'abc']
+        })
+
+        valid_df, errors = validator.validate_brooches_data(df)
+
+        assert valid_df['ID'].tolist() == [1, 2]
+        assert errors == [
+            "Row 2: Negative value in スコア",
+            "Row 3: Invalid numeric value in スコア",
+        ]
+
+    def test_validate_songs_data_preserves_index(self):
+        """楽曲データ検証 - 有効行は元のインデックスを保持"""
+        validator = DataValidator()
+        df = pd.DataFrame({
+            'ID': [1, 2, 3],
+            '分類': ['A', '  ', 'B'],
+            'アーティスト名': ['X', 'Y', 'Z'],
+            'ノーツ数': [100, 200, 'many']
+        }, index=[10, 20, 30])
+
+        valid_df, errors = validator.validate_songs_data(df)
+
+        assert valid_df.index.tolist() == [10]
+        assert errors == [
+            "Row 20: Missing 分類",
+            "Row 30: Invalid numeric value in ノーツ数",
+        ]